@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Time the build hot paths on a synthetic site.
+
+Examples::
+
+    python3 benchmarks/benchmark_runner.py --scale 1k --save-baseline base.json
+    python3 benchmarks/benchmark_runner.py --scale 1k --baseline base.json
+"""
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+
+BENCHMARKS_ROOT = os.path.dirname(os.path.abspath(__file__))
+DIST_ROOT = os.path.normpath(os.path.join(BENCHMARKS_ROOT, os.pardir))
+sys.path.insert(0, DIST_ROOT)
+
+import doxhooks.fileio as fileio  # noqa: E402
+import doxhooks.fingerprint as fingerprint  # noqa: E402
+from doxhooks.data_stores import DataStore  # noqa: E402
+from doxhooks.dependency_databases import DependencyDatabase  # noqa: E402
+from doxhooks.main import Doxhooks  # noqa: E402
+from doxhooks.preprocessors import HTMLPreprocessor, Preprocessor  # noqa: E402
+from doxhooks.url_mappings import URLMapping  # noqa: E402
+
+import synthetic_sites  # noqa: E402
+
+
+DATA_DIR_PATH = "output/data"
+DEFAULT_TOLERANCE = 0.2
+
+
+def error_message(*args):
+    sys.exit(" ".join(map(str, args)))
+
+
+def best_time(f, repeat):
+    times = []
+    for __ in range(repeat):
+        start_time = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+class QuietStdout:
+    # Discard the console output of Doxhooks while a benchmark runs.
+
+    def __enter__(self):
+        self._stdout = sys.stdout
+        sys.stdout = io.StringIO()
+
+    def __exit__(self, *exc_info):
+        sys.stdout = self._stdout
+
+
+def make_doxhooks(resource_configs):
+    return Doxhooks(resource_configs, data_dir_path=DATA_DIR_PATH)
+
+
+IMPORT_TIME_SCRIPT = """\
+import time
+start_time = time.perf_counter()
+import doxhooks.main
+print(time.perf_counter() - start_time)
+"""
+
+
+def import_time(repeat):
+    # Time a cold import of doxhooks.main in a new interpreter.
+    env = dict(os.environ, PYTHONPATH=DIST_ROOT)
+    times = []
+    for __ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", IMPORT_TIME_SCRIPT], env=env)
+        times.append(float(output))
+    return min(times)
+
+
+def bench_update_all(resource_configs):
+    make_doxhooks(resource_configs).update_all().save()
+
+
+def bench_update_dependents(resource_configs):
+    # Every page depends on the deepest partial.
+    path = synthetic_sites.PARTIAL_FILENAME.format(
+        synthetic_sites.INSERT_DEPTH - 1)
+    make_doxhooks(resource_configs).load().update_dependents(path)
+
+
+def bench_fingerprint(asset_paths):
+    for path in asset_paths:
+        fingerprint.filename_for_files("asset.bin", path)
+
+
+def bench_fingerprint_variants(asset_paths):
+    # The assets are fingerprinted together, like the variants of a
+    # content-negotiated resource.
+    fingerprint.filename_for_files("asset.bin", *asset_paths)
+
+
+def bench_data_store():
+    data_store = DataStore(DATA_DIR_PATH)
+    data_store["resource_id-input_paths"] = DependencyDatabase()
+    data_store["resource_id-url"] = URLMapping()
+    data_store.load_all()
+    data_store.save_all()
+
+
+def bench_preprocessor(line_count):
+    context = synthetic_sites.SiteContext()
+    lines = [synthetic_sites.node_line(line_no) for line_no in range(1000)]
+    with io.StringIO() as output:
+        preprocessor = Preprocessor(context, None, output)
+        for __ in range(line_count // len(lines)):
+            preprocessor.insert_lines(lines, "benchmark")
+
+
+class BenchmarkHTMLPreprocessor(HTMLPreprocessor):
+    character_references = {"amp": "&", "copy": "©", "nbsp": "\u00a0"}
+
+
+def bench_html_preprocessor(line_count):
+    context = synthetic_sites.SiteContext()
+    lines = [synthetic_sites.node_line(line_no) for line_no in range(1000)]
+    with io.StringIO() as output:
+        preprocessor = BenchmarkHTMLPreprocessor(context, None, output)
+        for __ in range(line_count // len(lines)):
+            preprocessor.insert_lines(lines, "benchmark")
+
+
+def run_benchmarks(scale, repeat):
+    site_kwargs = synthetic_sites.SCALES[scale]
+    page_count = site_kwargs["page_count"]
+    site_root = tempfile.mkdtemp(prefix="doxhooks-benchmark-")
+    cwd = os.getcwd()
+    try:
+        resource_configs = synthetic_sites.generate_site(
+            site_root, **site_kwargs)
+        asset_paths = synthetic_sites.asset_paths(site_kwargs["asset_count"])
+        os.chdir(site_root)
+        fileio.add_output_roots("output")
+
+        benchmarks = OrderedDict([
+            ("update_all", lambda: bench_update_all(resource_configs)),
+            ("update_dependents",
+                lambda: bench_update_dependents(resource_configs)),
+            ("fingerprint.filename_for_files",
+                lambda: bench_fingerprint(asset_paths)),
+            ("fingerprint variants",
+                lambda: bench_fingerprint_variants(asset_paths)),
+            ("DataStore.load_all/save_all", bench_data_store),
+            ("preprocessor_throughput",
+                lambda: bench_preprocessor(page_count * 20)),
+            ("html_preprocessor_throughput",
+                lambda: bench_html_preprocessor(page_count * 20)),
+        ])
+
+        results = OrderedDict()
+        results["import doxhooks.main"] = import_time(max(repeat, 5))
+        print("{:32} {:10.3f}s".format(
+            "import doxhooks.main", results["import doxhooks.main"]))
+        for name, f in benchmarks.items():
+            with QuietStdout():
+                results[name] = best_time(f, repeat)
+            print("{:32} {:10.3f}s".format(name, results[name]))
+        return results
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(site_root)
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    regressions = []
+    print()
+    for name, seconds in results.items():
+        try:
+            baseline_seconds = baseline[name]
+        except KeyError:
+            print("{:32} (no baseline)".format(name))
+            continue
+        ratio = seconds / baseline_seconds
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print("{:32} {:10.2f}x baseline{}".format(name, ratio, flag))
+    return regressions
+
+
+def parse_args():
+    parser = ArgumentParser(description="Run the Doxhooks benchmarks.")
+    parser.add_argument(
+        "--scale", help="size of the synthetic site", default="1k",
+        choices=sorted(synthetic_sites.SCALES))
+    parser.add_argument(
+        "--repeat", help="number of times to run each benchmark",
+        type=int, default=3)
+    parser.add_argument(
+        "--baseline", help="path to a baseline file to compare with")
+    parser.add_argument(
+        "--save-baseline", help="path to save the results as a baseline")
+    parser.add_argument(
+        "--tolerance", help="allowed slowdown as a fraction of baseline",
+        type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    return dict(
+        scale=args.scale, repeat=args.repeat, baseline_path=args.baseline,
+        save_baseline_path=args.save_baseline, tolerance=args.tolerance)
+
+
+def main(
+        scale="1k", *, repeat=3, baseline_path=None, save_baseline_path=None,
+        tolerance=DEFAULT_TOLERANCE):
+    baseline = None
+    if baseline_path is not None:
+        with open(baseline_path) as baseline_file:
+            baseline_data = json.load(baseline_file)
+        if baseline_data["scale"] != scale:
+            error_message(
+                "Baseline scale is", baseline_data["scale"], "not", scale)
+        baseline = baseline_data["results"]
+
+    results = run_benchmarks(scale, repeat)
+
+    if save_baseline_path is not None:
+        with open(save_baseline_path, "w") as baseline_file:
+            json.dump(
+                {"scale": scale, "results": results}, baseline_file, indent=2)
+
+    if baseline is not None:
+        regressions = compare_with_baseline(results, baseline, tolerance)
+        if regressions:
+            error_message("Slower than baseline:", ", ".join(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(**parse_args()))
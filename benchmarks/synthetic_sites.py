@@ -0,0 +1,108 @@
+"""Generate synthetic Doxhooks sites for the benchmarks."""
+import os
+from collections import OrderedDict
+
+from doxhooks.preprocessor_contexts import PreprocessorContext
+from doxhooks.resource_configs import ResourceConfiguration as _
+from doxhooks.resources import PreprocessedResource, Resource
+
+
+SCALES = {
+    "1k": dict(page_count=1000, asset_count=10),
+    "10k": dict(page_count=10000, asset_count=50),
+    "100k": dict(page_count=100000, asset_count=200),
+}
+
+INSERT_DEPTH = 10
+NODE_COUNT = 20
+LINES_PER_FILE = 20
+ASSET_SIZE = 2 ** 20
+
+PARTIAL_FILENAME = "input/partials/_partial_{}.html"
+PAGE_FILENAME = "input/pages/_page_{}.html"
+ASSET_FILENAME = "input/assets/asset_{}.bin"
+
+
+class SiteContext(PreprocessorContext):
+    leaf = "leaf &amp; node"
+
+
+# Each node is the parent of the previous node, down to the leaf.
+for _node_no in range(NODE_COUNT):
+    setattr(
+        SiteContext, "node_{}".format(_node_no),
+        "node {} of ##{}##".format(
+            _node_no, "node_{}".format(_node_no - 1) if _node_no else "leaf"))
+
+
+class SitePage(PreprocessedResource):
+    Context = SiteContext
+
+
+class SiteAsset(Resource):
+    input_encoding = None
+    output_encoding = None
+
+    def _write(self):
+        self._fingerprint_files()
+        self._copy()
+
+
+def node_line(line_no):
+    """Return a line of text that contains some nodes."""
+    node_no = line_no % NODE_COUNT
+    return "<p>##node_{}## and ##leaf##.</p>\n".format(node_no)
+
+
+def _write(path, data, mode="w"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode) as file:
+        file.write(data)
+
+
+def generate_site(root, *, page_count, asset_count):
+    """Write the input files of a site and return its configurations."""
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        # The partials form a chain of insertions.
+        for depth in range(INSERT_DEPTH):
+            lines = [node_line(line_no) for line_no in range(LINES_PER_FILE)]
+            if depth + 1 < INSERT_DEPTH:
+                lines.append(
+                    "    ##insert " + PARTIAL_FILENAME.format(depth + 1) + "\n")
+            _write(PARTIAL_FILENAME.format(depth), "".join(lines))
+
+        for page_no in range(page_count):
+            lines = ["<h1>Page {}</h1>\n".format(page_no)]
+            lines.extend(
+                node_line(page_no + line_no)
+                for line_no in range(LINES_PER_FILE))
+            lines.append("##insert " + PARTIAL_FILENAME.format(0) + "\n")
+            _write(PAGE_FILENAME.format(page_no), "".join(lines))
+
+        for asset_no in range(asset_count):
+            _write(
+                ASSET_FILENAME.format(asset_no), os.urandom(ASSET_SIZE), "wb")
+    finally:
+        os.chdir(cwd)
+
+    resource_configs = OrderedDict()
+    for page_no in range(page_count):
+        resource_configs["page_{}".format(page_no)] = _(
+            SitePage,
+            input_filename=PAGE_FILENAME.format(page_no),
+            output_filename="output/pages/page_{}.html".format(page_no),
+        )
+    for asset_no in range(asset_count):
+        resource_configs["asset_{}".format(asset_no)] = _(
+            SiteAsset,
+            input_filename=ASSET_FILENAME.format(asset_no),
+            output_filename="output/assets/asset_{}.bin".format(asset_no),
+        )
+    return resource_configs
+
+
+def asset_paths(asset_count):
+    """Return the paths to the asset files of a site."""
+    return [ASSET_FILENAME.format(asset_no) for asset_no in range(asset_count)]
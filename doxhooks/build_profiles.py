@@ -0,0 +1,435 @@
+"""
+Profiles of the time taken to update the information resources.
+
+A build profile records the wall-clock time and the processor time that
+each resource takes to update (`BuildProfile.resource`). The time spent
+in each *phase* of the update (``"preprocess"``, ``"write"``,
+``"fingerprint"`` and ``"copy"``) is also recorded (`phase`). The time
+recorded for a phase excludes the time spent in any phase nested inside
+it.
+
+The slowest resources are summarised and a JSON report is saved after
+all the resources are updated (`BuildProfile.report`).
+
+A preprocessor profile records the time spent by the preprocessors in
+each directive keyword, inserted file and *node* throughout the build
+(`PreprocessorProfile`). The profile is saved in the collapsed-stack
+format of flame-graph tools (`PreprocessorProfile.save`).
+
+Exports
+-------
+BuildProfile
+    A record of the time taken to update each resource.
+PreprocessorProfile
+    A record of the time spent in preprocessor directives and files.
+phase
+    Return a context manager that times a phase of a resource update.
+
+See Also
+--------
+doxhooks.resource_environments.ResourceEnvironment.update_all
+    Update all resources configured in an environment.
+doxhooks.preprocessors.Preprocessor.profile
+    A profile of the time spent in directives, files and nodes.
+"""
+
+
+import contextlib
+import time
+
+import doxhooks.console as console
+import doxhooks.fileio as fileio
+
+
+__all__ = [
+    "BuildProfile",
+    "PreprocessorProfile",
+    "phase",
+]
+
+
+_active_timing = None
+
+
+class _ResourceTiming:
+    # The wall-clock and processor times of a resource update and the
+    # exclusive times of its phases.
+
+    def __init__(self, resource_id):
+        self.resource_id = resource_id
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.phases = {}
+        # Each timer is [start_wall, start_cpu, child_wall, child_cpu].
+        self._timers = []
+
+    def start(self):
+        self._timers.append(
+            [time.perf_counter(), time.process_time(), 0.0, 0.0])
+
+    def stop(self, phase_name=None):
+        start_wall, start_cpu, child_wall, child_cpu = self._timers.pop()
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        if self._timers:
+            parent = self._timers[-1]
+            parent[2] += wall
+            parent[3] += cpu
+
+        if phase_name is None:
+            self.wall = wall
+            self.cpu = cpu
+            return
+        try:
+            times = self.phases[phase_name]
+        except KeyError:
+            times = self.phases[phase_name] = [0.0, 0.0]
+        times[0] += wall - child_wall
+        times[1] += cpu - child_cpu
+
+    def data(self):
+        resource_id = self.resource_id
+        if not isinstance(resource_id, (str, int)):
+            resource_id = repr(resource_id)
+        return {
+            "id": resource_id,
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "phases": {
+                name: {"wall": wall, "cpu": cpu}
+                for name, (wall, cpu) in self.phases.items()
+            },
+        }
+
+
+@contextlib.contextmanager
+def phase(name):
+    """
+    Return a context manager that times a phase of a resource update.
+
+    The phase is not timed unless a resource update is being timed by
+    `BuildProfile.resource`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the phase, e.g. ``"preprocess"``, ``"write"``,
+        ``"fingerprint"`` or ``"copy"``.
+
+    Returns
+    -------
+    ~contextlib.AbstractContextManager
+        A context manager that times the phase.
+    """
+    timing = _active_timing
+    if timing is None:
+        yield
+        return
+    timing.start()
+    try:
+        yield
+    finally:
+        timing.stop(name)
+
+
+class BuildProfile:
+    """
+    A record of the time taken to update each resource.
+
+    Class Interface
+    ---------------
+    resource
+        Return a context manager that times a resource update.
+    report_data
+        Return the recorded times, with the slowest resources first.
+    report
+        Write a summary of the slowest resources and save a JSON report.
+    clear
+        Forget the recorded times.
+    """
+
+    def __init__(self, report_path=None, *, top=10):
+        """
+        Initialise the build profile with a path to a report file.
+
+        Parameters
+        ----------
+        report_path : str or None, optional
+            The path to a JSON report file. The path must branch off one
+            of the output roots declared with
+            `~doxhooks.fileio.add_output_roots`. Defaults to ``None``,
+            which denotes that a report file is not saved.
+        top : int, optional
+            Keyword-only. The number of the slowest resources to write
+            in the summary. Defaults to 10.
+
+        Attributes
+        ----------
+        report_path : str or None
+            The argument of `report_path`.
+        top : int
+            The argument of `top`.
+        """
+        self.report_path = report_path
+        self.top = top
+        self._timings = []
+
+    @contextlib.contextmanager
+    def resource(self, resource_id):
+        """
+        Return a context manager that times a resource update.
+
+        Parameters
+        ----------
+        resource_id : ~collections.abc.Hashable
+            The identity of the resource.
+
+        Returns
+        -------
+        ~contextlib.AbstractContextManager
+            A context manager that times the resource update.
+        """
+        global _active_timing
+        timing = _ResourceTiming(resource_id)
+        previous_timing = _active_timing
+        _active_timing = timing
+        timing.start()
+        try:
+            yield
+        finally:
+            timing.stop()
+            _active_timing = previous_timing
+            self._timings.append(timing)
+
+    def report_data(self):
+        """
+        Return the recorded times, with the slowest resources first.
+
+        Returns
+        -------
+        dict
+            The total wall-clock and processor times in seconds
+            (``"wall"``, ``"cpu"``) and a list of the times of each
+            resource (``"resources"``), sorted by wall-clock time. The
+            times of a resource include a dictionary of the times of
+            each phase (``"phases"``).
+        """
+        timings = sorted(
+            self._timings, key=lambda timing: timing.wall, reverse=True)
+        return {
+            "wall": sum(timing.wall for timing in timings),
+            "cpu": sum(timing.cpu for timing in timings),
+            "resources": [timing.data() for timing in timings],
+        }
+
+    def report(self):
+        """
+        Write a summary of the slowest resources and save a JSON report.
+
+        The recorded times are then forgotten. Nothing is reported if no
+        times have been recorded.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If the report file cannot be saved.
+        """
+        if not self._timings:
+            return
+        data = self.report_data()
+        self.clear()
+
+        if console.verbosity >= console.SUMMARY:
+            self._summarise(data)
+
+        if self.report_path is not None:
+            import json
+            fileio.save(
+                self.report_path, json.dumps(data, indent=2, sort_keys=True),
+                "utf-8")
+            console.summary("Build profile saved:", self.report_path)
+
+    def clear(self):
+        """Forget the recorded times."""
+        self._timings = []
+
+    def _summarise(self, data):
+        # Write a summary of the slowest resources to the console.
+        console.section("Build profile")
+        console.summary(
+            "{} resources in {:.3f}s wall, {:.3f}s CPU."
+            .format(len(data["resources"]), data["wall"], data["cpu"]))
+        for resource in data["resources"][:self.top]:
+            phases = ", ".join(
+                "{} {:.3f}s".format(name, times["wall"])
+                for name, times in sorted(resource["phases"].items()))
+            line = "{:9.3f}s wall {:9.3f}s CPU  {}".format(
+                resource["wall"], resource["cpu"], resource["id"])
+            if phases:
+                line += " ({})".format(phases)
+            console.summary("   ", line)
+
+
+class PreprocessorProfile:
+    """
+    A record of the time spent in preprocessor directives and files.
+
+    The preprocessors enter a *frame* (`PreprocessorProfile.frame`) for
+    each directive keyword (``"keyword:insert"``), inserted file
+    (``"file:index.html"``), *node* (``"node:title"``) and extra pass
+    over the output (``"pass:character_references"``). The nested
+    frames form a stack. The profile records the exclusive wall-clock
+    time of each stack and the number of times that each frame is
+    entered, aggregated across the whole build.
+
+    `PreprocessorProfile` is a context manager that is returned by
+    `PreprocessorProfile.frame`.
+
+    Class Interface
+    ---------------
+    frame
+        Enter a frame when the profile is used as a context manager.
+    collapsed_stacks
+        Return the recorded times in the collapsed-stack format.
+    save
+        Write the recorded times to a file in the collapsed-stack
+        format.
+
+    Magic Methods
+    -------------
+    __enter__
+        Start timing the frame that was last passed to
+        `PreprocessorProfile.frame`.
+    __exit__
+        Stop timing the current frame.
+
+    Example
+    -------
+    >>> from doxhooks.build_profiles import PreprocessorProfile
+    >>> profile = PreprocessorProfile()
+    >>> with profile.frame("file", "index.html"):
+    ...     with profile.frame("keyword", "insert"):
+    ...         pass
+    >>> sorted(profile.call_counts.items())
+    [('file:index.html', 1), ('keyword:insert', 1)]
+    >>> sorted(profile.times)
+    ['file:index.html', 'file:index.html;keyword:insert']
+    """
+
+    def __init__(self):
+        """
+        Initialise an empty profile.
+
+        Attributes
+        ----------
+        call_counts : dict
+            The number of times that each frame was entered.
+        times : dict
+            The exclusive wall-clock time in seconds of each stack of
+            frames.
+        """
+        self.call_counts = {}
+        self.times = {}
+        # Each frame is [frame, stack, start_time, child_time].
+        self._frames = []
+        self._next_frame = None
+
+    def frame(self, kind, name):
+        """
+        Enter a frame when the profile is used as a context manager.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of frame, e.g. ``"keyword"``, ``"file"``,
+            ``"node"`` or ``"pass"``.
+        name : str
+            The name of the frame.
+
+        Returns
+        -------
+        PreprocessorProfile
+            This profile.
+        """
+        # ";" separates the frames in a collapsed stack.
+        self._next_frame = "{}:{}".format(kind, str(name).replace(";", ","))
+        return self
+
+    def __enter__(self):
+        """
+        Start timing the frame that was last passed to `frame`.
+
+        Returns
+        -------
+        PreprocessorProfile
+            This profile.
+        """
+        frame = self._next_frame
+        if self._frames:
+            stack = self._frames[-1][1] + ";" + frame
+        else:
+            stack = frame
+        self._frames.append([frame, stack, time.perf_counter(), 0.0])
+        return self
+
+    def __exit__(self, *exc_info):
+        r"""
+        Stop timing the current frame.
+
+        Parameters
+        ----------
+        \*exc_info
+            Information about an exception raised in the frame.
+
+        Returns
+        -------
+        bool
+            ``False``, so that an exception is not suppressed.
+        """
+        frame, stack, start_time, child_time = self._frames.pop()
+        elapsed_time = time.perf_counter() - start_time
+        if self._frames:
+            self._frames[-1][3] += elapsed_time
+
+        self.call_counts[frame] = self.call_counts.get(frame, 0) + 1
+        self.times[stack] = (
+            self.times.get(stack, 0.0) + elapsed_time - child_time)
+        return False
+
+    def collapsed_stacks(self):
+        """
+        Return the recorded times in the collapsed-stack format.
+
+        Returns
+        -------
+        list[str]
+            A sorted line for each stack of frames. Each line is the
+            frames separated by ``;``, a space and the exclusive time in
+            microseconds.
+        """
+        return [
+            "{} {}".format(stack, round(time_ * 1e6))
+            for stack, time_ in sorted(self.times.items())
+        ]
+
+    def save(self, path):
+        """
+        Write the recorded times to a file in the collapsed-stack format.
+
+        The file can be read by flame-graph tools, e.g.
+        ``flamegraph.pl``.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file. The path must branch off one of the
+            output roots declared with
+            `~doxhooks.fileio.add_output_roots`.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If the file cannot be saved.
+        """
+        lines = self.collapsed_stacks()
+        fileio.save(path, "".join(line + "\n" for line in lines), "utf-8")
@@ -4,12 +4,41 @@ Format the information sent through the standard streams.
 `~doxhooks.console` is the interface between Doxhooks and the standard
 streams (stdout, stderr and stdin).
 
+The amount of information written to stdout depends on the *verbosity*
+(`verbosity`). The verbosity levels are `SILENT`, `SUMMARY`, `NORMAL`
+and `DEBUG`. A caller can skip the work of formatting some information
+if the information would not be written at the current verbosity.
+
+The information written to stdout can be buffered and written in
+batches (`start_buffering`, `stop_buffering`). Any buffered information
+is written to stdout before information is written to stderr, so that
+the order of the information is preserved.
+
+A stream of machine-readable build events can also be written to a file
+of newline-delimited JSON objects (`start_events`, `event`,
+`stop_events`). The events are encoded and written by a background
+thread. Warnings and errors are also written as events.
+
 Exports
 -------
+SILENT
+    The verbosity level that writes only errors and no information.
+SUMMARY
+    The verbosity level that writes only summaries and warnings.
+NORMAL
+    The verbosity level that writes information about each resource.
+DEBUG
+    The verbosity level that writes detailed debugging information.
+verbosity
+    The level of detail of the information written to stdout.
+summary
+    Write summary information to stdout.
 info
     Write important information to stdout.
 log
     Write general information to stdout.
+debug
+    Write debugging information to stdout.
 pre
     Write preformatted information to stdout.
 section
@@ -17,7 +46,11 @@ section
 blank_line
     Write a blank line to stdout.
 flush
-    Flush stdout.
+    Write any buffered information to stdout and flush stdout.
+start_buffering
+    Buffer the information written to stdout.
+stop_buffering
+    Write any buffered information and stop buffering.
 error
     Write error information to stderr.
 error_trace
@@ -26,6 +59,14 @@ warning
     Write a warning message to stderr.
 input
     Write a prompt to stderr and return the input from stdin.
+start_events
+    Start writing a stream of build events to a file.
+event
+    Write a build event to the stream.
+emitting_events
+    Return whether build events are being written to a stream.
+stop_events
+    Write any pending build events and stop the stream.
 
 
 .. testsetup::
@@ -35,24 +76,110 @@ input
 """
 
 
+import atexit
 import builtins
+import io
 import sys
+import time
+
+import doxhooks.fileio as fileio
 
 
 __all__ = [
+    "DEBUG",
+    "NORMAL",
+    "SILENT",
+    "SUMMARY",
     "blank_line",
+    "debug",
+    "emitting_events",
     "error",
     "error_trace",
+    "event",
     "flush",
     "info",
     "input",
     "log",
     "pre",
     "section",
+    "start_buffering",
+    "start_events",
+    "stop_buffering",
+    "stop_events",
+    "summary",
+    "verbosity",
     "warning",
 ]
 
 
+SILENT = 0
+"""The verbosity level that writes only errors and no information."""
+
+SUMMARY = 1
+"""The verbosity level that writes only summaries and warnings."""
+
+NORMAL = 2
+"""The verbosity level that writes information about each resource."""
+
+DEBUG = 3
+"""The verbosity level that writes detailed debugging information."""
+
+
+verbosity = NORMAL
+"""
+The level of detail of the information written to stdout.
+
+*int*
+
+The information is written to stdout only if its level is less than or
+equal to `verbosity`. Warnings are not written if the verbosity is
+`SILENT`. Errors are always written. Defaults to `NORMAL`.
+"""
+
+
+_buffer = None
+_buffer_size = 0
+_flush_at_exit = False
+_is_stdout_pending = False  # Information written since the last flush.
+
+
+def _print(level, *args):
+    # Write information to stdout (or the buffer) if its level is not
+    # above the verbosity.
+    global _is_stdout_pending
+    if level > verbosity:
+        return
+    _is_stdout_pending = True
+    if _buffer is None:
+        print(*args)
+        return
+    print(*args, file=_buffer)
+    if _buffer.tell() >= _buffer_size:
+        flush()
+
+
+def summary(arg, *args):
+    r"""
+    Write summary information to stdout.
+
+    The information is written if the `verbosity` is at least
+    `SUMMARY`.
+
+    Parameters
+    ----------
+    arg
+        Some information.
+    \*args
+        Some more information.
+
+    Example
+    -------
+    >>> doxhooks.console.summary("example", 1)
+    example 1
+    """
+    _print(SUMMARY, arg, *args)
+
+
 def info(arg, *args):
     r"""
     Write important information to stdout.
@@ -69,7 +196,7 @@ def info(arg, *args):
     >>> doxhooks.console.info("example", 1)
     example 1
     """
-    print(arg, *args)
+    _print(NORMAL, arg, *args)
 
 
 def log(arg, *args):
@@ -88,7 +215,31 @@ def log(arg, *args):
     >>> doxhooks.console.log("example", 1)
         example 1
     """
-    print("   ", arg, *args)
+    _print(NORMAL, "   ", arg, *args)
+
+
+def debug(arg, *args):
+    r"""
+    Write debugging information to stdout.
+
+    The information is written if the `verbosity` is `DEBUG`.
+
+    Parameters
+    ----------
+    arg
+        Some information.
+    \*args
+        Some more information.
+
+    Example
+    -------
+    >>> doxhooks.console.verbosity = doxhooks.console.DEBUG
+    >>> doxhooks.console.debug("example", 1)
+        example 1
+    >>> doxhooks.console.verbosity = doxhooks.console.NORMAL
+    >>> doxhooks.console.debug("example", 1)
+    """
+    _print(DEBUG, "   ", arg, *args)
 
 
 def pre(data):
@@ -105,13 +256,15 @@ def pre(data):
     >>> doxhooks.console.pre(" example   1")
      example   1
     """
-    print(data)
+    _print(NORMAL, data)
 
 
 def section(heading=None):
     """
     Write a section heading or section break to stdout.
 
+    The section is written if the `verbosity` is at least `SUMMARY`.
+
     Parameters
     ----------
     heading : optional
@@ -135,21 +288,60 @@ def section(heading=None):
         section_break_heading = ""
     else:
         section_break_heading = "### {} ".format(heading)
-    print("\n\n{:#<79}\n".format(section_break_heading))
+    _print(SUMMARY, "\n\n{:#<79}\n".format(section_break_heading))
 
 
 def blank_line():
     """Write a blank line to stdout."""
-    print()
+    _print(NORMAL)
 
 
 def flush():
-    """Flush stdout."""
+    """Write any buffered information to stdout and flush stdout."""
+    global _is_stdout_pending
+    _is_stdout_pending = False
+    if _buffer is not None and _buffer.tell():
+        sys.stdout.write(_buffer.getvalue())
+        _buffer.seek(0)
+        _buffer.truncate()
     sys.stdout.flush()
 
 
-def _print_stderr(*args, end="\n"):
+def start_buffering(size=65536):
+    """
+    Buffer the information written to stdout.
+
+    The buffered information is written to stdout when the buffer is
+    full, when information is written to stderr, when `flush` or
+    `stop_buffering` is called, and when the Python interpreter exits.
+
+    Parameters
+    ----------
+    size : int, optional
+        The number of characters that fill the buffer. Defaults to
+        65536.
+    """
+    global _buffer, _buffer_size, _flush_at_exit
+    if _buffer is None:
+        _buffer = io.StringIO()
+    _buffer_size = size
+    if not _flush_at_exit:
+        atexit.register(flush)
+        _flush_at_exit = True
+
+
+def stop_buffering():
+    """Write any buffered information and stop buffering."""
+    global _buffer
     flush()
+    _buffer = None
+
+
+def _print_stderr(*args, end="\n"):
+    # Write information to stderr after any information that is pending
+    # in stdout (or the buffer).
+    if _is_stdout_pending:
+        flush()
     print(*args, end=end, file=sys.stderr, flush=True)
 
 
@@ -178,6 +370,8 @@ def error(arg, *args):
         error_name = type(arg).__name__
 
     _print_stderr(" ** {}!".format(error_name), arg, *args)
+    if _events is not None:
+        event("error", name=error_name, message=_message(arg, *args))
 
 
 def error_trace(location, source):
@@ -198,12 +392,16 @@ def error_trace(location, source):
     """
     _print_stderr(
         " ** Error trace! {}: {}".format(location, source.rstrip("\n")))
+    if _events is not None:
+        event("error_trace", location=str(location), source=str(source))
 
 
 def warning(arg, *args):
     r"""
     Write a warning to stderr.
 
+    The warning is written unless the `verbosity` is `SILENT`.
+
     Parameters
     ----------
     arg
@@ -216,7 +414,10 @@ def warning(arg, *args):
     >>> doxhooks.console.warning("example", 1)
       * Warning! example 1
     """
-    _print_stderr("  * Warning!", arg, *args)
+    if verbosity > SILENT:
+        _print_stderr("  * Warning!", arg, *args)
+    if _events is not None:
+        event("warning", message=_message(arg, *args))
 
 
 def input(prompt=""):
@@ -241,3 +442,137 @@ def input(prompt=""):
     """
     _print_stderr(" >> {}".format(prompt), end="")
     return builtins.input()
+
+
+_events = None
+_event_thread = None
+_queue = None
+_stop_events_at_exit = False
+_max_pending_events = 10000
+
+
+def _message(*args):
+    # Return the message that print() would write for some arguments.
+    return " ".join(map(str, args))
+
+
+def _write_events(events, output):
+    # Encode and write the events until the stream is stopped.
+    import json
+
+    with output:
+        while True:
+            item = events.get()
+            if item is None:
+                return
+            timestamp, name, fields = item
+            fields["event"] = name
+            fields["time"] = timestamp
+            output.write(json.dumps(fields, default=repr) + "\n")
+
+
+def start_events(path):
+    """
+    Start writing a stream of build events to a file.
+
+    Each event is written as a JSON object on its own line. The object
+    contains the event name (``"event"``), the time of the event in
+    seconds since the epoch (``"time"``) and the fields of the event.
+    The stream is stopped when the Python interpreter exits.
+
+    At most 10000 events are pending at a time: `event` waits for the
+    background thread to write some events if there are more. The
+    stream is stopped if the background thread fails.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file. The path must branch off one of the output
+        roots declared with `~doxhooks.fileio.add_output_roots`.
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksFileError
+        If the file cannot be opened.
+    """
+    # The event stream is rarely used, so its modules are not imported
+    # until it is started.
+    import queue
+    import threading
+
+    global _events, _event_thread, _queue, _stop_events_at_exit
+    stop_events()
+    output = fileio.open_output(path, "utf-8")
+    _queue = queue
+    _events = queue.Queue(_max_pending_events)
+    _event_thread = threading.Thread(
+        target=_write_events, args=(_events, output), daemon=True)
+    _event_thread.start()
+    if not _stop_events_at_exit:
+        atexit.register(stop_events)
+        _stop_events_at_exit = True
+
+
+def emitting_events():
+    """
+    Return whether build events are being written to a stream.
+
+    A caller can skip the work of computing the fields of an event if
+    the event would not be written.
+
+    Returns
+    -------
+    bool
+        Whether `start_events` has been called and `stop_events` has not
+        been called since.
+    """
+    return _events is not None
+
+
+def event(name, **fields):
+    r"""
+    Write a build event to the stream.
+
+    The event is put in a queue and then encoded and written by a
+    background thread. The event is ignored if there is no stream, or
+    if the background thread has failed.
+
+    Parameters
+    ----------
+    name : str
+        The name of the event, e.g. ``"resource_start"``.
+    \**fields
+        The data of the event. Values that JSON cannot encode are
+        written as their `repr`.
+    """
+    if _events is not None:
+        _put_event((time.time(), name, fields))
+
+
+def _put_event(item):
+    # Put an item in the event queue, waiting while the queue is full,
+    # unless the background thread has failed. (The queue module was
+    # imported by start_events.)
+    global _events, _event_thread
+    while _event_thread.is_alive():
+        try:
+            _events.put(item, timeout=1)
+        except _queue.Full:
+            continue
+        return
+    _events = None
+    _event_thread = None
+    warning("The build-event stream failed and was stopped.")
+
+
+def stop_events():
+    """Write any pending build events and stop the stream."""
+    global _events, _event_thread
+    if _events is None:
+        return
+    _put_event(None)
+    if _event_thread is None:
+        return
+    _event_thread.join()
+    _events = None
+    _event_thread = None
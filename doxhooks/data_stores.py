@@ -3,7 +3,16 @@ Collections of data objects.
 
 The data objects can be loaded and saved individually (`DataStore.load`,
 `DataStore.save`) or all together (`DataStore.load_all`,
-`DataStore.save_all`).
+`DataStore.save_all`). After ``DataStore.load_all(lazy=True)`` is
+called, each data object is actually loaded when it is first accessed,
+so that the data files of unused data objects are neither read nor
+rewritten.
+
+In *journal* mode, the changes to a data object are written to the end
+of a journal file when the data object is saved, instead of rewriting
+the whole data file. The journal is replayed when the data object is
+loaded, and the journal is compacted into the data file when it becomes
+long.
 
 Exports
 -------
@@ -14,6 +23,9 @@ DataStore
 
 import os
 
+import doxhooks.dataio as dataio
+import doxhooks.fileio as fileio
+
 
 __all__ = [
     "DataStore",
@@ -26,10 +38,24 @@ class DataStore(dict):
 
     `DataStore` extends `dict`.
 
+    A data object can be saved in journal mode (`DataStore.journal`) if
+    it has the methods ``pop_journal`` and ``replay``, like
+    `~doxhooks.dependency_databases.DependencyDatabase` and
+    `~doxhooks.url_mappings.URLMapping`. The ``journal`` attribute of
+    the data object is set to `DataStore.journal` when it is loaded or
+    its data file is rewritten, so that it records its changes only in
+    journal mode.
+
+    `DataStore.save_all` does not save a data object that has not
+    changed, if the data object has a ``change_count`` attribute that
+    counts its changes.
+
     Class Interface
     ---------------
     load
         Tell a data object to load its data.
+    ensure_loaded
+        Load a data object if it is due to be loaded.
     save
         Tell a data object to save its data.
     load_all
@@ -37,12 +63,39 @@ class DataStore(dict):
     save_all
         Tell each data object in the collection to save its data.
 
+    get
+        Override `dict.get` to load a data object that is due to be
+        loaded.
+
     Magic Methods
     -------------
+    __getitem__
+        Override `dict.__getitem__` to load a data object that is due
+        to be loaded.
     __repr__
         Override `dict.__repr__` to return a non-literal representation.
     """
 
+    journal = False
+    """
+    Whether changes are appended to journal files when saving.
+
+    *bool*
+
+    Otherwise the whole data file of a data object is rewritten every
+    time the data object is saved. Defaults to ``False``.
+    """
+
+    compaction_threshold = 1000
+    """
+    The maximum number of records in a journal file.
+
+    *int*
+
+    The data file is rewritten and the journal file is emptied when
+    saving would make the journal longer than this. Defaults to 1000.
+    """
+
     def __init__(self, dir_path=os.curdir, **kwargs):
         r"""
         Initialise the data store.
@@ -64,6 +117,10 @@ class DataStore(dict):
         """
         self.dir_path = dir_path
         self.update(kwargs)
+        self._journal_lengths = {}
+        self._unsaved_records = {}
+        self._unloaded = set()
+        self._change_counts = {}
 
     def __repr__(self):
         """
@@ -79,13 +136,73 @@ class DataStore(dict):
         return "<{} object dir_path={!r} {!r}>".format(
             type(self).__name__, self.dir_path, set(self.keys()))
 
+    def __getitem__(self, key):
+        """
+        Return a data object, loading it first if it is due to be loaded.
+
+        Overrides `dict.__getitem__`.
+
+        Parameters
+        ----------
+        key : ~collections.abc.Hashable
+            The key for the data object.
+
+        Returns
+        -------
+        object
+            The data object.
+
+        Raises
+        ------
+        KeyError
+            If the key is not found in the data store.
+        ~doxhooks.errors.DoxhooksFileError
+            If the data file cannot be loaded.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If the data file contains invalid data.
+        """
+        self.ensure_loaded(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        """
+        Return a data object or a default value.
+
+        Overrides `dict.get`. The data object is loaded first if it is
+        due to be loaded.
+
+        Parameters
+        ----------
+        key : ~collections.abc.Hashable
+            The key for the data object.
+        default : optional
+            The value to return if the key is not found in the data
+            store. Defaults to ``None``.
+
+        Returns
+        -------
+        object
+            The data object or the default value.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
     def _path(self, key):
         return os.path.join(self.dir_path, str(key) + ".dat")
 
+    def _journal_path(self, key):
+        return os.path.join(self.dir_path, str(key) + ".journal")
+
     def load(self, key):
         """
         Tell a data object to load its data.
 
+        The records in the journal file of the data object are replayed
+        after the data file is loaded, and the data object is told
+        whether to record its changes (`DataStore.journal`).
+
         Parameters
         ----------
         key : ~collections.abc.Hashable
@@ -97,15 +214,61 @@ class DataStore(dict):
             If the key is not found in the data store.
         ~doxhooks.errors.DoxhooksFileError
             If the data file cannot be loaded.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If the data file or journal file contains invalid data.
         """
-        data_object = self[key]
+        data_object = super().__getitem__(key)
         path = self._path(key)
         data_object.load(path)
+        self._unloaded.discard(key)
+        self._unsaved_records.pop(key, None)
+
+        if hasattr(data_object, "replay"):
+            data_object.journal = self.journal
+            journal_path = self._journal_path(key)
+            if os.path.exists(journal_path):
+                records = dataio.load_journal(journal_path)
+                data_object.replay(records)
+            else:
+                records = ()
+            self._journal_lengths[key] = len(records)
+
+        self._record_change_count(key, data_object)
+
+    def ensure_loaded(self, key):
+        """
+        Load a data object if it is due to be loaded.
+
+        A caller that holds its own reference to a data object calls
+        `ensure_loaded` before using the data object, because the data
+        object is not loaded by ``DataStore.load_all(lazy=True)`` until
+        it is accessed through the data store.
+
+        Parameters
+        ----------
+        key : ~collections.abc.Hashable
+            The key for the data object.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If the data file cannot be loaded.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If the data file or journal file contains invalid data.
+        """
+        if key in self._unloaded:
+            self.load(key)
 
     def save(self, key):
         """
         Tell a data object to save its data.
 
+        In journal mode, the changes to a data object since it was
+        loaded or last saved are appended to its journal file, unless
+        the journal would become longer than the *compaction threshold*.
+        Otherwise the data file is rewritten and the journal file is
+        emptied.
+
         Parameters
         ----------
         key : ~collections.abc.Hashable
@@ -121,27 +284,98 @@ class DataStore(dict):
             If the data file cannot be saved.
         """
         data_object = self[key]
-        path = self._path(key)
-        data_object.save(path)
+        if not self._append_journal(key, data_object):
+            path = self._path(key)
+            data_object.save(path)
+            journal_path = self._journal_path(key)
+            if os.path.exists(journal_path):
+                fileio.save(journal_path, "", "ascii")
+            if hasattr(data_object, "pop_journal"):
+                data_object.journal = self.journal
+                self._journal_lengths[key] = 0
+            self._unsaved_records.pop(key, None)
+
+        self._record_change_count(key, data_object)
+
+    def _append_journal(self, key, data_object):
+        # Append the journal records of a data object to its journal
+        # file. Return False if the data file must be rewritten instead.
+        # The records are kept until they have been saved, so that they
+        # are not lost if saving fails.
+        journal_length = self._journal_lengths.get(key)
+        if not (self.journal and journal_length is not None and
+                hasattr(data_object, "pop_journal")):
+            return False
+
+        records = self._unsaved_records.pop(key, [])
+        records.extend(data_object.pop_journal())
+        self._unsaved_records[key] = records
+        journal_length += len(records)
+        if journal_length > self.compaction_threshold:
+            return False
 
-    def load_all(self):
+        if records:
+            dataio.append_journal(self._journal_path(key), records)
+        del self._unsaved_records[key]
+        self._journal_lengths[key] = journal_length
+        return True
+
+    def _record_change_count(self, key, data_object):
+        # Remember the change count of a data object whose data have
+        # just been loaded or saved.
+        try:
+            self._change_counts[key] = data_object.change_count
+        except AttributeError:
+            pass
+
+    def _is_changed(self, key):
+        # Return whether a data object may have changed since its data
+        # were loaded or saved. A data object without a change count
+        # may always have changed.
+        data_object = super().__getitem__(key)
+        try:
+            change_count = data_object.change_count
+        except AttributeError:
+            return True
+        return change_count != self._change_counts.get(key)
+
+    def load_all(self, *, lazy=False):
         """
         Tell each data object in the collection to load its data.
 
+        Parameters
+        ----------
+        lazy : bool, optional
+            Keyword-only. Whether the data objects are not loaded
+            immediately. A lazily loaded data object is loaded when it
+            is first accessed with `DataStore.__getitem__` or
+            `DataStore.get`. Defaults to ``False``.
+
         Raises
         ------
         ~doxhooks.errors.DoxhooksFileError
-            If a data file cannot be loaded.
+            If a data file cannot be loaded (unless `lazy` is true).
         ~doxhooks.errors.DoxhooksDataFileError
-            If a data file contains invalid data.
+            If a data file contains invalid data (unless `lazy` is
+            true).
         """
-        for key in self.keys():
-            self.load(key)
+        self._unloaded.update(self.keys())
+        if not lazy:
+            for key in self.keys():
+                self.ensure_loaded(key)
 
     def save_all(self):
         """
         Tell each data object in the collection to save its data.
 
+        A data object is not saved if it is still due to be loaded,
+        because its data have not been accessed since
+        ``DataStore.load_all(lazy=True)`` was called.
+
+        A data object that has a ``change_count`` attribute is saved
+        only if the count has changed since the data object was last
+        loaded or saved. Other data objects are always saved.
+
         Raises
         ------
         ~doxhooks.errors.DoxhooksDataError
@@ -150,4 +384,5 @@ class DataStore(dict):
             If a data file cannot be saved.
         """
         for key in self.keys():
-            self.save(key)
+            if key not in self._unloaded and self._is_changed(key):
+                self.save(key)
@@ -4,6 +4,10 @@ Load and save files of Python-literal data.
 Python-literal data that is successfully saved by `save_literals` is
 guaranteed to be restorable with `load_literals`.
 
+A journal file is a sequence of Python-literal records, one per line.
+Records are added to the end of a journal (`append_journal`) without
+rewriting the records that are already in the file (`load_journal`).
+
 See the description of `ast.literal_eval` for the list of supported
 Python literals.
 
@@ -13,6 +17,10 @@ load_literals
     Read a file of Python-literal data.
 save_literals
     Write a file of Python-literal data.
+load_journal
+    Read the records in a journal file.
+append_journal
+    Write records to the end of a journal file.
 
 See Also
 --------
@@ -22,12 +30,15 @@ doxhooks.fileio
 
 
 import ast
+import cmath
 
 import doxhooks.fileio as fileio
 from doxhooks.errors import DoxhooksDataError, DoxhooksDataFileError
 
 
 __all__ = [
+    "append_journal",
+    "load_journal",
     "load_literals",
     "save_literals",
 ]
@@ -68,7 +79,11 @@ def save_literals(path, data):
     """
     Write Python-literal data to a file and close the file.
 
-    An `ascii` representation of the literals is saved.
+    An `ascii` representation of the literals is saved. The types of the
+    data are checked before the file is opened, and then the
+    representation is written to the file in small parts, so that the
+    representation of a large `dict`, `list`, `set` or `tuple` (or of a
+    large container nested in one) is never held in memory.
 
     Parameters
     ----------
@@ -84,13 +99,165 @@ def save_literals(path, data):
     ~doxhooks.errors.DoxhooksFileError
         If the data file cannot be saved.
     """
-    string = ascii(data)
+    _check_literal(data)
+    with fileio.open_output(path, "ascii") as output:
+        for string in _iter_ascii(data):
+            output.write(string)
+
+
+_atomic_types = {bool, bytes, complex, float, int, str, type(None)}
+_container_types = {dict, list, set, tuple}
+
+
+def _check_literal(data, container_ids=frozenset()):
+    # Raise DoxhooksDataError unless ascii(data) is a Python literal
+    # that ast.literal_eval evaluates to data. Only the exact literal
+    # types are accepted, because a subclass can override __repr__.
+    type_ = type(data)
+
+    if type_ in _atomic_types:
+        # ascii() of an infinite or NaN number is not a literal.
+        restorable = type_ not in {complex, float} or cmath.isfinite(data)
+    elif type_ in _container_types:
+        # ascii(set()) is "set()" and ascii() of a recursive container
+        # contains "...", which are not literals.
+        restorable = (
+            (data or type_ is not set) and id(data) not in container_ids)
+        if restorable:
+            container_ids |= {id(data)}
+            items = data.items() if type_ is dict else zip(data)
+            for item in items:
+                for value in item:
+                    _check_literal(value, container_ids)
+    else:
+        restorable = False
+
+    if not restorable:
+        raise DoxhooksDataError(
+            "Data does not have a restorable representation:",
+            type_.__name__)
+
+
+# A container with more items than this is represented one item at a
+# time when it is saved, and so is a container with nested containers.
+# The items are joined into parts of about this number of items.
+_part_length = 64
+
+
+def _is_small(data):
+    # Return whether data is atomic, or a container with few items and
+    # no nested containers. (ascii() of small data is faster than
+    # iterating over it.)
+    type_ = type(data)
+    if type_ not in _container_types:
+        return True
+    if len(data) > _part_length:
+        return False
+    items = data.values() if type_ is dict else data
+    return _container_types.isdisjoint(map(type, items))
+
+
+def _iter_ascii(data):
+    # Return an iterator over the parts of ascii(data). The items of a
+    # container that is not small are represented one at a time, so
+    # that each part is small.
+    if _is_small(data):
+        yield ascii(data)
+        return
+
+    type_ = type(data)
+    if type_ is dict:
+        brackets = "{}"
+    else:
+        brackets = "[]" if type_ is list else "{}" if type_ is set else "()"
+    parts = [brackets[0]]
+    separator = ""
+    for item in data.items() if type_ is dict else data:
+        if type_ is dict:
+            key, item = item
+            parts.append(separator + ascii(key) + ": ")
+        else:
+            parts.append(separator)
+        if _is_small(item):
+            parts.append(ascii(item))
+        else:
+            yield "".join(parts)
+            parts = []
+            yield from _iter_ascii(item)
+        if len(parts) > _part_length:
+            yield "".join(parts)
+            parts = []
+        separator = ", "
+    if type_ is tuple and len(data) == 1:
+        parts.append(",")
+    parts.append(brackets[1])
+    yield "".join(parts)
+
+
+def load_journal(path):
+    """
+    Read a journal file and return a list of the records.
+
+    Each line of the file is a Python-literal record. The records are
+    safely evaluated with `ast.literal_eval`. An incomplete last line
+    (i.e. a record that was not completely written) is ignored, and it
+    is removed from the file so that more records can be appended.
+
+    Parameters
+    ----------
+    path : str
+        The path to the journal file.
+
+    Returns
+    -------
+    list
+        The evaluated records in the order that they were written.
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksFileError
+        If the journal file cannot be read, or if an incomplete record
+        cannot be removed from the file.
+    ~doxhooks.errors.DoxhooksDataFileError
+        If a record in the file is not Python-literal data.
+    """
+    string = fileio.load(path, "ascii")
+    lines = string.split("\n")
+    incomplete_record = lines.pop()  # Empty string or incomplete record.
     try:
-        evaluated_data = ast.literal_eval(string)
+        records = [ast.literal_eval(line) for line in lines]
     except (SyntaxError, ValueError) as error:
-        raise DoxhooksDataError("Data is not valid Python-literal data.") \
-            from error
-    if evaluated_data != data:
-        raise DoxhooksDataError(
-            "Data does not have a restorable representation.")
-    fileio.save(path, string, "ascii")
+        raise DoxhooksDataFileError("Bad journal file:", path) from error
+    if incomplete_record:
+        # Otherwise the next record would be appended to the end of the
+        # incomplete record.
+        fileio.save(path, string[:-len(incomplete_record)], "ascii")
+    return records
+
+
+def append_journal(path, records):
+    """
+    Write Python-literal records to the end of a journal file.
+
+    The journal file is created if it does not exist. An `ascii`
+    representation of each record is written on its own line.
+
+    Parameters
+    ----------
+    path : str
+        The path to the journal file.
+    records : Iterable
+        The Python-literal records to be written.
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksDataError
+        If a record is not restorable with `load_journal`.
+    ~doxhooks.errors.DoxhooksFileError
+        If the journal file cannot be written.
+    """
+    lines = []
+    for record in records:
+        _check_literal(record)
+        lines.append(ascii(record) + "\n")
+    fileio.append(path, "".join(lines), "ascii")
@@ -7,8 +7,16 @@ products that depend on a given feature can be retrieved
 (`DependencyDatabase.retrieve_products`). These are the products that
 are affected by a change in that feature.
 
+The features that are paths are also indexed in a *trie* of their path
+components, so that the products that depend on any path in a directory
+(`DependencyDatabase.retrieve_products_under`) or on any path that
+matches a glob pattern (`DependencyDatabase.retrieve_products_matching`)
+are retrieved without scanning the whole database.
+
 A database can be loaded and saved (`DependencyDatabase.load`,
-`DependencyDatabase.save`).
+`DependencyDatabase.save`). The updates since the database was loaded
+or saved are recorded in a journal (`DependencyDatabase.pop_journal`),
+which can be replayed later (`DependencyDatabase.replay`).
 
 Exports
 -------
@@ -27,6 +35,10 @@ doxhooks.resource_environments.ResourceEnvironment.update_dependents
 """
 
 
+import fnmatch
+import os
+import re
+
 import doxhooks.console as console
 import doxhooks.dataio as dataio
 from doxhooks.errors import DoxhooksDataFileError
@@ -37,20 +49,43 @@ __all__ = [
 ]
 
 
+_split_path = re.compile(r"[\\/]" if os.name == "nt" else "/").split
+
+_has_magic = re.compile(r"[*?[]").search
+
+_released = object()
+# The key of a released ID, which is not a product or feature value.
+
+
 class DependencyDatabase:
     """
     A database of *products* and their dependencies on *features*.
 
+    The database stores each product and feature value only once. The
+    values are interned as integer IDs, which are converted back to the
+    values when the products are retrieved or the database is saved. The
+    ID of a value is released when the value is no longer a product or
+    a feature, so a long-running session does not accumulate IDs.
+
     Class Interface
     ---------------
     update_dependencies
         Update the database with a product and its features.
     retrieve_products
         Return the products that depend on a given feature.
+    retrieve_products_under
+        Return the products that depend on a path in a given directory.
+    retrieve_products_matching
+        Return the products that depend on a path that matches a glob
+        pattern.
     load
         Replace the database with a database that is read from a file.
     save
         Write the database to a file.
+    pop_journal
+        Return and forget the updates since the journal was last popped.
+    replay
+        Update the database with records from a journal.
 
     Example
     -------
@@ -67,10 +102,82 @@ class DependencyDatabase:
     set()
     """
 
+    journal = False
+    """
+    Whether updates are recorded in the journal.
+
+    *bool*
+
+    A `~doxhooks.data_stores.DataStore` in journal mode sets this when
+    it loads the database. Otherwise nothing is recorded, so that the
+    products and features are not stored twice. Defaults to ``False``.
+    """
+
     def __init__(self):
-        """Initialise an empty database."""
+        """
+        Initialise an empty database.
+
+        Attributes
+        ----------
+        change_count : int
+            The number of times that the database has been changed by
+            updating, loading or replaying. The count is compared with a
+            previous count to find out whether the database has changed.
+        """
+        self._clear()
+        self.change_count = 0
+
+    def _clear(self):
+        # Products and features are interned as integer IDs, so that
+        # each product and feature value is stored only once. Each
+        # product ID maps to a frozenset of feature IDs and each
+        # feature ID maps to a set of product IDs. The IDs of values
+        # that are no longer products or features are released and
+        # reused.
+        self._keys = []
+        self._ids = {}
+        self._free_ids = []
         self._features_products = {}
         self._products_features = {}
+        self._journal = []
+        # Each node of the path trie is a dict of path components and
+        # child nodes. The ID of a path feature is stored in the node of
+        # its last component, in a set under the key None. (More than
+        # one path can have the same components, e.g. "a\\b" and "a/b"
+        # on Windows.)
+        self._path_trie = {}
+
+    def _intern(self, key):
+        # Return the integer ID of a product or feature.
+        try:
+            return self._ids[key]
+        except KeyError:
+            pass
+        if self._free_ids:
+            id_ = self._free_ids.pop()
+            self._keys[id_] = key
+        else:
+            id_ = len(self._keys)
+            self._keys.append(key)
+        self._ids[key] = id_
+        return id_
+
+    def _release(self, ids):
+        # Release the IDs that are no longer products or features.
+        keys = self._keys
+        for id_ in ids:
+            if (id_ in self._products_features or
+                    id_ in self._features_products or
+                    keys[id_] is _released):
+                continue
+            del self._ids[keys[id_]]
+            keys[id_] = _released
+            self._free_ids.append(id_)
+
+    def _values(self, ids):
+        # Return the set of product or feature values for some IDs.
+        keys = self._keys
+        return {keys[id_] for id_ in ids}
 
     def retrieve_products(self, feature):
         """
@@ -87,10 +194,161 @@ class DependencyDatabase:
             The products that depend on the feature.
         """
         try:
-            products = self._features_products[feature]
+            products = self._features_products[self._ids[feature]]
         except KeyError:
             return set()
-        return products.copy()
+        return self._values(products)
+
+    def _index_path(self, feature):
+        # Add a feature to the path trie if it is a path.
+        path = self._keys[feature]
+        if not isinstance(path, str):
+            return
+        node = self._path_trie
+        for component in _split_path(path):
+            node = node.setdefault(component, {})
+        node.setdefault(None, set()).add(feature)
+
+    def _unindex_path(self, feature):
+        # Remove a feature from the path trie and remove the nodes that
+        # are left empty.
+        path = self._keys[feature]
+        if not isinstance(path, str):
+            return
+        nodes = [self._path_trie]
+        components = _split_path(path)
+        for component in components:
+            nodes.append(nodes[-1][component])
+        features = nodes[-1][None]
+        features.remove(feature)
+        if features:
+            return
+        del nodes[-1][None]
+        for component, node in zip(reversed(components), reversed(nodes)):
+            if node:
+                break
+            del nodes[len(nodes) - 2][component]
+            nodes.pop()
+
+    def _trie_features(self, node):
+        # Return the IDs of the features in a node and its descendants.
+        features = []
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            for component, child in node.items():
+                if component is None:
+                    features.extend(child)
+                else:
+                    nodes.append(child)
+        return features
+
+    def _products_of_features(self, features):
+        # Return the set of products that depend on some feature IDs.
+        features_products = self._features_products
+        products = set()
+        for feature in features:
+            products.update(features_products[feature])
+        return self._values(products)
+
+    def retrieve_products_under(self, dir_path):
+        """
+        Return the products that depend on a path in a given directory.
+
+        The directory is searched recursively. Only the features that
+        are `str` paths are searched. The paths are compared component
+        by component, so the directory path must be normalised in the
+        same way as the paths in the database (see
+        `~doxhooks.filetrees.normalise_path`).
+
+        Parameters
+        ----------
+        dir_path : str
+            The path to the directory. A path to a file is also
+            accepted.
+
+        Returns
+        -------
+        set
+            The products that depend on the directory path or any path
+            in the directory.
+        """
+        components = _split_path(dir_path)
+        if len(components) > 1 and not components[-1]:
+            # The path ends with a separator.
+            del components[-1]
+        node = self._path_trie
+        for component in components:
+            try:
+                node = node[component]
+            except KeyError:
+                return set()
+        return self._products_of_features(self._trie_features(node))
+
+    def _match_trie(self, node, patterns, features):
+        # Add the IDs of the features in the descendants of a node that
+        # match some path-component patterns to a list.
+        if not patterns:
+            if None in node:
+                features.extend(node[None])
+            return
+        pattern, patterns = patterns[0], patterns[1:]
+        if pattern == "**":
+            # "**" matches any number of components, including none.
+            self._match_trie(node, patterns, features)
+            for component, child in node.items():
+                if component is not None:
+                    self._match_trie(child, ("**",) + patterns, features)
+            return
+        if not _has_magic(pattern):
+            child = node.get(pattern)
+            if child is not None:
+                self._match_trie(child, patterns, features)
+            return
+        for component, child in node.items():
+            if (component is not None and
+                    fnmatch.fnmatchcase(component, pattern)):
+                self._match_trie(child, patterns, features)
+
+    def retrieve_products_matching(self, pattern):
+        """
+        Return the products that depend on a path that matches a glob
+        pattern.
+
+        Each component of the pattern is matched with one path component
+        (see `fnmatch.fnmatchcase`), except that a ``**`` component
+        matches any number of path components. The components of the
+        pattern that are not glob patterns are looked up directly, so a
+        pattern that starts with a directory path only searches that
+        directory. Only the features that are `str` paths are searched.
+
+        Parameters
+        ----------
+        pattern : str
+            The glob pattern, which must be normalised in the same way
+            as the paths in the database (see
+            `~doxhooks.filetrees.normalise_path`).
+
+        Returns
+        -------
+        set
+            The products that depend on a path that matches the pattern.
+
+        Example
+        -------
+        >>> db = doxhooks.dependency_databases.DependencyDatabase()
+        >>> db.update_dependencies("page", ["./src/2025/news.txt"])
+        >>> db.retrieve_products_matching("./src/*/*.txt")
+        {'page'}
+        >>> db.retrieve_products_matching("./**/news.txt")
+        {'page'}
+        >>> db.retrieve_products_under("./src")
+        {'page'}
+        """
+        features = []
+        self._match_trie(
+            self._path_trie, tuple(_split_path(pattern)), features)
+        return self._products_of_features(set(features))
 
     def _add_product(self, product, features):
         # Add a product to each feature's set of products.
@@ -99,6 +357,7 @@ class DependencyDatabase:
                 self._features_products[feature].add(product)
             except KeyError:
                 self._features_products[feature] = {product}
+                self._index_path(feature)
 
     def _remove_product(self, product, features):
         # Remove a product from each feature's set of products.
@@ -110,11 +369,47 @@ class DependencyDatabase:
                 raise RuntimeError("Database is inconsistent.") from error
             if not products:
                 del self._features_products[feature]
+                self._unindex_path(feature)
+
+    def _update(self, product, features):
+        # Update the features of a product. Return None if the features
+        # are unchanged, or else the features that were added and
+        # removed, and whether the product did not have features.
+        intern = self._intern
+        product = intern(product)
+        updated_features = frozenset(map(intern, features))
+        products_features = self._products_features
+        previous_features = products_features.get(product, frozenset())
+
+        if updated_features == previous_features:
+            self._release((product,))
+            return None
+        self.change_count += 1
+
+        if updated_features:
+            products_features[product] = updated_features
+        else:
+            del products_features[product]
+
+        added_features = updated_features.difference(previous_features)
+        removed_features = previous_features.difference(updated_features)
+
+        self._add_product(product, added_features)
+        self._remove_product(product, removed_features)
+
+        changes = (
+            self._values(added_features), self._values(removed_features),
+            not previous_features)
+        self._release(removed_features.union((product,)))
+        return changes
 
     def update_dependencies(self, product, features):
         """
         Update the database with a product and its features.
 
+        The update is recorded in the *journal* (if `journal` is true)
+        if the features of the product are changed.
+
         Parameters
         ----------
         product : ~collections.abc.Hashable
@@ -122,32 +417,66 @@ class DependencyDatabase:
         features : Iterable[Hashable]
             The features of the product.
         """
-        updated_features = set(features)
-        products_features = self._products_features
-
-        try:
-            previous_features = products_features[product]
-        except KeyError:
-            if updated_features:
-                products_features[product] = updated_features
-                self._add_product(product, updated_features)
+        features = tuple(features)
+        changes = self._update(product, features)
+        if changes is None:
             return
+        if self.journal:
+            self._journal.append((product, features))
 
-        if updated_features:
-            products_features[product] = updated_features
-        else:
-            del products_features[product]
-
-        added_features = updated_features.difference(previous_features)
-        removed_features = previous_features.difference(updated_features)
+        added_features, removed_features, is_new_product = changes
+        if console.emitting_events():
+            console.event(
+                "dependencies", product=product,
+                added=sorted(added_features, key=repr),
+                removed=sorted(removed_features, key=repr))
 
+        if is_new_product or console.verbosity < console.NORMAL:
+            return
         if added_features:
             console.log("Added dependencies:", ", ".join(added_features))
-            self._add_product(product, added_features)
-
         if removed_features:
             console.log("Removed dependencies:", ", ".join(removed_features))
-            self._remove_product(product, removed_features)
+
+    def pop_journal(self):
+        """
+        Return and forget the updates since the journal was last popped.
+
+        The journal is also emptied when the database is loaded or
+        saved.
+
+        Returns
+        -------
+        list
+            The journal records. Each record is a `tuple` of a product
+            and a `tuple` of its features.
+        """
+        journal = self._journal
+        self._journal = []
+        return journal
+
+    def replay(self, records):
+        """
+        Update the database with records from a journal.
+
+        Parameters
+        ----------
+        records : Iterable[tuple]
+            The journal records, which were returned by
+            `DependencyDatabase.pop_journal`.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksDataFileError
+            If a record is not a dependency-database journal record.
+        """
+        for record in records:
+            try:
+                product, features = record
+                self._update(product, features)
+            except (TypeError, ValueError):
+                raise DoxhooksDataFileError(
+                    "Bad dependency-database journal record:", record)
 
     def load(self, path):
         """
@@ -183,8 +512,19 @@ class DependencyDatabase:
                 raise DoxhooksDataFileError(
                     "Bad dependency-database file:", path)
 
-        self._features_products = features_products
-        self._products_features = products_features
+        self._clear()
+        intern = self._intern
+        self._features_products = {
+            intern(feature): set(map(intern, products))
+            for feature, products in features_products.items()
+        }
+        self._products_features = {
+            intern(product): frozenset(map(intern, features))
+            for product, features in products_features.items()
+        }
+        for feature in self._features_products:
+            self._index_path(feature)
+        self.change_count += 1
 
     def save(self, path):
         """
@@ -211,8 +551,16 @@ class DependencyDatabase:
         ~doxhooks.errors.DoxhooksFileError
             If the file cannot be saved.
         """
+        keys = self._keys
         data = {
-            "features_products": self._features_products,
-            "products_features": self._products_features,
+            "features_products": {
+                keys[feature]: self._values(products)
+                for feature, products in self._features_products.items()
+            },
+            "products_features": {
+                keys[product]: self._values(features)
+                for product, features in self._products_features.items()
+            },
         }
         dataio.save_literals(path, data)
+        self._journal = []
@@ -10,7 +10,11 @@ file objects (`OutputFileDomain.open`) of output files. The contents of
 an output file can be saved (`OutputFileDomain.save`). The output
 filename can be mangled with the fingerprint of some data
 (`OutputFileDomain.fingerprint_files`,
-`OutputFileDomain.fingerprint_strings`).
+`OutputFileDomain.fingerprint_strings`), or mangled with the fingerprint
+of the file contents while the file is written
+(`OutputFileDomain.open_fingerprinted`). An output-file domain can
+record the content hashes of the files that it writes
+(`OutputFileDomain.hashes`).
 
 Exports
 -------
@@ -21,9 +25,14 @@ OutputFileDomain
 """
 
 
+import contextlib
+import io
+
 import doxhooks.console as console
 import doxhooks.fileio as fileio
 import doxhooks.fingerprint as fingerprint
+from doxhooks.build_profiles import phase
+from doxhooks.errors import DoxhooksFileError
 
 
 __all__ = [
@@ -134,6 +143,33 @@ class InputFileDomain:
         return fileio.open_input(path, self.encoding)
 
 
+class _HashingWriter(io.BufferedIOBase):
+    # A binary file that updates a hash object with the bytes that are
+    # written to another binary file.
+
+    def __init__(self, file, hash_object):
+        self._file = file
+        self._hash_object = hash_object
+
+    def writable(self):
+        return True
+
+    def write(self, bytes_):
+        self._hash_object.update(bytes_)
+        return self._file.write(bytes_)
+
+    def flush(self):
+        super().flush()
+        self._file.flush()
+
+    def close(self):
+        if not self.closed:
+            try:
+                super().close()
+            finally:
+                self._file.close()
+
+
 class OutputFileDomain:
     """
     High-level output-file operations and data.
@@ -144,15 +180,23 @@ class OutputFileDomain:
         Return the path to an output file.
     open
         Open an output file in writing mode and return the file object.
+    open_fingerprinted
+        Open an output file that is fingerprinted while it is written.
     save
         Write the contents of an output file and close the file.
+    copy
+        Copy a file to the output file path.
+    hashes
+        The content hashes of the output files that have been written.
     fingerprint_files
         Mangle the output filename with the fingerprint of some files.
     fingerprint_strings
         Mangle the output filename with the fingerprint of some strings.
     """
 
-    def __init__(self, filetree, dir_path, filename, encoding, newline):
+    def __init__(
+            self, filetree, dir_path, filename, encoding, newline, *,
+            precompressor=None, record_hashes=False, resource_id=None):
         """
         Initialise the file domain with a file tree and file data.
 
@@ -170,6 +214,19 @@ class OutputFileDomain:
         newline : str or None
             See the *newline* parameter of `open` or `io.TextIOWrapper`
             for details. Should be ``None`` for binary files.
+        precompressor : ~doxhooks.precompressors.Precompressor or None, optional
+            Keyword-only. A precompressor that writes compressed
+            variants of the output files. Defaults to ``None``, which
+            denotes that compressed variants are not written.
+        record_hashes : bool, optional
+            Keyword-only. Whether to record the content hashes of the
+            output files (`OutputFileDomain.hashes`). Defaults to
+            ``False``.
+        resource_id : ~collections.abc.Hashable, optional
+            Keyword-only. The identity of the resource that writes the
+            output files, which is a field of the ``"output"`` build
+            events (see `~doxhooks.console.event`). Defaults to
+            ``None``.
 
         Attributes
         ----------
@@ -181,12 +238,55 @@ class OutputFileDomain:
             The argument of `encoding`.
         newline : str or None
             The argument of `newline`.
+        precompressor : ~doxhooks.precompressors.Precompressor or None
+            The argument of `precompressor`.
+        resource_id : ~collections.abc.Hashable
+            The argument of `resource_id`.
         """
         self._filetree = filetree
         self.dir_path = dir_path
         self.filename = self._initial_filename = filename
         self.encoding = encoding
         self.newline = newline
+        self.precompressor = precompressor
+        self.resource_id = resource_id
+        # Each output path maps to a hash object that is updated with
+        # the bytes that are written to the file.
+        self._hash_objects = {} if record_hashes else None
+
+    @property
+    def hashes(self):
+        """
+        The content hashes of the output files that have been written.
+
+        *dict or None*
+
+        Each output path maps to the hexadecimal digest of the contents
+        of the file, computed with the fingerprinting algorithm. The
+        value is ``None`` if the hashes are not recorded.
+        """
+        hash_objects = self._hash_objects
+        if hash_objects is None:
+            return None
+        return {
+            path: hash_object.hexdigest()
+            for path, hash_object in hash_objects.items()
+        }
+
+    def _open_hashing(self, path, hash_object, precompressor=None):
+        # Open an output file that updates a hash object with the
+        # encoded bytes that are written to it. The precompressor is not
+        # called if writing the file failed.
+        file = _HashingWriter(fileio.open_output(path, None), hash_object)
+        if precompressor is None:
+            if self.encoding is None:
+                return file
+            return io.TextIOWrapper(file, self.encoding, self.newline)
+        file = fileio._PrecompressedFile(file, path, precompressor)
+        if self.encoding is None:
+            return file
+        return fileio._PrecompressedTextFile(
+            file, self.encoding, self.newline)
 
     def path(self, *, rewrite=None):
         """
@@ -243,8 +343,79 @@ class OutputFileDomain:
         ~doxhooks.errors.DoxhooksFileError
             If the file cannot be opened.
         """
-        return fileio.open_output(
-            self.path(rewrite=rewrite), self.encoding, self.newline)
+        path = self.path(rewrite=rewrite)
+        console.event("output", resource=self.resource_id, path=path)
+        if self._hash_objects is None:
+            return fileio.open_output(
+                path, self.encoding, self.newline,
+                precompressor=self.precompressor)
+        hash_object = self._hash_objects[path] = fingerprint.new_hash_object()
+        return self._open_hashing(path, hash_object, self.precompressor)
+
+    @contextlib.contextmanager
+    def open_fingerprinted(self, *, rewrite=None):
+        """
+        Open an output file that is fingerprinted while it is written.
+
+        The data is written to a temporary file and the encoded bytes
+        are fingerprinted as they are written. When the file is closed,
+        the output filename is mangled with the fingerprint and the
+        temporary file is renamed to the output file. The output data
+        is therefore encoded only once and is not kept in memory.
+
+        The fingerprint is the same as the fingerprint of the saved file
+        (`fingerprint_files`). It differs from the fingerprint of the
+        data (`fingerprint_strings`) if the newlines are translated when
+        the data is written.
+
+        Note
+        ----
+            If a file already exists at the output path, it will be
+            overwritten.
+
+        Parameters
+        ----------
+        rewrite : optional
+            Keyword-only. A value that will replace a substring ``"{}"``
+            in the path. Defaults to ``None``, which denotes that the
+            path will not be rewritten.
+
+        Returns
+        -------
+        ~contextlib.AbstractContextManager
+            A context manager that returns a binary file (if
+            `self.encoding` is ``None``) or a text file (if
+            `self.encoding` is not ``None``). The temporary file is
+            removed if an exception is raised in the context.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksDataError
+            If the file-domain data is invalid.
+        ~doxhooks.errors.DoxhooksFileError
+            If the file cannot be opened, written or renamed.
+        """
+        temp_path = self._filetree.path(
+            self.dir_path, self._initial_filename, rewrite=rewrite) + ".tmp"
+        hash_object = fingerprint.new_hash_object()
+        file = self._open_hashing(temp_path, hash_object)
+        try:
+            with file:
+                yield file
+        except BaseException:
+            try:
+                fileio.remove(temp_path)
+            except DoxhooksFileError:
+                pass
+            raise
+
+        self.filename = fingerprint.filename_for_hash_object(
+            self._initial_filename, hash_object)
+        path = self.path(rewrite=rewrite)
+        fileio.move(temp_path, path, precompressor=self.precompressor)
+        if self._hash_objects is not None:
+            self._hash_objects[path] = hash_object
+        console.event("output", resource=self.resource_id, path=path)
 
     def save(self, data, *, rewrite=None):
         """
@@ -272,8 +443,62 @@ class OutputFileDomain:
         ~doxhooks.errors.DoxhooksFileError
             If the file cannot be saved.
         """
-        fileio.save(
-            self.path(rewrite=rewrite), data, self.encoding, self.newline)
+        path = self.path(rewrite=rewrite)
+        with phase("write"):
+            if self._hash_objects is None:
+                fileio.save(
+                    path, data, self.encoding, self.newline,
+                    precompressor=self.precompressor)
+            else:
+                hash_object = fingerprint.new_hash_object()
+                self._hash_objects[path] = hash_object
+                with self._open_hashing(
+                        path, hash_object, self.precompressor) as output:
+                    output.write(data)
+        console.event("output", resource=self.resource_id, path=path)
+
+    def copy(self, input_path, *, rewrite=None):
+        """
+        Copy a file to the output file path.
+
+        Note
+        ----
+            If a file already exists at the output path, it will be
+            overwritten.
+
+        Parameters
+        ----------
+        input_path : str
+            The path to the file.
+        rewrite : optional
+            Keyword-only. A value that will replace a substring ``"{}"``
+            in the output path. Defaults to ``None``, which denotes that
+            the path will not be rewritten.
+
+        Returns
+        -------
+        str
+            The output file path.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksDataError
+            If the file-domain data is invalid.
+        ~doxhooks.errors.DoxhooksFileError
+            If the file cannot be copied.
+        """
+        path = self.path(rewrite=rewrite)
+        fileio.copy(input_path, path, precompressor=self.precompressor)
+        if self._hash_objects is not None:
+            hash_object = fingerprint.new_hash_object()
+            with fileio.open_input(input_path, None) as input_:
+                while True:
+                    bytes_ = input_.read(65536)
+                    if not bytes_:
+                        break
+                    hash_object.update(bytes_)
+            self._hash_objects[path] = hash_object
+        return path
 
     def fingerprint_files(self, path, *paths):
         r"""
@@ -296,8 +521,9 @@ class OutputFileDomain:
         ~doxhooks.errors.DoxhooksFileError
             If a file cannot be read.
         """
-        self.filename = fingerprint.filename_for_files(
-            self._initial_filename, path, *paths)
+        with phase("fingerprint"):
+            self.filename = fingerprint.filename_for_files(
+                self._initial_filename, path, *paths)
 
     def fingerprint_strings(self, string, *strings):
         r"""
@@ -314,5 +540,7 @@ class OutputFileDomain:
         \*strings : str, optional
             More strings to be fingerprinted.
         """
-        self.filename = fingerprint.filename_for_strings(
-            self._initial_filename, string, *strings, encoding=self.encoding)
+        with phase("fingerprint"):
+            self.filename = fingerprint.filename_for_strings(
+                self._initial_filename, string, *strings,
+                encoding=self.encoding)
@@ -13,10 +13,16 @@ load
     Read the contents of a file.
 save
     Write the contents of a file.
+append
+    Write data to the end of a file.
 open_input
     Open a file in reading mode and return the file object.
 open_output
     Open a file in writing mode and return the file object.
+move
+    Move a file.
+remove
+    Remove a file.
 
 See Also
 --------
@@ -25,8 +31,8 @@ doxhooks.dataio
 """
 
 
+import io
 import os
-import shutil
 
 from doxhooks.errors import (
     DoxhooksFileSystemError, DoxhooksOutputPathError, DoxhooksValueError)
@@ -34,10 +40,13 @@ from doxhooks.errors import (
 
 __all__ = [
     "add_output_roots",
+    "append",
     "copy",
     "load",
+    "move",
     "open_input",
     "open_output",
+    "remove",
     "save",
 ]
 
@@ -86,7 +95,7 @@ def _makedirs(path):
             from error
 
 
-def copy(input_path, output_path):
+def copy(input_path, output_path, *, precompressor=None):
     """
     Copy a file.
 
@@ -103,6 +112,10 @@ def copy(input_path, output_path):
         The path to the file.
     output_path : str
         The path that the file is copied to.
+    precompressor : ~doxhooks.precompressors.Precompressor or None, optional
+        Keyword-only. A precompressor that writes compressed variants
+        of the output file. Defaults to ``None``, which denotes that
+        compressed variants are not written.
 
     Raises
     ------
@@ -117,6 +130,9 @@ def copy(input_path, output_path):
     doxhooks.resources.Resource._write
         Copy the input file to the output file path.
     """
+    # shutil is slow to import and is only needed to copy files.
+    import shutil
+
     _check_output_path(output_path)
     _makedirs(output_path)
     try:
@@ -127,6 +143,87 @@ def copy(input_path, output_path):
         raise DoxhooksFileSystemError(
             "Cannot copy file from {!r} to {!r}."
             .format(input_path, output_path)) from error
+    if precompressor is not None:
+        precompressor.compress(output_path)
+
+
+def move(input_path, output_path, *, precompressor=None):
+    """
+    Move a file.
+
+    Note
+    ----
+        If a file already exists at the output path, it will be
+        replaced.
+
+    The file is moved by renaming it, so the output file is replaced in
+    one step (if the paths are on the same file system). The output
+    path directories are created if they do not exist.
+
+    Parameters
+    ----------
+    input_path : str
+        The path to the file.
+    output_path : str
+        The path that the file is moved to.
+    precompressor : ~doxhooks.precompressors.Precompressor or None, optional
+        Keyword-only. A precompressor that writes compressed variants
+        of the output file. Defaults to ``None``, which denotes that
+        compressed variants are not written.
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksOutputPathError
+        If the input path or the output path does not branch off any of
+        the output roots declared with `add_output_roots`.
+    ~doxhooks.errors.DoxhooksFileSystemError
+        If the file cannot be found or moved.
+
+    See Also
+    --------
+    doxhooks.file_domains.OutputFileDomain.open_fingerprinted
+        Open an output file that is fingerprinted while it is written.
+    """
+    _check_output_path(input_path)
+    _check_output_path(output_path)
+    _makedirs(output_path)
+    try:
+        os.replace(input_path, output_path)
+    except FileNotFoundError:
+        raise DoxhooksFileSystemError("Cannot find file:", input_path)
+    except OSError as error:
+        raise DoxhooksFileSystemError(
+            "Cannot move file from {!r} to {!r}."
+            .format(input_path, output_path)) from error
+    if precompressor is not None:
+        precompressor.compress(output_path)
+
+
+def remove(path):
+    """
+    Remove a file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksOutputPathError
+        If the path does not branch off any of the output roots declared
+        with `add_output_roots`.
+    ~doxhooks.errors.DoxhooksFileSystemError
+        If the file cannot be found or removed.
+    """
+    _check_output_path(path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        raise DoxhooksFileSystemError("Cannot find file:", path)
+    except OSError as error:
+        raise DoxhooksFileSystemError("Cannot remove file:", path) \
+            from error
 
 
 def _open(path, mode, encoding, newline):
@@ -183,13 +280,65 @@ def open_input(path, encoding, newline=None):
     return _open(path, "r", encoding, newline)
 
 
-def open_output(path, encoding, newline=None):
+class _PrecompressedFile(io.BufferedIOBase):
+    # A binary file that passes its path to a precompressor when the
+    # file is closed, unless writing the file failed.
+
+    def __init__(self, file, path, precompressor):
+        self._file = file
+        self._path = path
+        self._precompressor = precompressor
+        self._is_failed = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._is_failed = True
+        return super().__exit__(exc_type, exc_value, traceback)
+
+    def writable(self):
+        return True
+
+    def write(self, bytes_):
+        try:
+            return self._file.write(bytes_)
+        except BaseException:
+            self._is_failed = True
+            raise
+
+    def flush(self):
+        super().flush()
+        self._file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            super().close()
+        finally:
+            self._file.close()
+        if not self._is_failed:
+            self._precompressor.compress(self._path)
+
+
+class _PrecompressedTextFile(io.TextIOWrapper):
+    # A text file that does not pass its path to a precompressor if an
+    # exception is raised while the file is open in a with statement.
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.buffer._is_failed = True
+        return super().__exit__(exc_type, exc_value, traceback)
+
+
+def open_output(
+        path, encoding, newline=None, *, append=False, precompressor=None):
     """
     Open a file in writing mode and return the file object.
 
     Note
     ----
-        If a file already exists at the path, it will be overwritten.
+        If a file already exists at the path, it will be overwritten,
+        unless the file is opened in appending mode.
 
     The path directories are created if they do not exist.
 
@@ -204,6 +353,16 @@ def open_output(path, encoding, newline=None):
         See the *newline* parameter of `open` or `io.TextIOWrapper` for
         details. Should be ``None`` for binary files. Defaults to
         ``None``.
+    append : bool, optional
+        Keyword-only. Whether to open the file in appending mode, so
+        that data is written to the end of an existing file. Defaults
+        to ``False``.
+    precompressor : ~doxhooks.precompressors.Precompressor or None, optional
+        Keyword-only. A precompressor that writes compressed variants
+        of the file when the file is closed. The variants are not
+        written if writing the file raised an exception. Defaults to
+        ``None``, which denotes that compressed variants are not
+        written.
 
     Returns
     -------
@@ -225,12 +384,25 @@ def open_output(path, encoding, newline=None):
     --------
     save
         Write the contents of a file and close the file.
+    append
+        Write data to the end of a file and close the file.
     doxhooks.file_domains.OutputFileDomain.open
         Open an output file in writing mode and return the file object.
     """
     _check_output_path(path)
     _makedirs(path)
-    return _open(path, "w", encoding, newline)
+    mode = "a" if append else "w"
+    if precompressor is None:
+        return _open(path, mode, encoding, newline)
+
+    if encoding is None and newline is not None:
+        raise DoxhooksValueError(
+            newline, "newline", "None when encoding is None")
+    file = _PrecompressedFile(
+        _open(path, mode, None, None), path, precompressor)
+    if encoding is None:
+        return file
+    return _PrecompressedTextFile(file, encoding, newline)
 
 
 def load(path, encoding, newline=None):
@@ -273,7 +445,7 @@ def load(path, encoding, newline=None):
         return input_.read()
 
 
-def save(path, data, encoding, newline=None):
+def save(path, data, encoding, newline=None, *, precompressor=None):
     """
     Write the contents of a file and close the file.
 
@@ -298,6 +470,10 @@ def save(path, data, encoding, newline=None):
         See the *newline* parameter of `open` or `io.TextIOWrapper` for
         details. Should be ``None`` for binary data. Defaults to
         ``None``.
+    precompressor : ~doxhooks.precompressors.Precompressor or None, optional
+        Keyword-only. A precompressor that writes compressed variants
+        of the file. Defaults to ``None``, which denotes that
+        compressed variants are not written.
 
     Raises
     ------
@@ -316,5 +492,47 @@ def save(path, data, encoding, newline=None):
     doxhooks.dataio.save_literals
         Write Python literal data to a file and close the file.
     """
-    with open_output(path, encoding, newline) as output:
+    with open_output(
+            path, encoding, newline, precompressor=precompressor) as output:
+        output.write(data)
+
+
+def append(path, data, encoding, newline=None):
+    """
+    Write data to the end of a file and close the file.
+
+    This function is a convenience wrapper for `open_output`. The file
+    and the path directories are created if they do not exist.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    data : bytes or str
+        The data to be written. Binary data is `bytes` and text data is
+        `str`.
+    encoding : str or None
+        The encoding of the data. The encoding of binary data is
+        ``None``.
+    newline : str or None, optional
+        See the *newline* parameter of `open` or `io.TextIOWrapper` for
+        details. Should be ``None`` for binary data. Defaults to
+        ``None``.
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksOutputPathError
+        If the path does not branch off any of the output roots declared
+        with `add_output_roots`.
+    ~doxhooks.errors.DoxhooksValueError
+        If `encoding` is ``None`` and `newline` is not ``None``.
+    ~doxhooks.errors.DoxhooksFileSystemError
+        If the file cannot be written.
+
+    See Also
+    --------
+    doxhooks.dataio.append_journal
+        Write Python-literal records to the end of a journal file.
+    """
+    with open_output(path, encoding, newline, append=True) as output:
         output.write(data)
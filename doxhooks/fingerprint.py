@@ -6,7 +6,9 @@ Resources that are not preprocessed (images, fonts, etc) can be
 
 Preprocessed resources (scripts, stylesheets, etc) are more conveniently
 fingerprinted with `filename_for_strings` before the output files are
-saved.
+saved. Large output files can be fingerprinted while they are written,
+by updating a hash object (`new_hash_object`) with the bytes as they are
+written and then mangling the filename (`filename_for_hash_object`).
 
 `filename_for_files` and `filename_for_strings` accept more than one
 file or string because a URL can map to more than one file on the server
@@ -18,8 +20,14 @@ filename_for_files
     Mangle a filename with the fingerprint of one or more files.
 filename_for_strings
     Mangle a filename with the fingerprint of one or more strings.
+filename_for_hash_object
+    Mangle a filename with the fingerprint in a hash object.
+new_hash_object
+    Return a new hash object of the fingerprinting algorithm.
 max_length
     The maximum length of the fingerprint in a mangled filename.
+read_ahead
+    The number of chunks of files that are read ahead of hashing.
 separator
     The substring that separates a fingerprint from the filename stem.
 algorithm
@@ -55,8 +63,11 @@ __all__ = [
     "algorithm",
     "algorithms",
     "filename_for_files",
+    "filename_for_hash_object",
     "filename_for_strings",
     "max_length",
+    "new_hash_object",
+    "read_ahead",
     "separator",
 ]
 
@@ -122,6 +133,22 @@ Example
     doxhooks.fingerprint.max_length = max_length
 """
 
+read_ahead = 0
+"""
+The number of chunks of files that are read ahead of hashing.
+
+*int*
+
+When more than one file is fingerprinted (by `filename_for_files`), the
+files can be read in chunks on another thread, so that reading the next
+chunks overlaps with hashing the current chunk. Up to this number of
+chunks of 64 KiB are held in memory. Reading ahead is faster only if
+reading the files is slow (e.g. on a network file system), and it is
+slightly slower if the files are already cached in memory. ``0``
+denotes that the files are read and hashed one chunk after another.
+Defaults to ``0``.
+"""
+
 separator = "-"
 """
 The substring that separates a fingerprint from the filename stem.
@@ -149,10 +176,28 @@ Example
 """
 
 
-def _filename_for_bytestrings(filename, bytestrings):
-    # Return a filename mangled with the fingerprint of some bytes.
+def new_hash_object():
+    """
+    Return a new hash object of the fingerprinting algorithm.
+
+    The fingerprint of some data is computed by updating the hash object
+    with the data (incrementally, if necessary) and passing the hash
+    object to `filename_for_hash_object`.
+
+    Returns
+    -------
+    hashlib.hash
+        A new hash object of the algorithm (`algorithm`).
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksValueError
+        If `algorithm` is not an available algorithm.
+    ~doxhooks.errors.DoxhooksTypeError
+        If `algorithm` is not a `str`.
+    """
     try:
-        hash_object = hashlib.new(algorithm)
+        return hashlib.new(algorithm)
     except ValueError as error:
         raise DoxhooksValueError(algorithm, "doxhooks.fingerprint.algorithm") \
             from error
@@ -160,10 +205,35 @@ def _filename_for_bytestrings(filename, bytestrings):
         raise DoxhooksTypeError(
             algorithm, "doxhooks.fingerprint.algorithm", "str")
 
-    for bytes_ in bytestrings:
-        hash_object.update(bytes_)
-    hash_ = hash_object.hexdigest()
 
+def filename_for_hash_object(filename, hash_object):
+    """
+    Mangle a filename with the fingerprint in a hash object.
+
+    Parameters
+    ----------
+    filename : str
+        The filename to be mangled.
+    hash_object : hashlib.hash
+        A hash object that was returned by `new_hash_object` and updated
+        with the data to be fingerprinted.
+
+    Returns
+    -------
+    str
+        The mangled filename.
+
+    Raises
+    ------
+    ~doxhooks.errors.DoxhooksTypeError
+        If `max_length` or `separator` is the wrong type.
+
+    See Also
+    --------
+    doxhooks.file_domains.OutputFileDomain.open_fingerprinted
+        Open an output file that is fingerprinted while it is written.
+    """
+    hash_ = hash_object.hexdigest()
     try:
         truncated_hash = hash_[:max_length]
     except TypeError:
@@ -183,9 +253,16 @@ def _filename_for_bytestrings(filename, bytestrings):
         raise
 
 
-def _bytestrings_from_files(*paths):
+def _filename_for_bytestrings(filename, bytestrings):
+    # Return a filename mangled with the fingerprint of some bytes.
+    hash_object = new_hash_object()
+    for bytes_ in bytestrings:
+        hash_object.update(bytes_)
+    return filename_for_hash_object(filename, hash_object)
+
+
+def _bytestrings_from_files(*paths, chunk_size=8192):
     # Yield contents of files as chunks of bytes.
-    chunk_size = 8192
     for path in paths:
         with fileio.open_input(path, encoding=None) as input_:
             while True:
@@ -196,6 +273,53 @@ def _bytestrings_from_files(*paths):
                     break
 
 
+def _read_ahead(bytestrings, max_chunks):
+    # Yield chunks of bytes from an iterator that is advanced on another
+    # thread, up to max_chunks ahead of the caller. (Reading a file and
+    # hashing a large chunk both release the GIL.) An error that is
+    # raised by the iterator is raised again in the calling thread.
+    # (Reading ahead is optional, so its modules are not imported with
+    # doxhooks.fingerprint.)
+    import queue
+    import threading
+
+    chunks = queue.Queue(max_chunks)
+    stopping = threading.Event()
+
+    def read():
+        try:
+            for bytes_ in bytestrings:
+                if stopping.is_set():
+                    return
+                chunks.put((bytes_, None))
+        except Exception as error:
+            chunks.put((None, error))
+        else:
+            chunks.put((None, None))
+        finally:
+            bytestrings.close()
+
+    reader = threading.Thread(
+        target=read, name="doxhooks-fingerprint", daemon=True)
+    reader.start()
+    try:
+        while True:
+            bytes_, error = chunks.get()
+            if bytes_ is None:
+                if error is not None:
+                    raise error
+                return
+            yield bytes_
+    finally:
+        # Unblock the reader if it is waiting for space in the queue.
+        stopping.set()
+        while reader.is_alive():
+            try:
+                chunks.get_nowait()
+            except queue.Empty:
+                reader.join(0.001)
+
+
 def filename_for_files(filename, path, *paths):
     r"""
     Mangle a filename with the fingerprint of one or more files.
@@ -229,7 +353,12 @@ def filename_for_files(filename, path, *paths):
     doxhooks.file_domains.OutputFileDomain.fingerprint_files
         Mangle the output filename with the fingerprint of some files.
     """
-    bytestrings = _bytestrings_from_files(path, *paths)
+    if paths and read_ahead > 0:
+        bytestrings = _read_ahead(
+            _bytestrings_from_files(path, *paths, chunk_size=65536),
+            read_ahead)
+    else:
+        bytestrings = _bytestrings_from_files(path, *paths)
     return _filename_for_bytestrings(filename, bytestrings)
 
 
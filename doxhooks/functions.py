@@ -17,6 +17,7 @@ importattr
 
 import importlib
 import re
+import sys
 
 from doxhooks.errors import (
     DoxhooksForbiddenLookupError, DoxhooksImportError, DoxhooksLookupError,
@@ -103,10 +104,22 @@ def findvalue(object, name):
     raise DoxhooksLookupError(name, object_, "object")
 
 
+_match_import_name = re.compile(
+    r"(?P<module_name>(?:\w+\.)*\w+)\.(?P<attr_name>\w+)$").match
+
+
+# Each import name maps to the module name, the imported module and the
+# attribute value.
+_imported_attrs = {}
+
+
 def importattr(import_name):
     """
     Import a module and return an attribute from that module.
 
+    The attribute value is cached. The cached value is returned while
+    the module that it was imported from is still in `sys.modules`.
+
     Parameters
     ----------
     import_name : str
@@ -135,8 +148,15 @@ def importattr(import_name):
         ...
     doxhooks.errors.DoxhooksLookupError: Cannot find 'Love' in collections.
     """
-    import_pattern = r"(?P<module_name>(?:\w+\.)*\w+)\.(?P<attr_name>\w+)$"
-    match = re.match(import_pattern, import_name)
+    try:
+        module_name, module, attr = _imported_attrs[import_name]
+    except (KeyError, TypeError):
+        pass
+    else:
+        if sys.modules.get(module_name) is module:
+            return attr
+
+    match = _match_import_name(import_name)
 
     if not match:
         raise DoxhooksValueError(
@@ -152,6 +172,8 @@ def importattr(import_name):
             raise DoxhooksImportError("Cannot find module:", module_name)
         raise
     try:
-        return getattr(module, attr_name)
+        attr = getattr(module, attr_name)
     except AttributeError:
         raise DoxhooksLookupError(attr_name, module, module_name)
+    _imported_attrs[import_name] = module_name, module, attr
+    return attr
@@ -22,8 +22,11 @@ import os
 import doxhooks.fileio as fileio
 from doxhooks.data_stores import DataStore
 from doxhooks.dependency_databases import DependencyDatabase
+from doxhooks.errors import DoxhooksLookupError
+from doxhooks.output_indexes import OutputIndex
 from doxhooks.resource_environments import ResourceEnvironment
-from doxhooks.url_mappings import URLMapping
+from doxhooks.template_caches import RenderCache, TemplateCache
+from doxhooks.url_mappings import URLMapping, VersionedURLMapping
 
 
 __all__ = [
@@ -66,7 +69,10 @@ class Doxhooks:
     update_all
         Update all configured resources.
     update_dependents
-        Update all resources that depend on a given input file.
+        Update all resources that depend on a given input file,
+        directory or glob pattern.
+    prune_outputs
+        Remove the output files that the resources no longer produce.
     load
         Replace the environment data with data read from files.
     save
@@ -76,7 +82,10 @@ class Doxhooks:
     def __init__(
             self, resource_configs, *, reverse_order=False,
             input_roots=None, output_roots=None, url_roots=None,
-            urls=None, data_dir_path=os.curdir, data_objects=None):
+            urls=None, data_dir_path=os.curdir, data_objects=None,
+            journal=False, build_profile=None, compile_templates=False,
+            reuse_renderings=False, precompressor=None,
+            output_manifest=False, versioned_urls=False):
         """
         Initialise Doxhooks with user data and internal components.
 
@@ -107,16 +116,61 @@ class Doxhooks:
         data_objects : dict, optional
             Keyword-only. Data objects for the *data store*. Defaults to
             ``None``.
+        journal : bool, optional
+            Keyword-only. Whether the changes to the data objects are
+            saved in journal files, instead of rewriting the data files.
+            Defaults to ``False``.
+        build_profile : ~doxhooks.build_profiles.BuildProfile or None, optional
+            Keyword-only. A profile that records the time taken to
+            update each resource and reports it at the end of
+            `Doxhooks.update`, `Doxhooks.update_all` and
+            `Doxhooks.update_dependents`. Defaults to ``None``.
+        compile_templates : bool, optional
+            Keyword-only. Whether the preprocessors compile the input
+            files into Python functions, which are cached in the data
+            directory. Defaults to ``False``.
+        reuse_renderings : bool, optional
+            Keyword-only. Whether the output of a compiled template that
+            is inserted repeatedly (e.g. a footer) is reused while the
+            values of the variables that it reads are unchanged. Only
+            renderings that read immutable values are reused. Defaults
+            to ``False``.
+        precompressor : ~doxhooks.precompressors.Precompressor or None, optional
+            Keyword-only. A precompressor that writes compressed
+            variants (e.g. ``.gz``) of the text output files. The
+            variants are complete when an update method returns.
+            Defaults to ``None``.
+        output_manifest : bool, optional
+            Keyword-only. Whether the content hashes of the output files
+            are recorded, so that a manifest of the added, changed,
+            unchanged and removed output files is saved in the data
+            directory, and stale output files can be removed
+            (`Doxhooks.prune_outputs`). Defaults to ``False``.
+        versioned_urls : bool, optional
+            Keyword-only. Whether the URLs of the resources can be
+            changed (except the predefined `urls`). The URLs that each
+            resource reads are recorded, and when a URL is changed (e.g.
+            because the fingerprint of a file has changed), only the
+            resources that read it are updated again. Defaults to
+            ``False``.
         """
         dependency_database = DependencyDatabase()
 
-        url_mapping = URLMapping()
-        if urls:
-            url_mapping.update(urls)
+        if versioned_urls:
+            url_mapping = VersionedURLMapping(urls or {})
+        else:
+            url_mapping = URLMapping()
+            if urls:
+                url_mapping.update_many(urls)
 
         data_store = DataStore(data_dir_path)
+        data_store.journal = journal
         data_store["resource_id-input_paths"] = dependency_database
         data_store["resource_id-url"] = url_mapping
+        if compile_templates:
+            data_store["source_hash-code"] = TemplateCache()
+        if output_manifest:
+            data_store["output_path-hash"] = OutputIndex()
         if data_objects:
             data_store.update(data_objects)
 
@@ -127,12 +181,23 @@ class Doxhooks:
                 "input_roots": input_roots or {},
                 "output_roots": output_roots or {},
                 "url_roots": url_roots or {},
+                "render_cache": RenderCache() if reuse_renderings else None,
+                "precompressor": precompressor,
+                "server_configs": {},
             },
             dependency_database,
             reverse_order=reverse_order,
+            build_profile=build_profile,
+            url_mapping=url_mapping if versioned_urls else None,
         )
 
         self._data = data_store
+        self._precompressor = precompressor
+
+    def _wait_for_precompressor(self):
+        # Wait until the compressed variants of the outputs are written.
+        if self._precompressor is not None:
+            self._precompressor.wait()
 
     def update(self, resource_id):
         """
@@ -153,10 +218,13 @@ class Doxhooks:
         ~doxhooks.errors.DoxhooksDataError
             If the resource or environment data are invalid.
         ~doxhooks.errors.DoxhooksFileError
-            If an input file cannot be read, or an output file cannot be
-            written.
+            If an input file or a data file cannot be read, or an output
+            file cannot be written.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If a data file that is read contains invalid data.
         """
         self._environment.update(resource_id)
+        self._wait_for_precompressor()
         return self
 
     def update_all(self):
@@ -165,7 +233,8 @@ class Doxhooks:
 
         The order that the resources are updated in is either the
         iteration order of the *resource configurations* or the *reverse
-        order*.
+        order*. If the URLs are versioned, the resources that read a
+        changed URL are then updated again.
 
         Returns
         -------
@@ -177,24 +246,30 @@ class Doxhooks:
         ~doxhooks.errors.DoxhooksDataError
             If the resource or environment data are invalid.
         ~doxhooks.errors.DoxhooksFileError
-            If an input file cannot be read, or an output file cannot be
-            written.
+            If an input file or a data file cannot be read, or an output
+            file cannot be written.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If a data file that is read contains invalid data.
         """
         self._environment.update_all()
+        self._wait_for_precompressor()
         return self
 
     def update_dependents(self, input_path, *, input_root=None):
         """
-        Update all resources that depend on a given input file.
+        Update all resources that depend on a given input file,
+        directory or glob pattern.
 
         The order that the resources are updated in is either the
         iteration order of the *resource configurations* or the *reverse
-        order*.
+        order*. If the URLs are versioned, the resources that read a
+        changed URL are then updated again.
 
         Parameters
         ----------
         input_path : str
-            The path to the input file.
+            The path to the input file or directory, or a glob pattern
+            (e.g. ``"src/content/**/*.md"``).
         input_root : str or None, optional
             Keyword-only. A path that the input path should be made
             relative to, in order to match the input paths stored in the
@@ -210,17 +285,81 @@ class Doxhooks:
         ~doxhooks.errors.DoxhooksDataError
             If the resource or environment data are invalid.
         ~doxhooks.errors.DoxhooksFileError
-            If an input file cannot be read, or an output file cannot be
-            written.
+            If an input file or a data file cannot be read, or an output
+            file cannot be written.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If a data file that is read contains invalid data.
         """
+        # The environment retrieves the dependents from its own
+        # reference to the dependency database.
+        self._data.ensure_loaded("resource_id-input_paths")
         self._environment.update_dependents(
             input_path, input_root=input_root)
+        self._wait_for_precompressor()
+        return self
+
+    def prune_outputs(self, *, keep=1, grace_period=0):
+        """
+        Remove the output files that the resources no longer produce.
+
+        The output files of each resource are recorded across builds as
+        *generations*, e.g. a fingerprinted file is in a new generation
+        when its fingerprint changes. The output files that are not in
+        the latest generations of the configured resources are removed.
+
+        The output files are recorded only if `Doxhooks` was initialised
+        with ``output_manifest=True``.
+
+        Parameters
+        ----------
+        keep : int, optional
+            Keyword-only. The number of generations of the output files
+            of each resource that are kept. Defaults to 1.
+        grace_period : float, optional
+            Keyword-only. The number of seconds that an output file is
+            kept after its generation is superseded, or after its
+            resource is first found to be no longer configured, e.g. so
+            that cached pages can still load superseded scripts and
+            stylesheets. Defaults to 0.
+
+        Returns
+        -------
+        Doxhooks
+            This instance of `Doxhooks`.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksLookupError
+            If the output files are not recorded.
+        ~doxhooks.errors.DoxhooksFileError
+            If the output-index data file cannot be read, or an output
+            file cannot be removed.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If the output-index data file contains invalid data.
+        """
+        try:
+            output_index = self._data["output_path-hash"]
+        except KeyError:
+            raise DoxhooksLookupError(
+                "output_path-hash", self._data, "`Doxhooks` data store "
+                "(see `output_manifest`)")
+        self._environment.prune_outputs(
+            output_index, keep=keep, grace_period=grace_period)
         return self
 
-    def load(self):
+    def load(self, *, lazy=False):
         """
         Load data from files.
 
+        Parameters
+        ----------
+        lazy : bool, optional
+            Keyword-only. Whether each data file is read when its data
+            are first needed, instead of immediately. An unreadable or
+            invalid data file is then reported by the method that first
+            needs the data (e.g. `Doxhooks.update_all`), instead of by
+            `Doxhooks.load`. Defaults to ``False``.
+
         Returns
         -------
         Doxhooks
@@ -229,11 +368,12 @@ class Doxhooks:
         Raises
         ------
         ~doxhooks.errors.DoxhooksFileError
-            If a data file cannot be read.
+            If a data file cannot be read (unless `lazy` is true).
         ~doxhooks.errors.DoxhooksDataFileError
-            If a data file contains invalid data.
+            If a data file contains invalid data (unless `lazy` is
+            true).
         """
-        self._data.load_all()
+        self._data.load_all(lazy=lazy)
         return self
 
     def save(self):
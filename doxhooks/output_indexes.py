@@ -0,0 +1,363 @@
+"""
+Indexes of the output files and their content hashes.
+
+An output index records the path and the content hash of each output
+file that a resource writes or copies (`OutputIndex.update_outputs`).
+The hashes are compared with the hashes that were recorded in previous
+builds, so that each output file is known to be *added*, *changed* or
+*unchanged* (`OutputIndex.manifest`). The manifest lists the content
+hash of each of these output files.
+
+The output paths of each resource are also recorded across builds as
+*generations*. When a resource writes a different set of output files
+(e.g. because the fingerprint in a filename has changed), a new
+generation is recorded. The output files that are only in older
+generations, or that belong to resources that are no longer configured,
+are *stale* and can be removed (`OutputIndex.prune`). The time that a
+resource is first found to be no longer configured is recorded, so that
+the grace period before its output files are removed starts then.
+
+When an index is saved (`OutputIndex.save`), a JSON manifest of the
+output files that were recorded or removed since the index was loaded
+or last saved is written next to the index file. Deployment tools can
+read the manifest to upload only the output files that have changed.
+
+Exports
+-------
+OutputIndex
+    An index of the output files and their content hashes.
+
+See Also
+--------
+doxhooks.file_domains.OutputFileDomain.hashes
+    The content hashes of the output files that have been written.
+"""
+
+
+import os
+import time
+
+import doxhooks.console as console
+import doxhooks.dataio as dataio
+import doxhooks.fileio as fileio
+from doxhooks.errors import DoxhooksDataFileError
+
+
+__all__ = [
+    "OutputIndex",
+]
+
+
+class OutputIndex:
+    """
+    An index of the output files and their content hashes.
+
+    Class Interface
+    ---------------
+    manifest_filename
+        The filename of the manifest that is saved with the index.
+    variant_extensions
+        The extensions of the variants that are removed with a file.
+    update_outputs
+        Update the index with the output files of a resource.
+    prune
+        Remove the stale output files and return their paths.
+    manifest
+        Return the output files that were added, changed, unchanged or
+        removed.
+    load
+        Replace the index with an index that is read from a file.
+    save
+        Write the index and the manifest to files.
+
+    Example
+    -------
+    >>> from doxhooks.output_indexes import OutputIndex
+    >>> index = OutputIndex()
+    >>> index.update_outputs("index", {"www/index.html": "1a2b"})
+    >>> index.manifest()["added"]
+    {'www/index.html': '1a2b'}
+    """
+
+    manifest_filename = "output-manifest.json"
+    """
+    The filename of the manifest that is saved with the index.
+
+    *str*
+
+    The manifest is saved in the directory of the index file. Defaults
+    to ``"output-manifest.json"``.
+    """
+
+    variant_extensions = (".gz", ".zst")
+    """
+    The extensions of the variants that are removed with a file.
+
+    *tuple[str]*
+
+    When a stale output file is removed, its precompressed variants
+    (see `~doxhooks.precompressors.Precompressor`) are also removed.
+    Defaults to ``(".gz", ".zst")``.
+    """
+
+    def __init__(self):
+        """Initialise an empty index."""
+        self._clear()
+
+    def _clear(self):
+        # Each output path maps to its content hash. The previous hashes
+        # are the hashes when the index was loaded or last saved. Each
+        # resource ID maps to a list of its generations, oldest first.
+        # A generation is a list of the time that it was recorded and a
+        # tuple of its sorted output paths. Each resource that is no
+        # longer configured maps to the time that it was found to be
+        # removed.
+        self._hashes = {}
+        self._previous_hashes = {}
+        self._generations = {}
+        self._removal_times = {}
+        self._updated_paths = set()
+        self._removed_paths = set()
+
+    def update_outputs(self, resource_id, hashes):
+        """
+        Update the index with the output files of a resource.
+
+        A new generation of the resource is recorded if the output paths
+        are different from the paths of the latest generation.
+
+        Parameters
+        ----------
+        resource_id : ~collections.abc.Hashable
+            The identity of the resource.
+        hashes : dict
+            The paths to the output files and their content hashes.
+        """
+        self._hashes.update(hashes)
+        self._updated_paths.update(hashes)
+        self._removed_paths.difference_update(hashes)
+        self._removal_times.pop(resource_id, None)
+
+        paths = tuple(sorted(hashes))
+        generations = self._generations.setdefault(resource_id, [])
+        if generations and generations[-1][1] == paths:
+            return
+        generations.append([time.time(), paths])
+
+    def _kept_generations(self, generations, keep, expiry_time, end_time):
+        # Return the index of the oldest generation that is kept. A
+        # generation is kept if it is one of the latest generations, or
+        # if it was superseded after the expiry time. The latest
+        # generation is superseded at the end time.
+        first_kept = len(generations) - keep
+        while first_kept > 0:
+            superseded_time = (
+                generations[first_kept][0] if first_kept < len(generations)
+                else end_time)
+            if superseded_time <= expiry_time:
+                break
+            first_kept -= 1
+        return max(first_kept, 0)
+
+    def prune(self, resource_ids, *, keep=1, grace_period=0):
+        """
+        Remove the stale output files and return their paths.
+
+        An output file is stale if it is not in the latest generations
+        of a configured resource. The latest `keep` generations of each
+        resource are kept, and so is every generation that was
+        superseded within the grace period. The output files of a
+        resource that is no longer configured are removed when the
+        grace period after it was first found to be no longer configured
+        (by an earlier or the current call of `OutputIndex.prune`) has
+        passed.
+
+        An output file is never removed while it is in a kept generation
+        of any resource.
+
+        Parameters
+        ----------
+        resource_ids : Iterable[Hashable]
+            The identities of the resources that are configured.
+        keep : int, optional
+            Keyword-only. The number of generations of each resource
+            that are kept. Defaults to 1, i.e. only the output files
+            written by the latest update of each resource are kept.
+        grace_period : float, optional
+            Keyword-only. The number of seconds that an output file is
+            kept after its generation is superseded. Defaults to 0.
+
+        Returns
+        -------
+        list
+            The sorted paths to the output files that were removed.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If an output file cannot be removed.
+        """
+        resource_ids = set(resource_ids)
+        now = time.time()
+        expiry_time = now - grace_period
+        kept_paths = set()
+        stale_paths = set()
+        for resource_id, generations in list(self._generations.items()):
+            if resource_id in resource_ids:
+                self._removal_times.pop(resource_id, None)
+                resource_keep = keep
+                end_time = now
+            else:
+                resource_keep = 0
+                end_time = self._removal_times.setdefault(resource_id, now)
+            first_kept = self._kept_generations(
+                generations, resource_keep, expiry_time, end_time)
+            for __, paths in generations[:first_kept]:
+                stale_paths.update(paths)
+            for __, paths in generations[first_kept:]:
+                kept_paths.update(paths)
+            if first_kept == len(generations):
+                del self._generations[resource_id]
+                self._removal_times.pop(resource_id, None)
+            else:
+                del generations[:first_kept]
+
+        stale_paths.difference_update(kept_paths)
+        for path in sorted(stale_paths):
+            for variant_path in (path,) + tuple(
+                    path + extension for extension in self.variant_extensions):
+                if os.path.exists(variant_path):
+                    fileio.remove(variant_path)
+            console.log("Removed:", path)
+            self._hashes.pop(path, None)
+            self._updated_paths.discard(path)
+            self._removed_paths.add(path)
+        if stale_paths:
+            console.summary(
+                "{} stale output files removed.".format(len(stale_paths)))
+        return sorted(stale_paths)
+
+    def manifest(self):
+        """
+        Return the output files that were added, changed, unchanged or
+        removed.
+
+        The manifest lists the output files that have been updated or
+        removed since the index was loaded or last saved. An updated
+        output file is *added* if it was not in the index, *changed* if
+        its content hash has changed, or *unchanged* otherwise.
+
+        Returns
+        -------
+        dict
+            Dictionaries of the paths to the ``"added"``, ``"changed"``
+            and ``"unchanged"`` output files and their content hashes,
+            and a sorted list of the paths to the ``"removed"`` output
+            files.
+        """
+        manifest = {
+            "added": {},
+            "changed": {},
+            "unchanged": {},
+            "removed": sorted(self._removed_paths),
+        }
+        previous_hashes = self._previous_hashes
+        for path in self._updated_paths:
+            hash_ = self._hashes[path]
+            try:
+                previous_hash = previous_hashes[path]
+            except KeyError:
+                status = "added"
+            else:
+                if previous_hash == hash_:
+                    status = "unchanged"
+                else:
+                    status = "changed"
+            manifest[status][path] = hash_
+        return manifest
+
+    def load(self, path):
+        """
+        Replace the index with an index that is read from a file.
+
+        The index is emptied if the file does not exist, because the
+        index has not been saved before.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If the file cannot be read.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If the file does not contain a valid index.
+        """
+        self._clear()
+        if not os.path.exists(path):
+            return
+        data = dataio.load_literals(path)
+        try:
+            hashes = data["hashes"]
+            generations = data["generations"]
+            removal_times = {
+                resource_id: float(time_)
+                for resource_id, time_ in data.get(
+                    "removal_times", {}).items()
+            }
+            is_valid = all(
+                isinstance(output_path, str) and isinstance(hash_, str)
+                for output_path, hash_ in hashes.items())
+            generations = {
+                resource_id: [
+                    [float(time_), tuple(paths)]
+                    for time_, paths in resource_generations
+                ]
+                for resource_id, resource_generations in generations.items()
+            }
+        except (AttributeError, KeyError, TypeError, ValueError):
+            is_valid = False
+        if not is_valid:
+            raise DoxhooksDataFileError("Bad output-index file:", path)
+        self._hashes = hashes
+        self._previous_hashes = hashes.copy()
+        self._generations = generations
+        self._removal_times = removal_times
+
+    def save(self, path):
+        """
+        Write the index and the manifest to files.
+
+        The manifest (`OutputIndex.manifest`) is saved in JSON format in
+        the directory of the index file. The next manifest will list the
+        output files that are updated after the index is saved.
+
+        Parameters
+        ----------
+        path : str
+            The path to the index file.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If a file cannot be saved.
+        """
+        # json is only needed to save a manifest.
+        import json
+
+        manifest_path = os.path.join(
+            os.path.dirname(path), self.manifest_filename)
+        fileio.save(
+            manifest_path,
+            json.dumps(self.manifest(), indent=2, sort_keys=True), "utf-8")
+        data = {
+            "hashes": self._hashes,
+            "generations": self._generations,
+            "removal_times": self._removal_times,
+        }
+        dataio.save_literals(path, data)
+        self._previous_hashes = self._hashes.copy()
+        self._updated_paths = set()
+        self._removed_paths = set()
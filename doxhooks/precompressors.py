@@ -0,0 +1,274 @@
+"""
+Precompressed variants of the output files.
+
+A web server can send a precompressed variant of a file (e.g.
+``style.css.gz``) instead of compressing the file for every request,
+e.g. the ``gzip_static`` module of *nginx*. A precompressor writes these
+variants next to the output files.
+
+When an output file is written or copied, its path is passed to the
+precompressor (`Precompressor.compress`), which compresses the file on a
+worker thread. The variants are complete when all the compressions are
+waited for (`Precompressor.wait`).
+
+Exports
+-------
+Precompressor
+    A pool of workers that write compressed variants of output files.
+
+See Also
+--------
+doxhooks.fileio.open_output
+    Open a file in writing mode and return the file object.
+doxhooks.fileio.copy
+    Copy a file.
+"""
+
+
+import os
+import threading
+import zlib
+
+import doxhooks.fileio as fileio
+from doxhooks.errors import DoxhooksFileSystemError, DoxhooksValueError
+
+
+__all__ = [
+    "Precompressor",
+]
+
+
+def _compress_gz(data):
+    # Return data compressed in the gzip format. The header does not
+    # have a timestamp, so the same data are compressed to the same
+    # bytes.
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _zstd():
+    # Return the zstd module of the standard library, or None if the
+    # interpreter does not have it.
+    try:
+        from compression import zstd
+    except ImportError:
+        return None
+    return zstd
+
+
+def _compress_zst(data):
+    # Return data compressed in the Zstandard format.
+    zstd = _zstd()
+    return zstd.compress(data, level=19)
+
+
+# Each format maps to a function that compresses data and a function
+# that returns whether the format is available.
+_formats = {
+    "gz": (_compress_gz, lambda: True),
+    "zst": (_compress_zst, lambda: _zstd() is not None),
+}
+
+
+def _is_unchanged(variant_path, stat):
+    # Return whether a compressed variant has the modification time of
+    # the output file, and the output file was last modified before the
+    # modification time of the variant was set (its status change).
+    try:
+        variant_stat = os.stat(variant_path)
+    except OSError:
+        return False
+    return (
+        variant_stat.st_mtime_ns == stat.st_mtime_ns and
+        stat.st_mtime_ns < variant_stat.st_ctime_ns)
+
+
+class Precompressor:
+    """
+    A pool of workers that write compressed variants of output files.
+
+    A variant is written next to the output file, with the extension of
+    the compression format appended to the filename (e.g.
+    ``style.css.gz``). The modification time of the variant is set to
+    the modification time of the output file. A variant is not
+    compressed again if it has the modification time of the output file
+    and the output file has not been modified since the variant was
+    written. A variant is written to a temporary file that then replaces
+    the variant, so a variant is never partly written.
+
+    An output file is compressed at most once at a time. If an output
+    file is compressed again before an earlier compression has started,
+    the earlier compression is not repeated. If the earlier compression
+    has started, the later compression waits until it has finished, so
+    the variants of the latest output data are written last.
+
+    Class Interface
+    ---------------
+    extensions
+        The filename extensions of the files that are compressed.
+    available_formats
+        Return the compression formats that the interpreter supports.
+    compress
+        Compress an output file on a worker thread.
+    wait
+        Wait until all the output files have been compressed.
+    """
+
+    extensions = frozenset([
+        ".css", ".csv", ".htm", ".html", ".js", ".json", ".map", ".mjs",
+        ".svg", ".txt", ".xml",
+    ])
+    """
+    The filename extensions of the files that are compressed.
+
+    *frozenset*
+
+    Files with other extensions (e.g. images, fonts and archives, which
+    are already compressed) are not compressed. Defaults to the
+    extensions of common text files.
+    """
+
+    @staticmethod
+    def available_formats():
+        """
+        Return the compression formats that the interpreter supports.
+
+        The ``"gz"`` format is always supported. The ``"zst"`` format
+        is supported if the standard library has the
+        ``compression.zstd`` module.
+
+        Returns
+        -------
+        list[str]
+            The extensions of the compression formats.
+        """
+        return sorted(
+            format_ for format_, (__, is_available) in _formats.items()
+            if is_available())
+
+    def __init__(self, formats=None, *, max_workers=4):
+        """
+        Initialise the precompressor with compression formats.
+
+        Parameters
+        ----------
+        formats : Iterable[str] or None, optional
+            The extensions of the compression formats (``"gz"`` or
+            ``"zst"``). Defaults to ``None``, which denotes all the
+            formats that the interpreter supports
+            (`Precompressor.available_formats`).
+        max_workers : int, optional
+            Keyword-only. The number of worker threads. Defaults to 4.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksValueError
+            If a format is unknown or is not supported by the
+            interpreter.
+
+        Attributes
+        ----------
+        formats : tuple[str]
+            The compression formats.
+        max_workers : int
+            The argument of `max_workers`.
+        """
+        if formats is None:
+            formats = self.available_formats()
+        available_formats = self.available_formats()
+        for format_ in formats:
+            if format_ not in available_formats:
+                raise DoxhooksValueError(
+                    format_, "compression format",
+                    "one of {}".format(", ".join(available_formats)))
+        self.formats = tuple(formats)
+        self.max_workers = max_workers
+        self._executor = None
+        self._compressions = []
+        # Each output path maps to its latest compression and a lock
+        # that is held while the path is being compressed.
+        self._path_compressions = {}
+        self._path_locks = {}
+
+    def compress(self, path):
+        """
+        Compress an output file on a worker thread.
+
+        The file is not compressed if its filename extension is not one
+        of the `extensions`.
+
+        Parameters
+        ----------
+        path : str
+            The path to the output file.
+        """
+        if os.path.splitext(path)[1].lower() not in self.extensions:
+            return
+        compression = self._path_compressions.get(path)
+        if not (compression is None or compression.running() or
+                compression.done()):
+            # The pending compression will read the latest output data.
+            return
+        if self._executor is None:
+            # concurrent.futures is only needed once a file is
+            # compressed.
+            import concurrent.futures
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                self.max_workers)
+        # The modification times are not trusted if the output file is
+        # compressed again before all the compressions are waited for,
+        # since the file may have been modified within the resolution of
+        # the file-system timestamps.
+        path_lock = self._path_locks.get(path)
+        check_mtimes = path_lock is None
+        if check_mtimes:
+            path_lock = self._path_locks[path] = threading.Lock()
+        compression = self._executor.submit(
+            self._write_variants, path, path_lock, check_mtimes)
+        self._path_compressions[path] = compression
+        self._compressions.append(compression)
+
+    def _write_variants(self, path, path_lock, check_mtimes):
+        # Write the compressed variants of an output file and set their
+        # modification times to the time of the output file. The lock of
+        # the path is held, so that only one worker compresses the path.
+        with path_lock:
+            try:
+                stat = os.stat(path)
+            except OSError as error:
+                raise DoxhooksFileSystemError("Cannot find file:", path) \
+                    from error
+            data = None
+            for format_ in self.formats:
+                compress, __ = _formats[format_]
+                variant_path = "{}.{}".format(path, format_)
+                if not (check_mtimes and _is_unchanged(variant_path, stat)):
+                    if data is None:
+                        data = fileio.load(path, None)
+                    temp_path = variant_path + ".tmp"
+                    fileio.save(temp_path, compress(data), None)
+                    fileio.move(temp_path, variant_path)
+                try:
+                    os.utime(
+                        variant_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                except OSError as error:
+                    raise DoxhooksFileSystemError(
+                        "Cannot set modification time:", variant_path) \
+                        from error
+
+    def wait(self):
+        """
+        Wait until all the output files have been compressed.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If an output file cannot be read, or a variant cannot be
+            written.
+        """
+        compressions = self._compressions
+        self._compressions = []
+        self._path_compressions = {}
+        self._path_locks = {}
+        for compression in compressions:
+            compression.result()
@@ -38,6 +38,10 @@ __all__ = [
 ]
 
 
+_undefined = object()
+# The recorded value of a token that is not found.
+
+
 class BasePreprocessorContext:
     """
     Base class of a preprocessor mini-language.
@@ -78,6 +82,46 @@ class BasePreprocessorContext:
         """
         vars(self).update(variables)
 
+    _reads = None
+    # While the preprocessor records the variables that are read by an
+    # input file, _reads is a dict of the tokens and values that have
+    # been read. _reads is set to None if the output of the file does
+    # not depend only on those values.
+
+    @classmethod
+    def _records_reads(cls):
+        # Return whether every variable that is read is recorded.
+        base = BasePreprocessorContext
+        return (
+            cls._get_token_value is base._get_token_value and
+            cls.get is base.get and
+            cls.interpret is base.interpret)
+
+    def _read_token_value(self, object_token):
+        # Return the value of a token, or _undefined if it is not found.
+        try:
+            return self._get_token_value(object_token)
+        except DoxhooksLookupError:
+            return _undefined
+
+    def _record_reads(self):
+        # Replace _get_token_value with a method that records the reads
+        # while _reads is not None.
+        self._get_token_value = self._get_recorded_token_value
+
+    def _get_recorded_token_value(self, object_token):
+        # Look up the value of a token and record the value if the reads
+        # are being recorded.
+        try:
+            value = type(self)._get_token_value(self, object_token)
+        except DoxhooksLookupError:
+            if self._reads is not None:
+                self._reads.setdefault(object_token, _undefined)
+            raise
+        if self._reads is not None:
+            self._reads.setdefault(object_token, value)
+        return value
+
     def _get_token_value(self, object_token):
         # Apply the 'member' operator ('.') within a token.
         value = self
@@ -171,6 +215,9 @@ class BasePreprocessorContext:
         keyword = self._get_local_value(keyword_token)
         if not callable(keyword):
             raise DoxhooksTypeError(keyword, keyword_token, "callable")
+        if getattr(keyword, "__func__", None) not in _pure_keywords:
+            # The keyword may have effects other than writing output.
+            self._reads = None
         try:
             keyword(*tokens, preprocessor=preprocessor)
         except TypeError as error:
@@ -374,6 +421,15 @@ class PreprocessorContext(BasePreprocessorContext):
         console.warning(message)
 
 
+# The keywords that only write output that depends on the values of the
+# variables that they read.
+_pure_keywords = frozenset([
+    PreprocessorContext.if_,
+    PreprocessorContext.insert,
+    PreprocessorContext.write,
+])
+
+
 def _convert_to_lowercase_str(self, value):
     return str(value).lower()
 
@@ -25,7 +25,7 @@ class PreprocessorFactory:
 
     def __init__(
             self, preprocessor_class, preprocessor_context_class, context_vars,
-            input_file_domain):
+            input_file_domain, *, template_cache=None, render_cache=None):
         """
         Initialise the factory with preprocessor prerequisites.
 
@@ -53,11 +53,23 @@ class PreprocessorFactory:
             when calling `PreprocessorFactory.make`.
         input_file_domain : ~doxhooks.file_domains.InputFileDomain
             The input-file domain.
+        template_cache : ~doxhooks.template_caches.TemplateCache or None, optional
+            Keyword-only. A cache of compiled templates, which is passed
+            to the preprocessor constructor as the keyword argument
+            `template_cache`. Defaults to ``None``, which denotes that
+            the argument is not passed.
+        render_cache : ~doxhooks.template_caches.RenderCache or None, optional
+            Keyword-only. A cache of the output of templates, which is
+            passed to the preprocessor constructor as the keyword
+            argument `render_cache`. Defaults to ``None``, which denotes
+            that the argument is not passed.
         """
         self._preprocessor_class = preprocessor_class
         self._preprocessor_context_class = preprocessor_context_class
         self._context_vars = context_vars
         self._input_file_domain = input_file_domain
+        self._template_cache = template_cache
+        self._render_cache = render_cache
 
     def make(self, output_file, *args, context_vars=None, **kwargs):
         r"""
@@ -88,6 +100,11 @@ class PreprocessorFactory:
         else:
             variables = self._context_vars
 
+        if self._template_cache is not None:
+            kwargs.setdefault("template_cache", self._template_cache)
+        if self._render_cache is not None:
+            kwargs.setdefault("render_cache", self._render_cache)
+
         return self._preprocessor_class(
             self._preprocessor_context_class(**variables),
             self._input_file_domain, output_file, *args, **kwargs)
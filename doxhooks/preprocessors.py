@@ -4,7 +4,9 @@ General-purpose and HTML lexical preprocessors.
 The `preprocessors <preprocessor>`:term: accept lines of text
 (`Preprocessor.insert_lines`) and files (`Preprocessor.insert_file`). A
 preprocessor remembers all the input files that it opens
-(`Preprocessor.input_paths`).
+(`Preprocessor.input_paths`). Given a template cache, a preprocessor
+compiles each input file into a Python function, which is reused
+whenever the file is inserted again.
 
 Preprocessor `directives <preprocessor directive>`:term: and variables
 (also known as `nodes <preprocessor node>`:term:) are distinguished from
@@ -32,11 +34,14 @@ code_nodes
 """
 
 
-import inspect
+import hashlib
+import io
 import re
 import shlex
+import types
 
 import doxhooks.console as console
+from doxhooks import __version__
 
 
 __all__ = [
@@ -75,6 +80,110 @@ def _compile_replace_nodes(opening_delimiter, closing_delimiter=None):
     return re.compile(node_pattern).sub
 
 
+def _split_lines(text):
+    # Split some text into lines that end with "\n", like the lines of a
+    # text file. (str.splitlines also splits at other line boundaries.)
+    lines = [line + "\n" for line in text.split("\n")]
+    last_line = lines.pop()[:-1]
+    if last_line:
+        lines.append(last_line)
+    return lines
+
+
+# The format of the code of compiled templates. Increment this when the
+# code generated by _template_code is changed, so that templates that
+# were cached in an earlier format are not used.
+_template_format = 1
+
+# A compiled template is the code of a function that has the same effect
+# as Preprocessor.insert_lines. Literal text is written as constants,
+# nodes are flattened by their identifiers and the tokens of directives
+# are split before the function is compiled.
+_template_header = """\
+def render(preprocessor, source, name):
+    write = preprocessor._output.write
+    flatten = preprocessor._flatten_identifier
+    interpret = preprocessor._interpret
+    translate = preprocessor._translate
+    indentation = preprocessor._indentation
+    line_no = 0
+    try:
+"""
+
+_template_footer = """\
+    except Exception:
+        line = split_lines(source)[line_no - 1]
+        preprocessor._trace_line(name, line_no, line)
+        raise
+    preprocessor._indentation = indentation
+"""
+
+_template_write_output_line = """\
+        if output_line == "\\n":
+            write("\\n")
+        elif output_line:
+            write(indentation + output_line)
+"""
+
+_template_globals = {"split": shlex.split, "split_lines": _split_lines}
+
+
+def _template_code(preprocessor, source, name):
+    # Compile some source text into the code of a template function.
+    find_nodes = preprocessor._replace_nodes.__self__.finditer
+    translate = preprocessor._translate is not None
+    body = []
+    for line_no, line in enumerate(_split_lines(source), start=1):
+        body.append("        line_no = {}\n".format(line_no))
+
+        directive = preprocessor._match_directive(line)
+        if directive:
+            keyword_token, block = directive.group("keyword", "block")
+            if block is None:
+                tokens = "()"
+            else:
+                try:
+                    tokens = repr(tuple(shlex.split(block, comments=True)))
+                except ValueError:
+                    # The error is raised when the line is preprocessed.
+                    tokens = "split({!r}, comments=True)".format(block)
+            body.append(
+                "        preprocessor._indentation = indentation + {!r}\n"
+                .format(directive.group("indentation")))
+            body.append(
+                "        interpret({!r}, {})\n".format(keyword_token, tokens))
+            continue
+
+        terms = []
+        start = 0
+        for node in find_nodes(line):
+            if node.start() > start:
+                terms.append(repr(line[start:node.start()]))
+            terms.append("flatten({!r})".format(node.group("identifier")))
+            start = node.end()
+        if not terms and not translate:
+            # A literal line.
+            if line == "\n":
+                body.append("        write(\"\\n\")\n")
+            elif line:
+                body.append("        write(indentation + {!r})\n".format(line))
+            continue
+        if start < len(line):
+            terms.append(repr(line[start:]))
+        output_line = " + ".join(terms) or "''"
+        if translate:
+            output_line = "translate({})".format(output_line)
+        body.append("        output_line = {}\n".format(output_line))
+        body.append(_template_write_output_line)
+
+    if not body:
+        body.append("        pass\n")
+    template_source = "".join([_template_header] + body + [_template_footer])
+    namespace = {}
+    exec(compile(template_source, name, "exec"), namespace)
+    return namespace["render"].__code__
+
+
 class Preprocessor:
     """
     A general-purpose lexical preprocessor.
@@ -100,9 +209,26 @@ class Preprocessor:
         Push the contents of a file onto the preprocessor stack.
     insert_lines
         Push some lines of text onto the preprocessor stack.
+    profile
+        A profile of the time spent in directives, files and nodes.
     """
 
-    def __init__(self, context, input_file_domain, output_file):
+    profile = None
+    """
+    A profile of the time spent in directives, files and nodes.
+
+    *doxhooks.build_profiles.PreprocessorProfile or None*
+
+    The profile records the time spent interpreting each directive
+    keyword, preprocessing each inserted file and flattening each
+    *node*. Assigning a profile to `Preprocessor.profile` profiles all
+    preprocessors throughout the build. Defaults to ``None``, which
+    denotes that the preprocessors are not profiled.
+    """
+
+    def __init__(
+            self, context, input_file_domain, output_file, *,
+            template_cache=None, render_cache=None):
         """
         Initialise the preprocessor with a context and files.
 
@@ -116,6 +242,18 @@ class Preprocessor:
         output_file : TextIO
             An open file object that the preprocessor writes its output
             to.
+        template_cache : ~doxhooks.template_caches.TemplateCache or None, optional
+            Keyword-only. A cache of compiled templates. Each input file
+            is compiled into a Python function, which is cached and
+            reused whenever the file is inserted again. Defaults to
+            ``None``, which denotes that the input files are
+            interpreted line by line.
+        render_cache : ~doxhooks.template_caches.RenderCache or None, optional
+            Keyword-only. A cache of the output of the templates that
+            are inserted repeatedly. The cache is only used if a
+            `template_cache` is also provided and the context records
+            the variables that are read by each template. Defaults to
+            ``None``.
 
         Attributes
         ----------
@@ -128,6 +266,62 @@ class Preprocessor:
 
         self._indentation = ""
         self.input_paths = set()
+        if self.profile is not None:
+            self._profile_methods()
+        self._template_cache = (
+            template_cache if self._is_compilable() else None)
+
+        records_reads = getattr(type(context), "_records_reads", None)
+        if (render_cache is not None and records_reads is not None and
+                records_reads()):
+            self._render_cache = render_cache
+            context._record_reads()
+        else:
+            self._render_cache = None
+        # While the output of a template is being recorded for the render
+        # cache, _render_paths is the set of paths to the input files of
+        # the template.
+        self._render_paths = None
+
+    def _profile_methods(self):
+        # Replace the profiled methods of this preprocessor with
+        # wrappers that time each call in the profile.
+        self._interpret = self._profiled_interpret
+        self._flatten_node = self._profiled_flatten_node
+        self._flatten_identifier = self._profiled_flatten_identifier
+        self.insert_file = self._profiled_insert_file
+        if self._translate is not None:
+            self._translate = self._profiled_translate
+
+    def _profiled_interpret(self, keyword_token, tokens):
+        with self.profile.frame("keyword", keyword_token):
+            type(self)._interpret(self, keyword_token, tokens)
+
+    def _profiled_flatten_node(self, node):
+        with self.profile.frame("node", node.group("identifier")):
+            return type(self)._flatten_node(self, node)
+
+    def _profiled_flatten_identifier(self, identifier):
+        with self.profile.frame("node", identifier):
+            return type(self)._flatten_identifier(self, identifier)
+
+    def _profiled_insert_file(self, filename, *, idempotent=False):
+        with self.profile.frame("file", filename):
+            type(self).insert_file(self, filename, idempotent=idempotent)
+
+    def _profiled_translate(self, line):
+        with self.profile.frame("pass", "translate"):
+            return type(self)._translate(self, line)
+
+    @classmethod
+    def _is_compilable(cls):
+        # Return whether the templates compiled by _template_code have
+        # the same effect as the methods of this class.
+        return (
+            cls.insert_lines is Preprocessor.insert_lines and
+            cls._eval_directive is Preprocessor._eval_directive and
+            cls._eval_line is Preprocessor._eval_line and
+            cls._flatten_node is Preprocessor._flatten_node)
 
     _match_directive = _compile_match_directive("##")
 
@@ -137,6 +331,10 @@ class Preprocessor:
 
         keyword_token, block = directive.group("keyword", "block")
         tokens = shlex.split(block, comments=True) if block is not None else ()
+        self._interpret(keyword_token, tokens)
+
+    def _interpret(self, keyword_token, tokens):
+        # Interpret the tokens of a directive in the context.
         self._context.interpret(keyword_token, *tokens, preprocessor=self)
 
     _replace_nodes = _compile_replace_nodes("##")
@@ -151,9 +349,25 @@ class Preprocessor:
             console.error_trace("Node `{}`".format(identifier), node_value)
             raise
 
+    def _flatten_identifier(self, identifier):
+        # Recursively flatten the value of a 'node' identifier. The
+        # compiled templates call this method instead of _flatten_node.
+        node_value = self._context.get(identifier)
+        try:
+            return self._replace_nodes(self._flatten_node, node_value)
+        except Exception:
+            console.error_trace("Node `{}`".format(identifier), node_value)
+            raise
+
+    _translate = None
+    # An optional method that makes a final pass over each output line.
+
     def _eval_line(self, line):
         # Evaluate a line of input text and return the output text.
-        return self._replace_nodes(self._flatten_node, line)
+        output_line = self._replace_nodes(self._flatten_node, line)
+        if self._translate is None:
+            return output_line
+        return self._translate(output_line)
 
     def insert_lines(self, lines, name=None):
         """
@@ -184,11 +398,12 @@ class Preprocessor:
                     continue
                 output_line = self._eval_line(line)
             except Exception:
-                # inspect.stack()[1][3] references the name
-                # of the function that called insert_lines:
-                name = name or inspect.stack()[1][3] + "()"
-                console.error_trace(
-                    "In: {}\n    >> line {:3}".format(name, line_no), line)
+                if not name:
+                    import inspect
+                    # inspect.stack()[1][3] references the name
+                    # of the function that called insert_lines:
+                    name = inspect.stack()[1][3] + "()"
+                self._trace_line(name, line_no, line)
                 raise
 
             if output_line == "\n":
@@ -199,6 +414,97 @@ class Preprocessor:
 
         self._indentation = indentation
 
+    def _trace_line(self, name, line_no, line):
+        # Write the source of an error to stderr.
+        console.error_trace(
+            "In: {}\n    >> line {:3}".format(name, line_no), line)
+
+    def _template_key(self, source):
+        # Return the key of a compiled template in the template cache.
+        cls = type(self)
+        key_data = "\0".join((
+            __version__, str(_template_format),
+            cls.__module__, cls.__qualname__,
+            self._match_directive.__self__.pattern,
+            self._replace_nodes.__self__.pattern,
+            str(self._translate is not None), source))
+        return hashlib.sha1(
+            key_data.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _insert_template(self, filename):
+        # Read a file, compile it (or reuse the compiled code from the
+        # template cache) and run the template function.
+        with self._input.open(filename) as file:
+            source = file.read()
+        key = self._template_key(source)
+        code = self._template_cache.get(key)
+        if code is None:
+            code = _template_code(self, source, filename)
+            self._template_cache.add(key, code)
+        render = types.FunctionType(code, _template_globals)
+        render(self, source, filename)
+
+    def _insert_rendering(self, filename, path):
+        # Reuse the output of a file from the render cache, or else
+        # insert the file as a template.
+        render_cache = self._render_cache
+        render_key = (
+            path, self._indentation, type(self), type(self._context))
+        rendering = render_cache.get(
+            render_key, self._context._read_token_value)
+        if rendering is not None:
+            self._output.write(rendering.output)
+            self._add_input_paths(rendering.input_paths)
+        elif render_cache.is_recording(render_key):
+            self._record_template(render_key, filename, path)
+        else:
+            self._insert_template(filename)
+
+    def _add_input_paths(self, paths):
+        # Add the paths to the input files of a reused rendering.
+        self.input_paths.update(paths)
+        self._input.paths.update(paths)
+        if self._render_paths is not None:
+            self._render_paths.update(paths)
+
+    def _record_template(self, render_key, filename, path):
+        # Run a template, record the variables that it reads and add its
+        # output to the render cache.
+        context = self._context
+        output_file = self._output
+        outer_reads = context._reads
+        outer_paths = self._render_paths
+        context._reads = {}
+        self._render_paths = {path}
+        self._output = buffer = io.StringIO()
+        try:
+            self._insert_template(filename)
+        finally:
+            reads = context._reads
+            paths = self._render_paths
+            context._reads = outer_reads
+            self._render_paths = outer_paths
+            self._output = output_file
+            output = buffer.getvalue()
+            output_file.write(output)
+
+        if outer_paths is not None:
+            outer_paths.update(paths)
+        if reads is None:
+            # The output of the outer templates cannot be reused either.
+            context._reads = None
+            return
+        self._render_cache.add(render_key, reads, output, paths)
+        if outer_reads is not None:
+            for token, value in reads.items():
+                outer_reads.setdefault(token, value)
+
+    def _forget_reads(self):
+        # Prevent the output of the templates that are being recorded
+        # from being reused, e.g. because a warning was written.
+        if self._render_cache is not None:
+            self._context._reads = None
+
     def insert_file(self, filename, *, idempotent=False):
         """
         Push the contents of a file onto the preprocessor stack.
@@ -228,9 +534,21 @@ class Preprocessor:
         if idempotent and path in self.input_paths:
             return
         self.input_paths.add(path)
+        if self._render_paths is not None:
+            self._render_paths.add(path)
+
+        if self._template_cache is None:
+            with self._input.open(filename) as lines:
+                self.insert_lines(lines, filename)
+        elif self._render_cache is None:
+            self._insert_template(filename)
+        else:
+            self._insert_rendering(filename, path)
 
-        with self._input.open(filename) as lines:
-            self.insert_lines(lines, filename)
+
+# Each subclass of HTMLPreprocessor maps to its character references and
+# a table of their replacements.
+_character_tables = {}
 
 
 class HTMLPreprocessor(Preprocessor):
@@ -290,13 +608,49 @@ class HTMLPreprocessor(Preprocessor):
             if not self.suppress_character_reference_warnings:
                 console.warning(
                     "Unknown HTML character reference:", reference)
+                self._forget_reads()
             character = character_reference.group()
         return character
 
-    def _eval_line(self, line):
-        preprocessed_line = super()._eval_line(line)
+    def _character_table(self):
+        # Return a dict of the character-reference texts (e.g. "&copy;"
+        # and "&#169;") and their replacements. The dict is only made
+        # again if the character references have changed.
+        cls = type(self)
+        references = self.character_references
+        try:
+            compiled_references, table = _character_tables[cls]
+        except KeyError:
+            pass
+        else:
+            if compiled_references == references:
+                return table
+
+        table = {}
+        for reference, character in references.items():
+            table["&" + reference + ";"] = character
+            table["&#" + reference + ";"] = character
+        _character_tables[cls] = references.copy(), table
+        return table
+
+    _characters = None
+
+    def _replace_character(self, character_reference):
+        # Replace a character reference with its precomputed value, or
+        # else handle an unknown reference.
+        try:
+            return self._characters[character_reference.group()]
+        except KeyError:
+            return self._get_character(character_reference)
+
+    def _translate(self, line):
+        # Replace the character references in a line of output text.
+        if "&" not in line:
+            return line
+        if self._characters is None:
+            self._characters = self._character_table()
         return self._replace_character_references(
-            self._get_character, preprocessed_line)
+            self._replace_character, line)
 
 
 def directive_delimiter(opening_delimiter):
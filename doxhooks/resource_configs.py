@@ -24,6 +24,8 @@ class ResourceConfiguration(dict):
 
     Class Interface
     ---------------
+    resource_class
+        The resource class.
     make
         Return a new configured resource.
 
@@ -68,6 +70,24 @@ class ResourceConfiguration(dict):
         return "<{} object resource_class=`{}` {}>".format(
             type(self).__name__, self._resource_class, super().__repr__())
 
+    @property
+    def resource_class(self):
+        """
+        The resource class.
+
+        An import name for the class is imported the first time that the
+        class is needed, and the class replaces the import name.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksDataError
+            If the class cannot be imported.
+        """
+        class_ = self._resource_class
+        if isinstance(class_, str):
+            class_ = self._resource_class = importattr(class_)
+        return class_
+
     def make(self, **kwargs):
         r"""
         Return a new configured resource.
@@ -88,10 +108,6 @@ class ResourceConfiguration(dict):
         ~doxhooks.errors.DoxhookDataError
             If the resource configuration data is invalid.
         """
-        class_ = self._resource_class
-        if isinstance(class_, str):
-            class_ = importattr(class_)
-
         new_kwargs = self.copy()
         new_kwargs.update(kwargs)
-        return class_.new(**new_kwargs)
+        return self.resource_class.new(**new_kwargs)
@@ -4,7 +4,12 @@ Environments in which the information resources are updated.
 The resources in the environment can be updated individually
 (`ResourceEnvironment.update`), all together
 (`ResourceEnvironment.update_all`) or only if they depend on a given
-input file (`ResourceEnvironment.update_dependents`).
+input file, or on any input file in a directory or matching a glob
+pattern (`ResourceEnvironment.update_dependents`).
+
+If the URLs of the resources can be changed (see
+`~doxhooks.url_mappings.VersionedURLMapping`), then the resources that
+read a URL that was changed by an update are updated again.
 
 Exports
 -------
@@ -13,7 +18,10 @@ ResourceEnvironment
 """
 
 
+import contextlib
 import os
+import re
+import time
 
 import doxhooks.console as console
 from doxhooks.errors import DoxhooksLookupError
@@ -25,6 +33,9 @@ __all__ = [
 ]
 
 
+_has_magic = re.compile(r"[*?[]").search
+
+
 class ResourceEnvironment:
     """
     An environment in which information resources are updated.
@@ -36,12 +47,15 @@ class ResourceEnvironment:
     update_all
         Update all resources configured in this environment.
     update_dependents
-        Update all resources that depend on a given input file.
+        Update all resources that depend on a given input file,
+        directory or glob pattern.
+    prune_outputs
+        Remove the output files that the resources no longer produce.
     """
 
     def __init__(
             self, resource_configs, common_configs, dependency_database,
-            *, reverse_order=False):
+            *, reverse_order=False, build_profile=None, url_mapping=None):
         """
         Initialise the environment with data about the resources.
 
@@ -60,16 +74,37 @@ class ResourceEnvironment:
             Keyword-only. Whether the order of iterating over
             `resource_configs` should be reversed. Defaults to
             ``False``.
+        build_profile : ~doxhooks.build_profiles.BuildProfile or None, optional
+            Keyword-only. A profile that records the time taken to
+            update each resource. The profile is reported at the end of
+            `ResourceEnvironment.update`, `ResourceEnvironment.update_all`
+            and `ResourceEnvironment.update_dependents`. Defaults to
+            ``None``, which denotes that the time is not recorded.
+        url_mapping : ~doxhooks.url_mappings.VersionedURLMapping or None, optional
+            Keyword-only. A mapping of resource identities to URLs that
+            can be changed. The resources that read a changed URL are
+            updated again. Defaults to ``None``, which denotes that the
+            URLs cannot be changed.
         """
         self._resource_configs = resource_configs
         self._common_configs = common_configs
         self._database = dependency_database
         self._reverse_order = reverse_order
+        self._build_profile = build_profile
+        self._url_mapping = url_mapping
+        # Each resource ID maps to its position in the update order. The
+        # positions are indexed again when the sequence of IDs in the
+        # resource configurations changes.
+        self._positions = None
+        self._indexed_ids = None
 
     def update(self, resource_id):
         """
         Update a resource configured in this environment.
 
+        The resources that read a URL that was changed by the update
+        are then updated again.
+
         Parameters
         ----------
         resource_id : ~collections.abc.Hashable
@@ -86,15 +121,77 @@ class ResourceEnvironment:
             If an input file cannot be read, or an output file cannot be
             written.
         """
+        with self._profiling():
+            self._update(resource_id)
+            self._update_url_readers()
+
+    @contextlib.contextmanager
+    def _profiling(self):
+        # Report the build profile after some resources are updated, or
+        # forget the recorded times if an update fails, so that the
+        # times are not accumulated across updates.
+        if self._build_profile is None:
+            yield
+            return
+        try:
+            yield
+        except BaseException:
+            self._build_profile.clear()
+            raise
+        self._build_profile.report()
+
+    def _update(self, resource_id):
+        # Update a resource configured in this environment.
         try:
             config = self._resource_configs[resource_id]
         except LookupError:
             raise DoxhooksLookupError(
                 resource_id, self._resource_configs, "`resource_configs`")
 
+        start_time = time.perf_counter()
+        console.event("resource_start", resource=resource_id)
+
+        if self._build_profile is None:
+            self._make_and_update(config, resource_id)
+        else:
+            with self._build_profile.resource(resource_id):
+                self._make_and_update(config, resource_id)
+
+        console.event(
+            "resource_end", resource=resource_id,
+            duration=time.perf_counter() - start_time)
+
+    def _make_and_update(self, config, resource_id):
+        # Make a resource from its configuration and update it.
         resource = config.make(id=resource_id, **self._common_configs)
         resource.update()
 
+    def _update_url_readers(self):
+        # Update the resources that read a URL that has since changed,
+        # until no more URLs are changed. Each resource is updated at
+        # most once, so that resources whose URLs depend on each other
+        # (e.g. fingerprinted resources that refer to each other) are
+        # not updated forever.
+        if self._url_mapping is None:
+            return
+        updated_ids = set()
+        while True:
+            reader_ids = self._url_mapping.pop_stale_readers()
+            reader_ids.difference_update(updated_ids)
+            if not reader_ids:
+                return
+            update_ids, __ = self._sort_ids(reader_ids)
+            if not update_ids:
+                return
+            resource_count = len(update_ids)
+            plural = "" if resource_count == 1 else "s"
+            console.summary(
+                "Found {} resource{} that read a changed URL."
+                .format(resource_count, plural))
+            for resource_id in update_ids:
+                self._update(resource_id)
+            updated_ids.update(update_ids)
+
     @property
     def _resource_ids(self):
         # Return a sequence of the IDs in the resource configurations.
@@ -104,13 +201,30 @@ class ResourceEnvironment:
             resource_ids = range(len(self._resource_configs))
         return reversed(resource_ids) if self._reverse_order else resource_ids
 
+    def _sort_ids(self, resource_ids):
+        # Return a list of the IDs that are in the resource
+        # configurations, sorted in the update order, and a list of the
+        # IDs that are not. The positions of the IDs are indexed again
+        # whenever the IDs in the configurations have changed.
+        indexed_ids = tuple(self._resource_ids)
+        if indexed_ids != self._indexed_ids:
+            self._positions = {
+                id_: position for position, id_ in enumerate(indexed_ids)}
+            self._indexed_ids = indexed_ids
+        positions = self._positions
+        unknown_ids = [id_ for id_ in resource_ids if id_ not in positions]
+        known_ids = [id_ for id_ in resource_ids if id_ in positions]
+        known_ids.sort(key=positions.__getitem__)
+        return known_ids, unknown_ids
+
     def update_all(self):
         """
         Update all resources configured in this environment.
 
         The order that the resources are updated in is either the
         iteration order of the *resource configurations* or the *reverse
-        order*.
+        order*. The resources that read a URL that was changed by the
+        updates are then updated again.
 
         Raises
         ------
@@ -120,21 +234,33 @@ class ResourceEnvironment:
             If an input file cannot be read, or an output file cannot be
             written.
         """
-        for resource_id in self._resource_ids:
-            self.update(resource_id)
+        with self._profiling():
+            for resource_id in self._resource_ids:
+                self._update(resource_id)
+            self._update_url_readers()
 
     def update_dependents(self, input_path, *, input_root=None):
         """
-        Update all resources that depend on a given input file.
+        Update all resources that depend on a given input file,
+        directory or glob pattern.
+
+        If no resource depends on the input path itself, then the input
+        path is treated as a directory, and the resources that depend on
+        any input file in the directory are updated. The directory does
+        not need to exist (e.g. it may have been deleted). If the input
+        path is a glob pattern instead, then the resources that depend
+        on any input file that matches the pattern are updated. A ``**``
+        component of the pattern matches any number of directories.
 
         The order that the resources are updated in is either the
         iteration order of the *resource configurations* or the *reverse
-        order*.
+        order*. The resources that read a URL that was changed by the
+        updates are then updated again.
 
         Parameters
         ----------
         input_path : str
-            The path to the input file.
+            The path to the input file or directory, or a glob pattern.
         input_root : str or None, optional
             Keyword-only. A path that the input path should be made
             relative to, in order to match the input paths stored in the
@@ -160,26 +286,58 @@ class ResourceEnvironment:
             path = os.path.relpath(input_path, input_root)
         path = normalise_path(path)
 
+        # A filename can contain glob characters, so the exact path is
+        # looked up first.
         dependent_ids = self._database.retrieve_products(path)
+        if not dependent_ids and _has_magic(path):
+            dependent_ids = self._database.retrieve_products_matching(path)
+        elif not dependent_ids:
+            dependent_ids = self._database.retrieve_products_under(path)
         if not dependent_ids:
-            console.info("No dependency data for {!r}.".format(path))
+            console.summary("No dependency data for {!r}.".format(path))
             return
 
-        update_ids = []
-        for id_ in self._resource_ids:
-            if id_ in dependent_ids:
-                update_ids.append(id_)
-                dependent_ids.remove(id_)
-        if dependent_ids:
+        update_ids, unknown_ids = self._sort_ids(dependent_ids)
+        if unknown_ids:
             raise DoxhooksLookupError(
-                ", ".join(dependent_ids), self._resource_configs,
+                ", ".join(unknown_ids), self._resource_configs,
                 "`resource_configs`")
 
         resource_count = len(update_ids)
         plural = "" if resource_count == 1 else "s"
-        console.info(
+        console.summary(
             "Found {} resource{} dependent on {!r}."
             .format(resource_count, plural, path))
 
-        for resource_id in update_ids:
-            self.update(resource_id)
+        with self._profiling():
+            for resource_id in update_ids:
+                self._update(resource_id)
+            self._update_url_readers()
+
+    def prune_outputs(self, output_index, *, keep=1, grace_period=0):
+        """
+        Remove the output files that the resources no longer produce.
+
+        Parameters
+        ----------
+        output_index : ~doxhooks.output_indexes.OutputIndex
+            An index of the output files of the resources.
+        keep : int, optional
+            Keyword-only. The number of generations of the output files
+            of each resource that are kept. Defaults to 1.
+        grace_period : float, optional
+            Keyword-only. The number of seconds that a stale output
+            file is kept. Defaults to 0.
+
+        Returns
+        -------
+        list
+            The sorted paths to the output files that were removed.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If an output file cannot be removed.
+        """
+        return output_index.prune(
+            self._resource_ids, keep=keep, grace_period=grace_period)
@@ -46,12 +46,17 @@ class ResourceFactory:
         Return a new input-file domain for the resource.
     _make_output_filetree
         Return a new output-file tree for the resource.
+    _make_precompressor
+        Return ``None``, which denotes that compressed variants of the
+        output files are not written.
     _make_output_file_domain
         Return a new output-file domain for the resource.
     _make_url_filetree
         Return a new URL file tree for the resource.
+    _make_server_configs
+        Return a new `dict` of server configurations for the resource.
     _make_server_config
-        Return a new server configuration for the resource.
+        Return a server configuration for the resource.
     """
 
     def __init__(self, resource_class, **kwargs):
@@ -166,6 +171,22 @@ class ResourceFactory:
             name="`output_roots`",
         )
 
+    def _make_precompressor(self):
+        """
+        Return ``None``, which denotes that compressed variants of the
+        output files are not written.
+
+        A `~doxhooks.precompressors.Precompressor` that is shared by the
+        resources is usually provided as the configuration value
+        ``precompressor``.
+
+        Returns
+        -------
+        None
+            No precompressor.
+        """
+        return None
+
     def _make_output_file_domain(self):
         """
         Return a new output-file domain for the resource.
@@ -181,6 +202,9 @@ class ResourceFactory:
             self._get("output_filename"),
             self._class.output_encoding,
             self._class.output_newline,
+            precompressor=self._get("precompressor"),
+            record_hashes="output_path-hash" in self._get("data_store"),
+            resource_id=self._get("id"),
         )
 
     def _make_url_filetree(self):
@@ -200,22 +224,65 @@ class ResourceFactory:
             name="`ChainMap(url_roots, output_roots)`",
         )
 
+    def _make_server_configs(self):
+        """
+        Return a new `dict` of server configurations for the resource.
+
+        A `dict` that is shared by the resources is usually provided as
+        the configuration value ``server_configs``, so that the
+        resources with the same server attributes share a server
+        configuration and its memoised URLs.
+
+        Returns
+        -------
+        dict
+            An empty `dict`.
+        """
+        return {}
+
     def _make_server_config(self):
         """
-        Return a new server configuration for the resource.
+        Return a server configuration for the resource.
+
+        The server configuration is shared with the other resources that
+        have the same server attributes and the same URL roots and
+        output roots (see `_make_server_configs`), unless the resource
+        is configured with its own ``url_filetree`` or the factory
+        overrides `_make_url_filetree`.
 
         Returns
         -------
         ~doxhooks.server_configs.ServerConfiguration
             The server configuration.
         """
-        return ServerConfiguration(
-            self._get("url_filetree"),
+        server_attrs = (
             self._class.server_protocol,
             self._class.server_hostname,
             self._class.server_root,
             self._class.server_rewrite,
         )
+        if ("url_filetree" in self._configuration or
+                type(self)._make_url_filetree is not
+                ResourceFactory._make_url_filetree):
+            # The URL file tree of this resource is not shared.
+            return ServerConfiguration(
+                self._get("url_filetree"), *server_attrs)
+        server_configs = self._get("server_configs")
+        try:
+            key = server_attrs + (
+                frozenset(self._get("url_roots").items()),
+                frozenset(self._get("output_roots").items()),
+            )
+            return server_configs[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # The rewrite value or a root is not hashable.
+            return ServerConfiguration(
+                self._get("url_filetree"), *server_attrs)
+        server_config = server_configs[key] = ServerConfiguration(
+            self._get("url_filetree"), *server_attrs)
+        return server_config
 
     def _make_dependencies(self):
         """
@@ -232,6 +299,13 @@ class ResourceFactory:
         del dependencies["url_roots"]
         del dependencies["input_filename"]
         del dependencies["output_filename"]
+        # A render cache is only used by the preprocessors, a
+        # precompressor is only used by the output-file domain, and the
+        # shared server configurations are only used to make the server
+        # configuration.
+        dependencies.pop("render_cache", None)
+        dependencies.pop("precompressor", None)
+        dependencies.pop("server_configs", None)
 
         dependencies.update(
             input_file_domain=self._get("input_file_domain"),
@@ -276,8 +350,27 @@ class PreprocessedResourceFactory(ResourceFactory):
         preprocessor factory.
     _make_preprocessor_factory
         Return a new preprocessor factory for the resource.
+    _make_render_cache
+        Return ``None``, which denotes that the output of templates is
+        not reused.
     """
 
+    def _make_render_cache(self):
+        """
+        Return ``None``, which denotes that the output of templates is not
+        reused.
+
+        A `~doxhooks.template_caches.RenderCache` that is shared by the
+        resources is usually provided as the configuration value
+        ``render_cache``.
+
+        Returns
+        -------
+        None
+            No render cache.
+        """
+        return None
+
     def _make_preprocessor_factory(self):
         """
         Return a new preprocessor factory for the resource.
@@ -292,6 +385,8 @@ class PreprocessedResourceFactory(ResourceFactory):
             self._class.Context,
             self._get("context_vars"),
             self._get("input_file_domain"),
+            template_cache=self._get("data_store").get("source_hash-code"),
+            render_cache=self._get("render_cache"),
         )
 
     def _make_dependencies(self):
@@ -327,7 +422,11 @@ class PreprocessedResourceFactory(ResourceFactory):
         * *data* is a reference to the data store.
         * *encoding* is the *output encoding* of the preprocessed
           information resource.
-        * *urls* is a mapping of resource identities to URLs.
+        * *urls* is a mapping of resource identities to URLs. If the
+          URL mapping has readers (e.g.
+          `~doxhooks.url_mappings.VersionedURLMapping.reader`), then
+          *urls* is a reader that records the URLs that the resource
+          reads.
 
         Returns
         -------
@@ -341,8 +440,15 @@ class PreprocessedResourceFactory(ResourceFactory):
         """
         data_store = self._get("data_store")
         urls = data_store["resource_id-url"]
-
-        context_vars = self._configuration.setdefault("context_vars", {})
+        reader = getattr(urls, "reader", None)
+        if reader is not None:
+            urls = reader(self._get("id"))
+
+        # The context variables are copied, so that the variables added
+        # for this resource are not shared with the next resource made
+        # from the same configuration.
+        context_vars = self._configuration["context_vars"] = dict(
+            self._configuration.get("context_vars", {}))
 
         context_vars.setdefault("data", data_store)
         context_vars.setdefault("encoding", self._class.output_encoding)
@@ -24,7 +24,7 @@ import io
 import os
 
 import doxhooks.console as console
-import doxhooks.fileio as fileio
+from doxhooks.build_profiles import phase
 from doxhooks.preprocessor_contexts import PreprocessorContext
 from doxhooks.preprocessors import Preprocessor
 from doxhooks.resource_factories import (
@@ -230,6 +230,7 @@ class Resource:
         self._input = input_file_domain
         self._output = output_file_domain
         self._server_config = server_config
+        self._has_url = False
 
     def __repr__(self):
         """
@@ -287,19 +288,25 @@ class Resource:
         A value of ``None`` denotes that the resource does not have a
         URL.
 
+        The URL is not computed again if it is *fixed* in the URL
+        mapping (see `~doxhooks.url_mappings.URLMapping.is_fixed`).
+        Otherwise (e.g. in a
+        `~doxhooks.url_mappings.VersionedURLMapping`), the default URL
+        is computed again for each new instance of the resource, so that
+        the URL changes when the output filename changes.
+
         Raises
         ------
         ~doxhooks.errors.DoxhooksDataError
             If the resource URL data is invalid.
         """
         urls = self._data["resource_id-url"]
-        try:
-            url = urls[self.id]
-        except KeyError:
-            url = self._server_config.url_for_file(
-                self._output.dir_path, self._output.filename
-            )
-            urls[self.id] = url
+        if self._has_url or urls.is_fixed(self.id):
+            return urls[self.id]
+        url = self._server_config.url_for_file(
+            self._output.dir_path, self._output.filename
+        )
+        self.url = url
         return url
 
     @url.setter
@@ -307,6 +314,7 @@ class Resource:
         """The URL of the resource."""
         urls = self._data["resource_id-url"]
         urls[self.id] = url
+        self._has_url = True
 
     def _fingerprint_files(self, rewrites=(None,)):
         # Mangle the output filename with a fingerprint of the input
@@ -316,10 +324,11 @@ class Resource:
 
     def _copy(self, rewrites=(None,)):
         # Copy the input file to the output file path.
-        for rewrite in rewrites:
-            fileio.copy(
-                self._input.path(rewrite=rewrite),
-                self._output.path(rewrite=rewrite))
+        with phase("copy"):
+            for rewrite in rewrites:
+                output_path = self._output.copy(
+                    self._input.path(rewrite=rewrite), rewrite=rewrite)
+                console.event("output", resource=self.id, path=output_path)
 
     def _write(self):
         """
@@ -350,12 +359,19 @@ class Resource:
         self._write()
         dependency_database = self._data["resource_id-input_paths"]
         dependency_database.update_dependencies(self.id, self._input.paths)
+        output_index = self._data.get("output_path-hash")
+        if output_index is not None:
+            output_index.update_outputs(self.id, self._output.hashes)
 
         url = self.url
         urls = self._data["resource_id-url"]
         urls[self.id] = url
+        update_reads = getattr(urls, "update_reads", None)
+        if update_reads is not None:
+            update_reads(self.id)
         if url is not None:
             console.log("URL:", url)
+        console.event("url", resource=self.id, url=url)
 
 
 class PreprocessedResource(Resource):
@@ -447,12 +463,20 @@ class PreprocessedResource(Resource):
 
     def _preprocess(self, context_vars=None):
         # Preprocess the input file and return the output string.
-        with io.StringIO() as output:
+        with phase("preprocess"), io.StringIO() as output:
             preprocessor = self._preprocessor_factory.make(
                 output, context_vars=context_vars)
             preprocessor.insert_file(self._input.filename, idempotent=True)
             return output.getvalue()
 
+    def _write_fingerprinted(self):
+        # Preprocess the input file and write the output file, which is
+        # fingerprinted while it is written.
+        with phase("preprocess"), \
+                self._output.open_fingerprinted() as output:
+            preprocessor = self._preprocessor_factory.make(output)
+            preprocessor.insert_file(self._input.filename, idempotent=True)
+
     def _write(self):
         """
         Preprocess the input file and write the output file.
@@ -467,6 +491,8 @@ class PreprocessedResource(Resource):
             If an input file cannot be read, or the output file cannot
             be written.
         """
-        with self._output.open() as output:
+        # The output file is written while the input file is
+        # preprocessed, so the time is recorded as preprocessing.
+        with phase("preprocess"), self._output.open() as output:
             preprocessor = self._preprocessor_factory.make(output)
             preprocessor.insert_file(self._input.filename, idempotent=True)
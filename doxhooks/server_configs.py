@@ -13,6 +13,9 @@ The inverse of this mapping gives the URL for a file on the server
 (`ServerConfiguration.rewrite`, see `doxhooks.filetrees.FileTree.path`
 for details).
 
+The URLs are memoised, so a configuration that is shared by many
+resources computes the URL for each file only once.
+
 Exports
 -------
 ServerConfiguration
@@ -82,11 +85,20 @@ class ServerConfiguration:
         self.hostname = hostname
         self.root = root
         self.rewrite = rewrite
+        # The path of the server root is resolved once. Each tuple of a
+        # directory path, a filename and a rewrite value maps to a
+        # memoised URL.
+        self._root_path = None
+        self._urls = {}
 
     def url_for_file(self, dir_path, filename=None):
         """
         Return the URL for a file.
 
+        The URL is memoised. The attributes of the configuration (other
+        than `rewrite`) and the roots of the file tree should not be
+        changed after a URL has been computed.
+
         Parameters
         ----------
         dir_path : str
@@ -104,11 +116,28 @@ class ServerConfiguration:
         ~doxhooks.errors.DoxhooksDataError
             If the URL cannot be computed.
         """
+        key = dir_path, filename, self.rewrite
+        try:
+            return self._urls[key]
+        except KeyError:
+            url = self._urls[key] = self._compute_url(dir_path, filename)
+            return url
+        except TypeError:
+            # The rewrite value is not hashable.
+            return self._compute_url(dir_path, filename)
+
+    def _resolve_root(self):
+        # Return the path of the server root, which is resolved once.
+        if self._root_path is None:
+            self._root_path = self._filetree.path(self.root)
+        return self._root_path
+
+    def _compute_url(self, dir_path, filename):
+        # Return the URL for a file.
         path = self._filetree.path(dir_path, filename, rewrite=self.rewrite)
 
         if self.root is not None:
-            root_path = self._filetree.path(self.root)
-            path = os.path.relpath(path, root_path)
+            path = os.path.relpath(path, self._resolve_root())
 
         norm_path = os.path.normpath(os.path.splitdrive(path)[1])
 
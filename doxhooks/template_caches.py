@@ -0,0 +1,402 @@
+"""
+Caches of the templates compiled and rendered by the preprocessors.
+
+A preprocessor compiles each input file into the code of a Python
+function (a *template*), which writes the same output as the
+preprocessor would write by interpreting the file line by line. The
+code is cached (`TemplateCache.add`) under a key that identifies the
+source text and the preprocessor class, so that each file is only
+compiled once (`TemplateCache.get`).
+
+A cache can be loaded and saved (`TemplateCache.load`,
+`TemplateCache.save`), so that the templates are not compiled again in
+the next build. The templates that were not used since the cache was
+loaded (e.g. the templates of source texts that have since been edited,
+or the templates of resources that were not updated) are saved until the
+cache becomes too large, and then the least recently used templates are
+removed.
+
+A render cache keeps the output of the templates that are inserted
+repeatedly, e.g. a footer that is inserted into every page
+(`RenderCache.add`). The output is reused when the template is inserted
+again, if the values of all the variables that it read are the same
+and its input files are unchanged (`RenderCache.get`). Only the output
+of a template that read immutable values (e.g. `str`, `int` or a
+`tuple` of them) is kept, because a mutable value that is changed in
+place is still equal to itself.
+
+Exports
+-------
+RenderCache
+    A cache of the output of the templates that are inserted repeatedly.
+TemplateCache
+    A cache of the code of compiled templates.
+
+See Also
+--------
+doxhooks.preprocessors.Preprocessor.insert_file
+    Push the contents of a file onto the preprocessor stack.
+"""
+
+
+import marshal
+import os
+import sys
+
+import doxhooks.dataio as dataio
+from doxhooks.errors import DoxhooksFileError
+
+
+__all__ = [
+    "RenderCache",
+    "TemplateCache",
+]
+
+
+class TemplateCache:
+    """
+    A cache of the code of compiled templates.
+
+    The code is saved in the `marshal` format, which is specific to the
+    version of the Python interpreter. A cache file that was saved by a
+    different version of the interpreter (or a cache file that cannot
+    be read) is silently ignored, and the templates are compiled again.
+
+    A template is *used* when it is added to the cache or got from the
+    cache. The templates that have not been used since the cache was
+    loaded are also saved, so that a build that updates only some
+    resources does not remove the templates of the other resources. The
+    least recently used templates are removed when the cache has more
+    than `TemplateCache.max_templates`, so the cache file does not keep
+    the templates of old versions of the source texts for ever.
+
+    Class Interface
+    ---------------
+    max_templates
+        The maximum number of templates that are saved.
+    get
+        Return the code of a compiled template, or ``None``.
+    add
+        Add the code of a compiled template to the cache.
+    load
+        Replace the cache with a cache that is read from a file.
+    save
+        Write the cache to a file.
+    """
+
+    max_templates = 1000
+    """
+    The maximum number of templates that are saved.
+
+    *int*
+
+    The least recently used templates are removed from the cache when it
+    is saved with more than this number of templates. Defaults to 1000.
+    """
+
+    def __init__(self):
+        """
+        Initialise an empty cache.
+
+        Attributes
+        ----------
+        change_count : int
+            The number of times that the cache has been changed by
+            adding, loading or using a template for the first time since
+            the cache was loaded or saved. The count is compared with a
+            previous count to find out whether the cache has changed.
+        """
+        # Each key maps to the marshalled code, which is unmarshalled
+        # when the code is first needed. The keys are in the order in
+        # which they were last saved, least recently used first.
+        self._marshalled_code = {}
+        self._code = {}
+        self._used_keys = set()
+        self.change_count = 0
+
+    def get(self, key):
+        """
+        Return the code of a compiled template, or ``None``.
+
+        Parameters
+        ----------
+        key : str
+            The key of the template.
+
+        Returns
+        -------
+        ~types.CodeType or None
+            The code of the template, or ``None`` if the template is not
+            in the cache.
+        """
+        try:
+            code = self._code[key]
+        except KeyError:
+            try:
+                marshalled_code = self._marshalled_code[key]
+            except KeyError:
+                return None
+            code = self._code[key] = marshal.loads(marshalled_code)
+        if key not in self._used_keys:
+            # The order of the least recently used templates changes.
+            self._used_keys.add(key)
+            self.change_count += 1
+        return code
+
+    def add(self, key, code):
+        """
+        Add the code of a compiled template to the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the template.
+        code : ~types.CodeType
+            The code of the template.
+        """
+        self._code[key] = code
+        self._marshalled_code[key] = marshal.dumps(code)
+        self._used_keys.add(key)
+        self.change_count += 1
+
+    def load(self, path):
+        """
+        Replace the cache with a cache that is read from a file.
+
+        The cache is emptied if the file cannot be read, does not
+        contain a valid cache or was saved by a different version of the
+        Python interpreter.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+        """
+        self._marshalled_code = {}
+        self._code = {}
+        self._used_keys = set()
+        self.change_count += 1
+        try:
+            data = dataio.load_literals(path)
+        except DoxhooksFileError:
+            return
+        try:
+            if data["cache_tag"] != sys.implementation.cache_tag:
+                return
+            marshalled_code = data["code"]
+            is_valid = all(
+                isinstance(key, str) and isinstance(value, bytes)
+                for key, value in marshalled_code.items())
+        except (AttributeError, KeyError, TypeError):
+            return
+        if is_valid:
+            self._marshalled_code = marshalled_code
+
+    def save(self, path):
+        """
+        Write the cache to a file.
+
+        The templates that have been used since the cache was loaded are
+        saved after the templates that have not been used. If there are
+        more than `TemplateCache.max_templates`, then the templates that
+        were used least recently are removed from the cache and are not
+        saved.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If the file cannot be saved.
+        """
+        used_keys = self._used_keys
+        all_marshalled_code = self._marshalled_code
+        keys = [key for key in all_marshalled_code if key not in used_keys]
+        keys.extend(key for key in all_marshalled_code if key in used_keys)
+        if len(keys) > self.max_templates:
+            del keys[:len(keys) - self.max_templates]
+        self._marshalled_code = {
+            key: all_marshalled_code[key] for key in keys}
+        self._code = {
+            key: code for key, code in self._code.items()
+            if key in self._marshalled_code
+        }
+        self._used_keys = set()
+        data = {
+            "cache_tag": sys.implementation.cache_tag,
+            "code": self._marshalled_code,
+        }
+        dataio.save_literals(path, data)
+
+
+def _stat_files(paths):
+    # Return the modification time and size of some files, or None if a
+    # file cannot be found.
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stats.append((path, stat.st_mtime_ns, stat.st_size))
+    return stats
+
+
+# The types of the values that cannot be changed in place. (A value of
+# type object is a sentinel.)
+_immutable_types = frozenset([
+    bool, bytes, complex, float, int, object, str, type(None),
+])
+
+
+def _is_immutable(value):
+    # Return whether a value, and every item in it, cannot be changed.
+    if type(value) in (tuple, frozenset):
+        return all(_is_immutable(item) for item in value)
+    return type(value) in _immutable_types
+
+
+class _Rendering:
+    # The output of a template and the values that it depends on.
+
+    def __init__(self, reads, output, input_paths, file_stats):
+        self.reads = reads
+        self.output = output
+        self.input_paths = input_paths
+        self.file_stats = file_stats
+
+    def is_valid(self, read_token_value):
+        for token, value in self.reads.items():
+            current_value = read_token_value(token)
+            if not (type(current_value) is type(value) and
+                    current_value == value):
+                return False
+        return _stat_files(self.input_paths) == self.file_stats
+
+
+class RenderCache:
+    """
+    A cache of the output of the templates that are inserted repeatedly.
+
+    The output of a template is recorded the second time that the
+    template is inserted with the same *render key*, i.e. the same input
+    file, indentation, preprocessor class and context class. (The output
+    of a template that is only inserted once, e.g. the template of a
+    page, is not recorded.) The output of a template is not recorded
+    again after the template has read a mutable value (e.g. a `list`),
+    because the value could be changed in place without the cache
+    noticing.
+
+    The cache is kept in memory and is not saved.
+
+    Class Interface
+    ---------------
+    max_renderings
+        The maximum number of renderings of a template.
+    get
+        Return a reusable rendering of a template, or ``None``.
+    is_recording
+        Return whether the output of a template should be recorded.
+    add
+        Add the output of a template to the cache.
+    """
+
+    max_renderings = 8
+    """
+    The maximum number of renderings of a template.
+
+    *int*
+
+    The output of a template is not recorded after this number of
+    renderings (with different variable values) have been added for the
+    same *render key*. Defaults to 8.
+    """
+
+    def __init__(self):
+        """Initialise an empty cache."""
+        self._renderings = {}
+        self._seen_keys = set()
+        self._mutable_keys = set()
+
+    def get(self, render_key, read_token_value):
+        """
+        Return a reusable rendering of a template, or ``None``.
+
+        Parameters
+        ----------
+        render_key : ~collections.abc.Hashable
+            The render key of the template.
+        read_token_value : ~collections.abc.Callable
+            A function that returns the current value of a variable
+            token.
+
+        Returns
+        -------
+        object or None
+            A rendering with the output (``output``) and the input-file
+            paths (``input_paths``) of the template, or ``None`` if the
+            cache does not have a rendering that is valid for the
+            current variable values and input files.
+        """
+        for rendering in self._renderings.get(render_key, ()):
+            if rendering.is_valid(read_token_value):
+                return rendering
+        return None
+
+    def is_recording(self, render_key):
+        """
+        Return whether the output of a template should be recorded.
+
+        Parameters
+        ----------
+        render_key : ~collections.abc.Hashable
+            The render key of the template.
+
+        Returns
+        -------
+        bool
+            Whether the output should be recorded and added to the
+            cache.
+        """
+        if render_key in self._mutable_keys:
+            return False
+        try:
+            renderings = self._renderings[render_key]
+        except KeyError:
+            if render_key not in self._seen_keys:
+                self._seen_keys.add(render_key)
+                return False
+            renderings = self._renderings[render_key] = []
+        return len(renderings) < self.max_renderings
+
+    def add(self, render_key, reads, output, input_paths):
+        """
+        Add the output of a template to the cache.
+
+        The output is not added if a value that was read is mutable.
+
+        Parameters
+        ----------
+        render_key : ~collections.abc.Hashable
+            The render key of the template.
+        reads : dict
+            The variable tokens that were read by the template and their
+            values.
+        output : str
+            The output of the template.
+        input_paths : set
+            The paths to the input files of the template.
+        """
+        if not all(_is_immutable(value) for value in reads.values()):
+            self._mutable_keys.add(render_key)
+            self._renderings.pop(render_key, None)
+            return
+        input_paths = frozenset(input_paths)
+        file_stats = _stat_files(input_paths)
+        if file_stats is None:
+            return
+        self._renderings.setdefault(render_key, []).append(
+            _Rendering(reads, output, input_paths, file_stats))
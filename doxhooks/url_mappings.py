@@ -5,26 +5,66 @@ The URL of a resource can be set (`URLMapping.__setitem__`) but cannot
 be changed or deleted (`URLMapping.__delitem__`).
 
 A mapping can be loaded and saved (`URLMapping.load`,
-`URLMapping.save`).
+`URLMapping.save`). The URLs that are set after the mapping was loaded
+or saved are recorded in a journal (`URLMapping.pop_journal`), which
+can be replayed later (`URLMapping.replay`).
+
+A mapping keeps a reverse index of the URLs, so that the resource that
+has a given URL is found without scanning the mapping
+(`URLMapping.owner`). Two resources that have the same URL are detected
+when the URL is set (`URLMapping.collisions`). Many URLs can be set at
+once (`URLMapping.update_many`), and a copy of the URLs can be compared
+with the mapping later (`URLMapping.snapshot`, `URLMapping.diff`).
+
+The URL of a resource can be changed in a versioned mapping
+(`VersionedURLMapping`). The resources that read the URLs through a
+*reader* of the mapping are recorded with the versions of the URLs that
+they read (`VersionedURLMapping.update_reads`). When a URL is changed,
+only the resources that read an earlier version of it need to be updated
+again (`VersionedURLMapping.pop_stale_readers`).
 
 Exports
 -------
 URLMapping
     A mapping of resource identities to URLs.
+VersionedURLMapping
+    A mapping of resource identities to URLs that can be changed.
 """
 
 
-import collections
+import collections.abc
 
+import doxhooks.console as console
 import doxhooks.dataio as dataio
 from doxhooks.errors import DoxhooksDataFileError
 
 
 __all__ = [
     "URLMapping",
+    "VersionedURLMapping",
 ]
 
 
+_unset = object()
+# The previous URL of a resource that does not have a URL yet.
+
+
+def _is_versioned_data(data):
+    # Return whether some loaded URL data were saved by a
+    # VersionedURLMapping. (The URL values of unversioned data are not
+    # dicts.)
+    return (
+        data.keys() == {"urls", "versions", "reads"} and
+        all(isinstance(value, dict) for value in data.values()))
+
+
+def _url_change_error(resource_id, previous_url, url):
+    # Return an error for changing a URL that cannot be changed.
+    return RuntimeError(
+        "Resource {!r} URL cannot be changed from {!r} to {!r}."
+        .format(resource_id, previous_url, url))
+
+
 class URLMapping(collections.abc.MutableMapping):
     """
     A mapping of resource identities to URLs.
@@ -48,10 +88,27 @@ class URLMapping(collections.abc.MutableMapping):
 
     Class Interface
     ---------------
+    is_fixed
+        Return whether the URL of a resource cannot be changed.
+    owner
+        Return the resource that has a given URL.
+    collisions
+        Return the URLs that more than one resource has.
+    update_many
+        Set the URLs of many resources.
+    snapshot
+        Return a copy of the URLs.
+    diff
+        Return the URLs that were added, changed or removed since a
+        snapshot.
     load
         Replace the data with data read from a file.
     save
         Write the data to a file.
+    pop_journal
+        Return and forget the URLs set since the journal was last popped.
+    replay
+        Set the URLs in records from a journal.
 
     Magic Methods
     -------------
@@ -71,6 +128,17 @@ class URLMapping(collections.abc.MutableMapping):
         resource identities.
     """
 
+    journal = False
+    """
+    Whether changes are recorded in the journal.
+
+    *bool*
+
+    A `~doxhooks.data_stores.DataStore` in journal mode sets this when
+    it loads the mapping. Otherwise nothing is recorded, so that the
+    URLs are not stored twice. Defaults to ``False``.
+    """
+
     def __init__(self, *args, **kwargs):
         r"""
         Initialise the mapping.
@@ -85,8 +153,62 @@ class URLMapping(collections.abc.MutableMapping):
             See the `dict` constructor for details.
         \**kwargs
             See the `dict` constructor for details.
+
+        Attributes
+        ----------
+        change_count : int
+            The number of times that the mapping has been changed by
+            setting, loading or replaying. The count is compared with a
+            previous count to find out whether the mapping has changed.
         """
         self._urls = dict(*args, **kwargs)
+        self._journal = []
+        self.change_count = 0
+        self._reindex_urls()
+
+    def _reindex_urls(self):
+        # Each URL maps to the ID of the first resource that has it, and
+        # each URL that more than one resource has maps to the set of
+        # the IDs of those resources. None (no URL) is not indexed.
+        self._owners = {}
+        self._collisions = {}
+        for resource_id, url in self._urls.items():
+            self._index_url(resource_id, url)
+
+    def _index_url(self, resource_id, url):
+        # Index the URL of a resource and return whether another
+        # resource has the same URL.
+        if url is None:
+            return False
+        owner = self._owners.setdefault(url, resource_id)
+        if owner == resource_id:
+            return False
+        try:
+            self._collisions[url].add(resource_id)
+        except KeyError:
+            self._collisions[url] = {owner, resource_id}
+        return True
+
+    def _unindex_url(self, resource_id, url):
+        # Remove the URL of a resource from the index.
+        if url is None:
+            return
+        try:
+            resource_ids = self._collisions[url]
+        except KeyError:
+            del self._owners[url]
+            return
+        resource_ids.discard(resource_id)
+        if self._owners[url] == resource_id:
+            self._owners[url] = next(iter(resource_ids))
+        if len(resource_ids) == 1:
+            del self._collisions[url]
+
+    def _warn_collision(self, resource_id, url):
+        # Warn that another resource has the same URL as a resource.
+        console.warning(
+            "Resource {!r} has the same URL as {!r}:"
+            .format(resource_id, self._owners[url]), url)
 
     def __repr__(self):
         """
@@ -159,6 +281,9 @@ class URLMapping(collections.abc.MutableMapping):
         The URL of a resource cannot be changed after it has been set.
         Setting the URL to the same value again is not an error.
 
+        A new URL is recorded in the *journal* (if `journal` is true). A
+        warning is written if another resource has the same URL.
+
         Parameters
         ----------
         resource_id : ~collections.Hashable
@@ -175,11 +300,14 @@ class URLMapping(collections.abc.MutableMapping):
             previous_url = self._urls[resource_id]
         except KeyError:
             self._urls[resource_id] = url
+            if self.journal:
+                self._journal.append((resource_id, url))
+            self.change_count += 1
+            if self._index_url(resource_id, url):
+                self._warn_collision(resource_id, url)
             return
         if url != previous_url:
-            raise RuntimeError(
-                "Resource {!r} URL cannot be changed from {!r} to {!r}."
-                .format(resource_id, previous_url, url))
+            raise _url_change_error(resource_id, previous_url, url)
 
     def __delitem__(self, resource_id):
         """
@@ -195,10 +323,158 @@ class URLMapping(collections.abc.MutableMapping):
         raise RuntimeError(
             "Resource {!r} URL cannot be deleted.".format(resource_id))
 
+    def is_fixed(self, resource_id):
+        """
+        Return whether the URL of a resource cannot be changed.
+
+        The URL of a resource is fixed after it has been set.
+
+        Parameters
+        ----------
+        resource_id : ~collections.Hashable
+            The resource identity.
+
+        Returns
+        -------
+        bool
+            Whether the URL is fixed.
+        """
+        return resource_id in self._urls
+
+    def owner(self, url):
+        """
+        Return the resource that has a given URL.
+
+        The resource is found in the reverse index of the mapping, so
+        the mapping is not scanned.
+
+        Parameters
+        ----------
+        url : str
+            The URL.
+
+        Returns
+        -------
+        ~collections.Hashable
+            The identity of the resource. If more than one resource has
+            the URL (`URLMapping.collisions`), then the identity of one
+            of them.
+
+        Raises
+        ------
+        KeyError
+            If no resource has the URL.
+        """
+        return self._owners[url]
+
+    def collisions(self):
+        """
+        Return the URLs that more than one resource has.
+
+        Returns
+        -------
+        dict
+            Each URL that more than one resource has, and a `set` of the
+            identities of those resources.
+        """
+        return {
+            url: set(resource_ids)
+            for url, resource_ids in self._collisions.items()
+        }
+
+    def update_many(self, urls):
+        """
+        Set the URLs of many resources.
+
+        The URLs are set together, without the overhead of setting each
+        URL separately (`URLMapping.__setitem__`). No URLs are set if
+        any URL would be changed.
+
+        Parameters
+        ----------
+        urls : ~collections.abc.Mapping or Iterable[tuple]
+            The resource identities and URLs.
+
+        Raises
+        ------
+        RuntimeError
+            If the URL of a resource is changed after it has been set.
+        """
+        if isinstance(urls, collections.abc.Mapping):
+            urls = urls.items()
+        current_urls = self._urls
+        new_urls = {}
+        for resource_id, url in urls:
+            previous_url = current_urls.get(resource_id, _unset)
+            if previous_url is _unset:
+                previous_url = new_urls.setdefault(resource_id, url)
+            if url != previous_url:
+                raise _url_change_error(resource_id, previous_url, url)
+        if not new_urls:
+            return
+        current_urls.update(new_urls)
+        if self.journal:
+            self._journal.extend(new_urls.items())
+        self.change_count += 1
+        for resource_id, url in new_urls.items():
+            if self._index_url(resource_id, url):
+                self._warn_collision(resource_id, url)
+
+    def snapshot(self):
+        """
+        Return a copy of the URLs.
+
+        Returns
+        -------
+        dict
+            The resource identities and URLs, which can be compared with
+            the mapping later (`URLMapping.diff`).
+        """
+        return self._urls.copy()
+
+    def diff(self, snapshot):
+        """
+        Return the URLs that were added, changed or removed since a
+        snapshot.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The URLs that were returned by `URLMapping.snapshot`.
+
+        Returns
+        -------
+        dict
+            Dictionaries of the resource identities and URLs that were
+            ``"added"``, ``"changed"`` or ``"removed"``. The URLs of
+            removed resources are their URLs in the snapshot.
+        """
+        current_urls = self._urls
+        added_urls = {}
+        changed_urls = {}
+        for resource_id, url in current_urls.items() - snapshot.items():
+            if resource_id in snapshot:
+                changed_urls[resource_id] = url
+            else:
+                added_urls[resource_id] = url
+        removed_urls = {
+            resource_id: snapshot[resource_id]
+            for resource_id in snapshot.keys() - current_urls.keys()
+        }
+        return {
+            "added": added_urls,
+            "changed": changed_urls,
+            "removed": removed_urls,
+        }
+
     def load(self, path):
         """
         Replace the data with data read from a file.
 
+        A file that was saved by `VersionedURLMapping` is also loaded:
+        the URLs in the file are loaded, and the versions and reads are
+        ignored.
+
         Parameters
         ----------
         path : str
@@ -214,7 +490,12 @@ class URLMapping(collections.abc.MutableMapping):
         data = dataio.load_literals(path)
         if not isinstance(data, dict):
             raise DoxhooksDataFileError("Bad URL-data file:", path)
+        if _is_versioned_data(data):
+            data = data["urls"]
         self._urls = dict(data)
+        self._journal = []
+        self.change_count += 1
+        self._reindex_urls()
 
     def save(self, path):
         """
@@ -241,3 +522,499 @@ class URLMapping(collections.abc.MutableMapping):
             If the file cannot be saved.
         """
         dataio.save_literals(path, self._urls)
+        self._journal = []
+
+    def pop_journal(self):
+        """
+        Return and forget the URLs set since the journal was last popped.
+
+        The journal is also emptied when the mapping is loaded or saved.
+
+        Returns
+        -------
+        list
+            The journal records. Each record is a `tuple` of a resource
+            identity and a URL.
+        """
+        journal = self._journal
+        self._journal = []
+        return journal
+
+    def replay(self, records):
+        """
+        Set the URLs in records from a journal.
+
+        The URLs in the records of a `VersionedURLMapping` journal are
+        also set, and the reads are ignored.
+
+        Parameters
+        ----------
+        records : Iterable[tuple]
+            The journal records, which were returned by
+            `URLMapping.pop_journal`.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksDataFileError
+            If a record is not a URL-mapping journal record.
+        """
+        for record in records:
+            try:
+                if len(record) == 3:
+                    kind, resource_id, url = record
+                    if kind == "reads":
+                        continue
+                    if kind != "url":
+                        raise ValueError(kind)
+                else:
+                    resource_id, url = record
+                self._urls[resource_id] = url
+            except (TypeError, ValueError):
+                raise DoxhooksDataFileError(
+                    "Bad URL-mapping journal record:", record)
+            self.change_count += 1
+        self._reindex_urls()
+
+
+class _URLReader(collections.abc.Mapping):
+    # A read-only view of a versioned URL mapping, which records the
+    # version of each URL that is read through it.
+
+    def __init__(self, urls, reads):
+        self._urls = urls
+        self._reads = reads
+
+    def __repr__(self):
+        return repr(self._urls)
+
+    def __iter__(self):
+        return iter(self._urls)
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __getitem__(self, resource_id):
+        url = self._urls[resource_id]
+        self._reads[resource_id] = self._urls.version(resource_id)
+        return url
+
+
+class VersionedURLMapping(URLMapping):
+    """
+    A mapping of resource identities to URLs that can be changed.
+
+    `VersionedURLMapping` extends `URLMapping`.
+
+    Each URL has a *version* number, which is incremented when the URL
+    is changed. A resource reads the URLs through a *reader*
+    (`VersionedURLMapping.reader`), which records the versions of the
+    URLs that the resource reads. The recorded reads replace the
+    previous reads of the resource when the resource has been updated
+    (`VersionedURLMapping.update_reads`). When a URL is changed, the
+    resources that read an earlier version of it are *stale*
+    (`VersionedURLMapping.pop_stale_readers`).
+
+    The URLs that the mapping is initialised with are *fixed*, i.e. they
+    cannot be changed, and they are kept when the mapping is loaded.
+
+    Example
+    -------
+    >>> from doxhooks.url_mappings import VersionedURLMapping
+    >>> urls = VersionedURLMapping()
+    >>> urls["style"] = "/style-1a2b.css"
+    >>> reader = urls.reader("index")
+    >>> reader["style"]
+    '/style-1a2b.css'
+    >>> urls.update_reads("index")
+    >>> urls["style"] = "/style-3c4d.css"
+    >>> urls.version("style")
+    1
+    >>> urls.pop_stale_readers()
+    {'index'}
+
+    Class Interface
+    ---------------
+    is_fixed
+        Override `URLMapping.is_fixed` to return whether a URL was
+        predefined.
+    update_many
+        Override `URLMapping.update_many` to change URLs.
+    version
+        Return the version number of the URL of a resource.
+    reader
+        Return a read-only view of the mapping that records the URLs
+        that a resource reads.
+    update_reads
+        Replace the recorded reads of a resource with its latest reads.
+    pop_stale_readers
+        Return and forget the resources that read a URL that has since
+        changed.
+    load
+        Extend `URLMapping.load` to load the versions and reads and
+        keep the fixed URLs.
+    save
+        Override `URLMapping.save` to save the versions and reads.
+    replay
+        Override `URLMapping.replay` to replay the URLs and reads in
+        records from a journal.
+
+    Magic Methods
+    -------------
+    __setitem__
+        Override `URLMapping.__setitem__` to change a URL.
+    """
+
+    def __init__(self, *args, **kwargs):
+        r"""
+        Initialise the mapping with the fixed URLs.
+
+        The `VersionedURLMapping` constructor extends the `URLMapping`
+        constructor.
+
+        Parameters
+        ----------
+        \*args
+            See the `dict` constructor for details.
+        \**kwargs
+            See the `dict` constructor for details.
+        """
+        super().__init__(*args, **kwargs)
+        self._fixed_urls = self._urls.copy()
+        self._clear_versions()
+        self._pending_reads = {}
+
+    def _clear_versions(self):
+        # Each resource ID maps to the version of its URL. Each reader ID
+        # maps to a dict of the resource IDs that it read and their
+        # versions, and each resource ID maps to a set of its reader
+        # IDs. The changed IDs are the resource IDs whose URLs have
+        # changed since the stale readers were last popped.
+        self._versions = dict.fromkeys(self._urls, 0)
+        self._reads = {}
+        self._readers = {}
+        self._changed_ids = set()
+
+    def _set_url(self, resource_id, url):
+        # Set the URL of a resource and increment its version if the URL
+        # is changed. Return whether another resource has the same URL.
+        try:
+            previous_url = self._urls[resource_id]
+        except KeyError:
+            self._versions[resource_id] = 0
+        else:
+            if url == previous_url:
+                return False
+            self._versions[resource_id] += 1
+            self._changed_ids.add(resource_id)
+            self._unindex_url(resource_id, previous_url)
+        self._urls[resource_id] = url
+        if self.journal:
+            self._journal.append(("url", resource_id, url))
+        self.change_count += 1
+        return self._index_url(resource_id, url)
+
+    def __setitem__(self, resource_id, url):
+        """
+        Set or change the URL for a given resource.
+
+        Overrides `URLMapping.__setitem__`.
+
+        The version of the URL is incremented if the URL is changed. A
+        new or changed URL is recorded in the *journal* (if `journal` is
+        true). A warning is written if another resource has the same
+        URL.
+
+        Parameters
+        ----------
+        resource_id : ~collections.Hashable
+            The resource identity.
+        url : str or None
+            The resource URL.
+
+        Raises
+        ------
+        RuntimeError
+            If a fixed URL is changed.
+        """
+        try:
+            fixed_url = self._fixed_urls[resource_id]
+        except KeyError:
+            if self._set_url(resource_id, url):
+                self._warn_collision(resource_id, url)
+            return
+        if url != fixed_url:
+            raise _url_change_error(resource_id, fixed_url, url)
+
+    def is_fixed(self, resource_id):
+        """
+        Return whether the URL of a resource was predefined.
+
+        Overrides `URLMapping.is_fixed`.
+
+        Only the URLs that the mapping was initialised with are fixed.
+
+        Parameters
+        ----------
+        resource_id : ~collections.Hashable
+            The resource identity.
+
+        Returns
+        -------
+        bool
+            Whether the URL is fixed.
+        """
+        return resource_id in self._fixed_urls
+
+    def update_many(self, urls):
+        """
+        Set or change the URLs of many resources.
+
+        Overrides `URLMapping.update_many`.
+
+        No URLs are set if any fixed URL would be changed.
+
+        Parameters
+        ----------
+        urls : ~collections.abc.Mapping or Iterable[tuple]
+            The resource identities and URLs.
+
+        Raises
+        ------
+        RuntimeError
+            If a fixed URL is changed.
+        """
+        if isinstance(urls, collections.abc.Mapping):
+            urls = urls.items()
+        urls = list(urls)
+        fixed_urls = self._fixed_urls
+        for resource_id, url in urls:
+            fixed_url = fixed_urls.get(resource_id, _unset)
+            if not (fixed_url is _unset or url == fixed_url):
+                raise _url_change_error(resource_id, fixed_url, url)
+        set_url = self._set_url
+        for resource_id, url in urls:
+            if set_url(resource_id, url):
+                self._warn_collision(resource_id, url)
+
+    def version(self, resource_id):
+        """
+        Return the version number of the URL of a resource.
+
+        Parameters
+        ----------
+        resource_id : ~collections.Hashable
+            The resource identity.
+
+        Returns
+        -------
+        int
+            The number of times that the URL has been changed.
+
+        Raises
+        ------
+        KeyError
+            If the resource identity is not in the mapping.
+        """
+        return self._versions[resource_id]
+
+    def reader(self, reader_id):
+        """
+        Return a read-only view of the mapping that records the URLs
+        that a resource reads.
+
+        The reads through any previous reader of the resource are
+        forgotten, unless they have already been recorded
+        (`VersionedURLMapping.update_reads`).
+
+        Parameters
+        ----------
+        reader_id : ~collections.Hashable
+            The identity of the resource that reads the URLs.
+
+        Returns
+        -------
+        ~collections.abc.Mapping
+            The read-only view of the mapping.
+        """
+        reads = self._pending_reads[reader_id] = {}
+        return _URLReader(self, reads)
+
+    def _set_reads(self, reader_id, reads):
+        # Replace the reads of a reader and update the reader IDs of the
+        # resources that it read.
+        previous_reads = self._reads.pop(reader_id, {})
+        for resource_id in previous_reads.keys() - reads.keys():
+            readers = self._readers[resource_id]
+            readers.discard(reader_id)
+            if not readers:
+                del self._readers[resource_id]
+        for resource_id in reads.keys() - previous_reads.keys():
+            self._readers.setdefault(resource_id, set()).add(reader_id)
+        if reads:
+            self._reads[reader_id] = reads
+
+    def update_reads(self, reader_id):
+        """
+        Replace the recorded reads of a resource with its latest reads.
+
+        The latest reads are the URLs and their versions that were read
+        through the latest reader of the resource
+        (`VersionedURLMapping.reader`). The update is recorded in the
+        *journal* (if `journal` is true) if the reads are changed.
+
+        Parameters
+        ----------
+        reader_id : ~collections.Hashable
+            The identity of the resource that read the URLs.
+        """
+        try:
+            reads = self._pending_reads.pop(reader_id)
+        except KeyError:
+            return
+        if reads == self._reads.get(reader_id, {}):
+            return
+        self._set_reads(reader_id, reads)
+        if self.journal:
+            self._journal.append(
+                ("reads", reader_id, tuple(reads.items())))
+        self.change_count += 1
+
+    def pop_stale_readers(self):
+        """
+        Return and forget the resources that read a URL that has since
+        changed.
+
+        Returns
+        -------
+        set
+            The identities of the resources that read an earlier version
+            of a URL.
+        """
+        stale_readers = set()
+        for resource_id in self._changed_ids:
+            version = self._versions[resource_id]
+            for reader_id in self._readers.get(resource_id, ()):
+                if self._reads[reader_id][resource_id] != version:
+                    stale_readers.add(reader_id)
+        self._changed_ids = set()
+        return stale_readers
+
+    def load(self, path):
+        """
+        Replace the data with data read from a file.
+
+        Overrides `URLMapping.load`.
+
+        The fixed URLs are kept. A file that was saved by `URLMapping`
+        is also loaded: each URL in the file is loaded as version 0, and
+        no reads are recorded.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksFileError
+            If the data file cannot be read.
+        ~doxhooks.errors.DoxhooksDataFileError
+            If the data file does not contain valid data.
+        """
+        data = dataio.load_literals(path)
+        if isinstance(data, dict) and not _is_versioned_data(data):
+            data = {"urls": data, "versions": dict.fromkeys(data, 0),
+                    "reads": {}}
+        try:
+            urls = dict(data["urls"])
+            versions = dict(data["versions"])
+            reads = {
+                reader_id: dict(reader_reads)
+                for reader_id, reader_reads in data["reads"].items()
+            }
+            is_valid = urls.keys() == versions.keys() and all(
+                resource_id in versions
+                for reader_reads in reads.values()
+                for resource_id in reader_reads)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            is_valid = False
+        if not is_valid:
+            raise DoxhooksDataFileError("Bad URL-data file:", path)
+
+        self._urls = urls
+        self._reindex_urls()
+        self._clear_versions()
+        self._versions = versions
+        for reader_id, reader_reads in reads.items():
+            self._set_reads(reader_id, reader_reads)
+        self._journal = []
+        self.change_count += 1
+        for resource_id, url in self._fixed_urls.items():
+            self._set_url(resource_id, url)
+
+    def save(self, path):
+        """
+        Write the data to a file.
+
+        Overrides `URLMapping.save`.
+
+        The URLs, their versions and the recorded reads are saved. See
+        `URLMapping.save` for the types of values that can be saved.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksDataError
+            If the types of values in the mapping are not Python-literal
+            types.
+        ~doxhooks.errors.DoxhooksFileError
+            If the file cannot be saved.
+        """
+        data = {
+            "urls": self._urls,
+            "versions": self._versions,
+            "reads": self._reads,
+        }
+        dataio.save_literals(path, data)
+        self._journal = []
+
+    def replay(self, records):
+        """
+        Set the URLs and reads in records from a journal.
+
+        Overrides `URLMapping.replay`.
+
+        Parameters
+        ----------
+        records : Iterable[tuple]
+            The journal records, which were returned by
+            `URLMapping.pop_journal`.
+
+        Raises
+        ------
+        ~doxhooks.errors.DoxhooksDataFileError
+            If a record is not a versioned-URL-mapping journal record.
+        """
+        # The replayed URLs are not recorded in the journal again.
+        journal = self._journal
+        self._journal = []
+        try:
+            for record in records:
+                try:
+                    kind, key, value = record
+                    if kind == "url":
+                        self._set_url(key, value)
+                    elif kind == "reads":
+                        self._set_reads(key, dict(value))
+                        self.change_count += 1
+                    else:
+                        raise ValueError(kind)
+                except (TypeError, ValueError):
+                    raise DoxhooksDataFileError(
+                        "Bad versioned-URL-mapping journal record:", record)
+        finally:
+            self._journal = journal
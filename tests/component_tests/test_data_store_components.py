@@ -0,0 +1,58 @@
+import doxhooks.fileio as fileio
+from doxhooks.data_stores import DataStore
+from doxhooks.dependency_databases import DependencyDatabase
+from pytest import fixture
+
+
+class BaseTestDataStore:
+    key = "test_database"
+
+    @fixture(autouse=True)
+    def _setup_dir_path(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        self.tmpdir = tmpdir
+
+    def given_a_data_store_in_journal_mode(self, compaction_threshold=10):
+        self.store = DataStore(self.tmpdir.strpath)
+        self.store.journal = True
+        self.store.compaction_threshold = compaction_threshold
+        self.store[self.key] = DependencyDatabase()
+        self.store.save(self.key)
+
+    def _read(self, extension):
+        return self.tmpdir.join(self.key + extension).read()
+
+    def when_reloading_the_data_store(self):
+        self.store[self.key] = DependencyDatabase()
+        self.store.load(self.key)
+
+
+class TestJournalMode(BaseTestDataStore):
+    def test_changes_are_appended_to_the_journal_and_replayed(self):
+        self.given_a_data_store_in_journal_mode()
+        saved_data = self._read(".dat")
+        self.store[self.key].update_dependencies("product", ["feature"])
+        self.store.save(self.key)
+
+        self.when_reloading_the_data_store()
+
+        # then the data file was not rewritten
+        assert self._read(".dat") == saved_data
+        # and the change was replayed from the journal.
+        assert self.store[self.key].retrieve_products("feature") == {
+            "product"}
+
+    def test_a_long_journal_is_compacted_into_the_data_file(self):
+        self.given_a_data_store_in_journal_mode(compaction_threshold=1)
+        self.store[self.key].update_dependencies("product1", ["feature"])
+        self.store.save(self.key)
+        self.store[self.key].update_dependencies("product2", ["feature"])
+        self.store.save(self.key)
+
+        self.when_reloading_the_data_store()
+
+        # then the journal was emptied
+        assert self._read(".journal") == ""
+        # and the data file contains all the changes.
+        assert self.store[self.key].retrieve_products("feature") == {
+            "product1", "product2"}
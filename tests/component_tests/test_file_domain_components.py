@@ -1,5 +1,10 @@
+import os
+import unittest.mock as mock
+
+import doxhooks.fileio as fileio
 from doxhooks.file_domains import OutputFileDomain
-from pytest import mark
+from doxhooks.filetrees import FileTree
+from pytest import mark, raises
 
 
 class BaseTestFileDomain:
@@ -38,3 +43,109 @@ class TestOutputFilenameMangling(BaseTestFileDomain):
         # then the filename is the initial filename mangled with the
         # latest fingerprint.
         assert path == mangled_path
+
+
+class TestFingerprintWhileWriting(BaseTestFileDomain):
+    string = "abcdef"
+    mangled_filename = "test-e80b5017098950fc58aad83c8c14978e.dat"
+
+    def given_an_output_file_domain_in_a_directory(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        self.dir_path = tmpdir.strpath
+        self.domain = OutputFileDomain(
+            FileTree({}), self.dir_path, self.filename, self.encoding, None)
+
+    def test_the_filename_is_mangled_with_the_fingerprint_of_the_output(
+            self, tmpdir):
+        self.given_an_output_file_domain_in_a_directory(tmpdir)
+
+        with self.domain.open_fingerprinted() as output:
+            output.write(self.string[:3])
+            output.write(self.string[3:])
+
+        assert self.domain.filename == self.mangled_filename
+        assert os.listdir(self.dir_path) == [self.mangled_filename]
+        path = os.path.join(self.dir_path, self.mangled_filename)
+        assert fileio.load(path, self.encoding) == self.string
+
+    def test_the_fingerprint_is_the_same_as_the_fingerprint_of_the_data(
+            self, tmpdir):
+        self.given_an_output_file_domain_in_a_directory(tmpdir)
+        self.domain.fingerprint_strings(self.string)
+        fingerprinted_filename = self.domain.filename
+
+        with self.domain.open_fingerprinted() as output:
+            output.write(self.string)
+
+        assert self.domain.filename == fingerprinted_filename
+
+    def test_the_temporary_file_is_removed_if_writing_fails(self, tmpdir):
+        self.given_an_output_file_domain_in_a_directory(tmpdir)
+
+        with raises(ValueError):
+            with self.domain.open_fingerprinted() as output:
+                output.write(self.string)
+                raise ValueError()
+
+        assert self.domain.filename == self.filename
+        assert os.listdir(self.dir_path) == []
+
+
+class TestRecordingHashes(BaseTestFileDomain):
+    string = "abcdef"
+    hash_ = "e80b5017098950fc58aad83c8c14978e"
+
+    def given_an_output_file_domain_that_records_hashes(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        self.dir_path = tmpdir.strpath
+        self.domain = OutputFileDomain(
+            FileTree({}), self.dir_path, self.filename, self.encoding, None,
+            record_hashes=True)
+        self.path = os.path.join(self.dir_path, self.filename)
+
+    def test_the_hashes_are_not_recorded_by_default(self):
+        self.given_an_output_file_domain()
+
+        assert self.domain.hashes is None
+
+    def test_the_hash_of_a_saved_file_is_recorded(self, tmpdir):
+        self.given_an_output_file_domain_that_records_hashes(tmpdir)
+
+        self.domain.save(self.string)
+
+        assert self.domain.hashes == {self.path: self.hash_}
+
+    def test_the_hash_of_an_opened_file_is_recorded(self, tmpdir):
+        self.given_an_output_file_domain_that_records_hashes(tmpdir)
+
+        with self.domain.open() as output:
+            output.write(self.string)
+
+        assert self.domain.hashes == {self.path: self.hash_}
+
+    def test_the_hash_of_a_copied_file_is_recorded(self, tmpdir):
+        self.given_an_output_file_domain_that_records_hashes(tmpdir)
+        input_path = tmpdir.join("input.dat").strpath
+        fileio.save(input_path, self.string, self.encoding)
+
+        path = self.domain.copy(input_path)
+
+        assert path == self.path
+        assert self.domain.hashes == {self.path: self.hash_}
+
+
+class TestOutputEvents(BaseTestFileDomain):
+    string = "abcdef"
+
+    def test_an_output_event_has_the_resource_identity(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        self.domain = OutputFileDomain(
+            FileTree({}), tmpdir.strpath, self.filename, self.encoding, None,
+            resource_id="test_id")
+
+        with mock.patch("doxhooks.console.event", autospec=True) as event:
+            self.domain.save(self.string)
+
+        event.assert_called_once_with(
+            "output", resource="test_id",
+            path=os.path.join(tmpdir.strpath, self.filename))
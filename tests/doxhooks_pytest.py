@@ -53,16 +53,27 @@ class OutputFilesTest:
             pass
         self.user_module = importlib.import_module(self.user_module_name)
 
-    def _redirect_copy(self, input_path, output_path):
+    def _redirect_copy(self, input_path, output_path, **kwargs):
         # A patch for doxhooks.fileio.copy.
         test_output_path = os.path.join(self.test_output_root, output_path)
-        return self._fileio_copy(input_path, test_output_path)
+        return self._fileio_copy(input_path, test_output_path, **kwargs)
 
     def _redirect_open_output(self, path, *args, **kwargs):
         # A patch for doxhooks.fileio.open_output.
         test_output_path = os.path.join(self.test_output_root, path)
         return self._fileio_open_output(test_output_path, *args, **kwargs)
 
+    def _redirect_move(self, input_path, output_path, **kwargs):
+        # A patch for doxhooks.fileio.move.
+        return self._fileio_move(
+            os.path.join(self.test_output_root, input_path),
+            os.path.join(self.test_output_root, output_path), **kwargs)
+
+    def _redirect_remove(self, path):
+        # A patch for doxhooks.fileio.remove.
+        test_output_path = os.path.join(self.test_output_root, path)
+        return self._fileio_remove(test_output_path)
+
     @fixture(autouse=True)
     def _setup_output_tmpdir(self, monkeypatch, tmpdir):
         # Patch doxhooks.fileio to prefix output paths with a tmpdir path.
@@ -74,6 +85,10 @@ class OutputFilesTest:
         monkeypatch.setattr(fileio, "copy", self._redirect_copy)
         self._fileio_open_output = fileio.open_output
         monkeypatch.setattr(fileio, "open_output", self._redirect_open_output)
+        self._fileio_move = fileio.move
+        monkeypatch.setattr(fileio, "move", self._redirect_move)
+        self._fileio_remove = fileio.remove
+        monkeypatch.setattr(fileio, "remove", self._redirect_remove)
 
     def _raise_error(self, error):
         raise error
@@ -17,6 +17,11 @@ class FingerprintedPreprocessedResource(PreprocessedResource):
         self._output.save(content)
 
 
+class StreamedFingerprintedResource(PreprocessedResource):
+    def _write(self):
+        self._write_fingerprinted()
+
+
 resource_configs = [
     _(
         FingerprintedResource,
@@ -28,6 +33,11 @@ resource_configs = [
         input_filename="input/_text.txt",
         output_filename="output/preprocessed.txt",
     ),
+    _(
+        StreamedFingerprintedResource,
+        input_filename="input/_text.txt",
+        output_filename="output/streamed.txt",
+    ),
 ]
 
 
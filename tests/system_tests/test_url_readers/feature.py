@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+from collections import OrderedDict
+
+from doxhooks.main import Doxhooks, add_output_roots
+from doxhooks.preprocessor_contexts import PreprocessorContext
+from doxhooks.resource_configs import ResourceConfiguration as _
+from doxhooks.resources import PreprocessedResource
+
+
+class AssetResource(PreprocessedResource):
+    class Context(PreprocessorContext):
+        test = "one"
+
+    def _write(self):
+        self._write_fingerprinted()
+
+
+class ControlResource(PreprocessedResource):
+    class Context(PreprocessorContext):
+        test = "pass"
+
+
+resource_configs = OrderedDict([
+    ("asset", _(
+        AssetResource,
+        input_filename="input/_asset.txt",
+        output_filename="output/asset.txt",
+    )),
+    ("reader", _(
+        PreprocessedResource,
+        input_filename="input/_reader.txt",
+        output_filename="output/reader.txt",
+    )),
+    ("control", _(
+        ControlResource,
+        input_filename="input/_control.txt",
+        output_filename="output/control.txt",
+    )),
+])
+
+
+def main():
+    add_output_roots("output")
+    doxhooks = Doxhooks(resource_configs, versioned_urls=True)
+
+    doxhooks.update_all()
+
+    AssetResource.Context.test = "two"
+    ControlResource.Context.test = "fail"
+
+    doxhooks.update("asset")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import json
+import unittest.mock as mock
+
+from doxhooks.build_profiles import BuildProfile, PreprocessorProfile, phase
+from pytest import fixture
+
+
+class BaseTestBuildProfile:
+    @fixture(autouse=True)
+    def _setup_clock(self):
+        # Each reading of the clocks is 1 second after the previous one.
+        self.clock = mock.Mock(spec=["perf_counter", "process_time"])
+        self.clock.perf_counter.side_effect = range(100)
+        self.clock.process_time.side_effect = range(100)
+        with mock.patch("doxhooks.build_profiles.time", self.clock):
+            yield
+
+    def given_a_build_profile(self):
+        self.profile = BuildProfile("dummy_report_path", top=1)
+
+    def given_a_resource_update_with_nested_phases(self, resource_id):
+        with self.profile.resource(resource_id):
+            with phase("preprocess"):
+                with phase("write"):
+                    pass
+
+    def given_a_resource_update_without_phases(self, resource_id):
+        with self.profile.resource(resource_id):
+            pass
+
+    def when_reporting_the_build_profile(self):
+        with mock.patch(
+                "doxhooks.fileio.save", autospec=True) as save, \
+                mock.patch("doxhooks.console.summary", autospec=True):
+            self.profile.report()
+        (__, report_string, __), __ = save.call_args
+        self.report = json.loads(report_string)
+
+
+class TestPhases(BaseTestBuildProfile):
+    def test_a_phase_excludes_the_time_in_a_nested_phase(self):
+        self.given_a_build_profile()
+
+        self.given_a_resource_update_with_nested_phases("id")
+
+        data = self.profile.report_data()
+        resource = data["resources"][0]
+        assert resource["wall"] == 5
+        assert resource["phases"] == {
+            "preprocess": {"wall": 2, "cpu": 2},
+            "write": {"wall": 1, "cpu": 1},
+        }
+
+    def test_a_phase_is_not_timed_outside_a_resource_update(self):
+        with phase("copy"):
+            pass
+
+        assert not self.clock.perf_counter.called
+
+
+class TestReport(BaseTestBuildProfile):
+    def test_the_report_lists_the_slowest_resources_first(self):
+        self.given_a_build_profile()
+        self.given_a_resource_update_without_phases("fast")
+        self.given_a_resource_update_with_nested_phases("slow")
+
+        self.when_reporting_the_build_profile()
+
+        assert [resource["id"] for resource in self.report["resources"]] == [
+            "slow", "fast"]
+        assert self.report["wall"] == 6
+
+    def test_the_recorded_times_are_forgotten_after_a_report(self):
+        self.given_a_build_profile()
+        self.given_a_resource_update_without_phases("id")
+
+        self.when_reporting_the_build_profile()
+
+        assert self.profile.report_data()["resources"] == []
+
+
+    def test_nothing_is_reported_if_no_times_were_recorded(self):
+        self.given_a_build_profile()
+
+        with mock.patch("doxhooks.fileio.save", autospec=True) as save:
+            self.profile.report()
+
+        assert not save.called
+
+
+class TestPreprocessorProfile(BaseTestBuildProfile):
+    def given_a_preprocessor_profile_of_nested_frames(self):
+        self.profile = PreprocessorProfile()
+        with self.profile.frame("file", "index.html"):
+            with self.profile.frame("node", "a;b"):
+                pass
+            with self.profile.frame("node", "a;b"):
+                pass
+
+    def test_exclusive_times_are_recorded_as_collapsed_stacks(self):
+        self.given_a_preprocessor_profile_of_nested_frames()
+
+        stacks = self.profile.collapsed_stacks()
+
+        assert stacks == [
+            "file:index.html 3000000",
+            "file:index.html;node:a,b 2000000",
+        ]
+
+    def test_the_entries_into_each_frame_are_counted(self):
+        self.given_a_preprocessor_profile_of_nested_frames()
+
+        assert self.profile.call_counts == {
+            "file:index.html": 1,
+            "node:a,b": 2,
+        }
@@ -1,5 +1,10 @@
+import json
+import sys
+import unittest.mock as mock
+
 import doxhooks.console as console
-from pytest import fixture, raises
+import doxhooks.fileio as fileio
+from pytest import fixture, mark, raises
 
 
 class BaseTestConsole:
@@ -14,6 +19,12 @@ class TestStdOut(BaseTestConsole):
         assert stdout == string
         assert not stderr
 
+    def test_summary_information_is_prominent_in_stdout(self):
+        # When reporting summary information
+        console.summary("test summary", 1)
+        # then the information is prominent in stdout.
+        self._assert("test summary 1\n")
+
     def test_important_status_information_is_prominent_in_stdout(self):
         # When reporting important status information
         console.info("test info", 1)
@@ -99,3 +110,128 @@ class TestStdErr(BaseTestConsole):
             console.input("test prompt")
         # then the prompt is prominent in stderr.
         self._assert(" >> test prompt")
+
+
+class TestVerbosity(BaseTestConsole):
+    @fixture(autouse=True)
+    def _restore_verbosity(self):
+        yield
+        console.verbosity = console.NORMAL
+
+    @mark.parametrize(
+        "verbosity, stdout", [
+            (console.SILENT, ""),
+            (console.SUMMARY, "summary\n"),
+            (console.NORMAL, "summary\ninfo\n    log\n"),
+            (console.DEBUG, "summary\ninfo\n    log\n    debug\n"),
+        ])
+    def test_only_information_up_to_the_verbosity_is_written(
+            self, verbosity, stdout):
+        console.verbosity = verbosity
+
+        console.summary("summary")
+        console.info("info")
+        console.log("log")
+        console.debug("debug")
+
+        assert self.capsys.readouterr()[0] == stdout
+
+    def test_a_warning_is_not_written_if_the_verbosity_is_silent(self):
+        console.verbosity = console.SILENT
+
+        console.warning("test warning")
+        console.error("test error")
+
+        assert self.capsys.readouterr()[1] == " ** Error! test error\n"
+
+
+class TestBuffering(BaseTestConsole):
+    @fixture(autouse=True)
+    def _stop_buffering(self):
+        yield
+        console.stop_buffering()
+
+    def test_buffered_information_is_written_before_an_error(self):
+        # When writing to a buffered stdout
+        console.start_buffering()
+        console.info("test info")
+        assert self.capsys.readouterr()[0] == ""
+
+        # and then writing to stderr
+        console.error("test error")
+
+        # then the buffered information is written first.
+        assert self.capsys.readouterr() == (
+            "test info\n", " ** Error! test error\n")
+
+    def test_stdout_is_flushed_before_stderr_only_if_information_is_pending(
+            self):
+        console.info("test info")
+
+        with mock.patch.object(sys.stdout, "flush") as flush:
+            console.warning("test warning 1")
+            console.warning("test warning 2")
+
+        assert flush.call_count == 1
+
+    def test_buffered_information_is_written_when_the_buffer_is_full(self):
+        console.start_buffering(size=10)
+
+        console.info("test")
+        assert self.capsys.readouterr()[0] == ""
+        console.info("test info")
+
+        assert self.capsys.readouterr()[0] == "test\ntest info\n"
+
+
+class TestEvents(BaseTestConsole):
+    @fixture(autouse=True)
+    def _setup_path(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        self.path = tmpdir.join("events.json")
+        yield
+        console.stop_events()
+
+    def _read_events(self):
+        return [json.loads(line) for line in self.path.readlines()]
+
+    def test_events_and_warnings_are_written_as_json_lines(self):
+        console.start_events(self.path.strpath)
+
+        console.event("test_event", resource=("test", 1), path="test_path")
+        console.warning("test warning", 1)
+        console.stop_events()
+
+        events = self._read_events()
+        assert [event["event"] for event in events] == [
+            "test_event", "warning"]
+        assert events[0]["resource"] == ["test", 1]
+        assert events[0]["path"] == "test_path"
+        assert events[1]["message"] == "test warning 1"
+
+    def test_events_are_ignored_without_a_stream(self):
+        console.event("test_event")
+
+        assert not console.emitting_events()
+
+    @mark.filterwarnings(
+        "ignore::pytest.PytestUnhandledThreadExceptionWarning")
+    def test_the_stream_is_stopped_if_the_writer_thread_fails(self):
+        console.start_events(self.path.strpath)
+        with mock.patch("json.dumps", side_effect=RuntimeError("test")):
+            console.event("bad_event")
+            console._event_thread.join(5)
+
+        console.event("ignored_event")
+
+        assert not console.emitting_events()
+        assert "stream failed" in self.capsys.readouterr()[1]
+
+    def test_the_stream_is_stopped_once_at_exit(self, monkeypatch):
+        monkeypatch.setattr(console, "_stop_events_at_exit", False)
+
+        with mock.patch("atexit.register", autospec=True) as register:
+            console.start_events(self.path.strpath)
+            console.start_events(self.path.strpath)
+
+        register.assert_called_once_with(console.stop_events)
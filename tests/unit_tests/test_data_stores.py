@@ -0,0 +1,137 @@
+import unittest.mock as mock
+
+from doxhooks.data_stores import DataStore
+from doxhooks_pytest import withraises
+
+
+class BaseTestDataStore:
+    def given_a_data_store_of_data_objects(self):
+        self.objects = {
+            "key1": mock.Mock(spec=["load", "save"]),
+            "key2": mock.Mock(spec=["load", "save"]),
+        }
+        self.store = DataStore("dummy_dir_path", **self.objects)
+
+    def when_loading_all_the_data_objects(self, lazy=True):
+        self.store.load_all(lazy=lazy)
+
+
+class TestLazyLoading(BaseTestDataStore):
+    def test_data_objects_are_not_loaded_until_they_are_accessed(self):
+        self.given_a_data_store_of_data_objects()
+
+        self.when_loading_all_the_data_objects()
+
+        assert not self.objects["key1"].load.called
+        assert not self.objects["key2"].load.called
+
+    def test_data_objects_are_loaded_immediately_unless_lazy(self):
+        self.given_a_data_store_of_data_objects()
+
+        self.when_loading_all_the_data_objects(lazy=False)
+        self.store["key1"]
+
+        assert self.objects["key1"].load.call_count == 1
+        assert self.objects["key2"].load.call_count == 1
+
+    def test_a_data_object_is_loaded_once_when_it_is_first_accessed(self):
+        self.given_a_data_store_of_data_objects()
+        self.when_loading_all_the_data_objects()
+
+        self.store["key1"]
+        self.store.get("key1")
+
+        assert self.objects["key1"].load.call_count == 1
+        assert not self.objects["key2"].load.called
+
+    def test_a_data_object_is_loaded_once_when_it_is_ensured_loaded(self):
+        self.given_a_data_store_of_data_objects()
+        self.when_loading_all_the_data_objects()
+
+        self.store.ensure_loaded("key1")
+        self.store.ensure_loaded("key1")
+
+        assert self.objects["key1"].load.call_count == 1
+        assert not self.objects["key2"].load.called
+
+    def test_only_the_accessed_data_objects_are_saved(self):
+        self.given_a_data_store_of_data_objects()
+        self.when_loading_all_the_data_objects()
+        self.store["key1"]
+
+        self.store.save_all()
+
+        assert self.objects["key1"].save.called
+        assert not self.objects["key2"].save.called
+
+
+class TestChangeTracking(BaseTestDataStore):
+    def given_a_data_object_with_a_change_count_that_was_saved(self):
+        self.objects["key1"].change_count = 0
+        self.store.save("key1")
+        self.objects["key1"].save.reset_mock()
+
+    def when_saving_all_the_data_objects(self):
+        self.store.save_all()
+
+    def test_an_unchanged_data_object_is_not_saved(self):
+        self.given_a_data_store_of_data_objects()
+        self.given_a_data_object_with_a_change_count_that_was_saved()
+
+        self.when_saving_all_the_data_objects()
+
+        assert not self.objects["key1"].save.called
+
+    def test_a_changed_data_object_is_saved(self):
+        self.given_a_data_store_of_data_objects()
+        self.given_a_data_object_with_a_change_count_that_was_saved()
+        self.objects["key1"].change_count += 1
+
+        self.when_saving_all_the_data_objects()
+
+        assert self.objects["key1"].save.called
+
+    def test_a_data_object_without_a_change_count_is_always_saved(self):
+        self.given_a_data_store_of_data_objects()
+        self.store.save("key2")
+        self.objects["key2"].save.reset_mock()
+
+        self.when_saving_all_the_data_objects()
+
+        assert self.objects["key2"].save.called
+
+
+class TestJournal:
+    def given_a_loaded_data_object_in_journal_mode(self):
+        self.data_object = mock.Mock(
+            spec=["load", "save", "pop_journal", "replay"])
+        self.store = DataStore("dummy_dir_path", key=self.data_object)
+        self.store.journal = True
+        self.store.load("key")
+
+    @withraises
+    def when_saving_the_data_object(self, append_error=None):
+        with mock.patch(
+                "doxhooks.dataio.append_journal", autospec=True,
+                side_effect=append_error) as self.append_journal:
+            self.store.save("key")
+
+    def test_journal_records_are_kept_until_they_are_appended(self):
+        self.given_a_loaded_data_object_in_journal_mode()
+        self.data_object.pop_journal.side_effect = [["record_1"], ["record_2"]]
+        self.when_saving_the_data_object(append_error=OSError, raises=OSError)
+
+        self.when_saving_the_data_object()
+
+        self.append_journal.assert_called_once_with(
+            mock.ANY, ["record_1", "record_2"])
+        assert not self.data_object.save.called
+
+    def test_a_loaded_data_object_records_changes_only_in_journal_mode(self):
+        self.given_a_loaded_data_object_in_journal_mode()
+        assert self.data_object.journal is True
+
+        self.store.journal = False
+        self.store.load("key")
+
+        assert self.data_object.journal is False
@@ -53,12 +53,15 @@ class TestSaving(BaseTestDataIO):
     def when_saving_literal_data(self, data):
         with mock.patch(
                 "doxhooks.fileio.open_output", autospec=True,
-                return_value=self.file):
+                return_value=self.file) as self.open_output:
             dataio.save_literals(self.dummy_path, data)
 
     @mark.parametrize(
         "data, data_string", [
             ({}, "{}"),
+            ((1,), "(1,)"),
+            ({"a": {b"b"}, 1: [1.5, None]}, "{'a': {b'b'}, 1: [1.5, None]}"),
+            ("\xe9", "'\\xe9'"),
         ])
     def test_literal_data_is_saved_in_a_text_file(self, data, data_string):
         self.when_saving_literal_data(data)
@@ -66,10 +69,122 @@ class TestSaving(BaseTestDataIO):
         # then the data is saved.
         assert self.file.contents == data_string
 
+    def test_large_nested_containers_are_saved_in_small_parts(self):
+        data = {
+            "products": {
+                product_no: list(range(200)) for product_no in range(200)},
+            "features": (tuple(range(300)),),
+        }
+        self.file.write = mock.Mock(wraps=self.file.write)
+
+        self.when_saving_literal_data(data)
+
+        assert self.file.contents == ascii(data)
+        assert max(
+            len(call[0][0]) for call in self.file.write.call_args_list) < 1000
+
     @mark.parametrize(
-        "non_restorable_data", [set(), ExampleNonRestorableRepr()])
+        "non_restorable_data", [
+            set(), ExampleNonRestorableRepr(), [float("nan")],
+            {"key": float("inf")}, [{"key": set()}],
+        ])
     def test_saving_non_restorable_data_is_an_error(self, non_restorable_data):
         self.when_saving_literal_data(
             non_restorable_data, raises=DoxhooksDataError)
 
         assert self.error
+
+    def test_saving_a_recursive_container_is_an_error(self):
+        recursive_list = []
+        recursive_list.append(recursive_list)
+
+        self.when_saving_literal_data(
+            recursive_list, raises=DoxhooksDataError)
+
+        assert self.error
+
+    def test_the_file_is_not_opened_if_the_data_is_not_restorable(self):
+        self.when_saving_literal_data(
+            [ExampleNonRestorableRepr()], raises=DoxhooksDataError)
+
+        assert not self.open_output.called
+
+
+class TestLoadingJournal(BaseTestDataIO):
+    @withraises
+    def when_loading_a_journal(self, journal_string):
+        fake_input_file = io.StringIO(journal_string)
+        with mock.patch(
+                "doxhooks.fileio.open_input", autospec=True,
+                return_value=fake_input_file), \
+                mock.patch("doxhooks.fileio.save", autospec=True):
+            return dataio.load_journal(self.dummy_path)
+
+    @mark.parametrize(
+        "journal_string, records", [
+            ("", []),
+            ("('a', 1)\n('b', 2)\n", [("a", 1), ("b", 2)]),
+            ("('a', 1)\n('b',", [("a", 1)]),
+        ])
+    def test_complete_records_are_loaded_from_a_journal_file(
+            self, journal_string, records):
+        loaded_records = self.when_loading_a_journal(journal_string)
+
+        # then the complete records are returned in order.
+        assert loaded_records == records
+
+    def test_loading_a_bad_record_is_an_error(self):
+        self.when_loading_a_journal("{\n", raises=DoxhooksDataFileError)
+
+        assert self.error
+
+    def test_records_appended_after_an_incomplete_record_can_be_loaded(self):
+        self.journal_string = "('a', 1)\n('b',"
+
+        def load(path, encoding):
+            return self.journal_string
+
+        def save(path, data, encoding):
+            self.journal_string = data
+
+        def append(path, data, encoding):
+            self.journal_string += data
+
+        with mock.patch("doxhooks.fileio.load", side_effect=load), \
+                mock.patch("doxhooks.fileio.save", side_effect=save), \
+                mock.patch("doxhooks.fileio.append", side_effect=append):
+            dataio.load_journal(self.dummy_path)
+            dataio.append_journal(self.dummy_path, [("c", 3)])
+            loaded_records = dataio.load_journal(self.dummy_path)
+
+        # then the incomplete record was removed from the file
+        assert self.journal_string == "('a', 1)\n('c', 3)\n"
+        # and the complete records are returned in order.
+        assert loaded_records == [("a", 1), ("c", 3)]
+
+
+class TestAppendingJournal(BaseTestDataIO):
+    @fixture(autouse=True)
+    def _setup_output_file(self, fake_output_file):
+        self.file = fake_output_file
+
+    @withraises
+    def when_appending_records(self, records):
+        with mock.patch(
+                "doxhooks.fileio.open_output", autospec=True,
+                return_value=self.file) as self.open_output:
+            dataio.append_journal(self.dummy_path, records)
+
+    def test_records_are_appended_to_a_text_file_one_per_line(self):
+        self.when_appending_records([("a", 1), ("b", 2)])
+
+        # then the file is opened in appending mode
+        assert self.open_output.call_args[1] == {"append": True}
+        # and the records are written.
+        assert self.file.contents == "('a', 1)\n('b', 2)\n"
+
+    def test_appending_a_non_restorable_record_is_an_error(self):
+        self.when_appending_records(
+            [ExampleNonRestorableRepr()], raises=DoxhooksDataError)
+
+        assert self.error
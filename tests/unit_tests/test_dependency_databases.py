@@ -1,3 +1,4 @@
+import re
 import unittest.mock as mock
 
 from doxhooks.dependency_databases import DependencyDatabase
@@ -209,6 +210,46 @@ class TestProductLostAllItsFeatures(BaseTestDatabase):
             self.product, self.no_features)
 
 
+class TestReleasingRemovedValues(BaseTestDatabase):
+    def when_a_product_repeatedly_changes_its_path_features(self):
+        for i in range(100):
+            self._update("product1", ["./src/file{}.txt".format(i)])
+
+    def test_the_ids_of_removed_features_are_reused(self):
+        self.given_a_database_of_products_and_their_features()
+        id_count = len(self.db._keys)
+
+        self.when_a_product_repeatedly_changes_its_path_features()
+
+        # then only the one feature that replaces another has a new ID.
+        assert len(self.db._keys) == id_count + 1
+        assert self.db.retrieve_products("feature3") == set()
+        assert self.db.retrieve_products_under("./src") == {"product1"}
+        assert self.db.retrieve_products_matching("./src/file5.txt") == set()
+
+    def test_the_id_of_a_product_without_features_is_released(self):
+        self.given_a_database_of_products_and_their_features()
+        id_count = len(self.db._ids)
+
+        self._update("product3", [])
+        self._update("product4", [])
+
+        assert len(self.db._ids) == id_count - 1
+        assert self.db.retrieve_products("feature1") == {
+            "product1", "product2"}
+
+    def test_the_id_of_a_none_product_is_released(self):
+        self.given_a_database_of_products_and_their_features()
+        self._update(None, ["feature1"])
+        id_count = len(self.db._ids)
+
+        self._update(None, [])
+
+        assert len(self.db._ids) == id_count - 1
+        assert self.db.retrieve_products("feature1") == {
+            "product1", "product2", "product3"}
+
+
 class BaseTestLoading(BaseTestDatabase):
     @fixture
     def _setup_load_data(self):
@@ -308,3 +349,181 @@ class TestLoading(BaseTestLoading):
         self.when_loading_a_database(bad_data, raises=DoxhooksDataFileError)
 
         assert self.error
+
+
+class TestSaving(BaseTestDatabase):
+    def when_saving_the_database(self):
+        dummy_path = None
+        with mock.patch(
+                "doxhooks.dataio.save_literals", autospec=True) as save:
+            self.db.save(dummy_path)
+        (__, self.saved_data), __ = save.call_args
+
+    def test_a_saved_database_contains_the_products_and_their_features(self):
+        self.given_a_database_of_products_and_their_features()
+
+        self.when_saving_the_database()
+
+        # then the saved data are the product and feature values.
+        assert self.saved_data == {
+            "products_features": self._products_features,
+            "features_products": self._features_products,
+        }
+
+    def test_a_database_saves_only_the_current_products_and_features(self):
+        self.given_a_database_of_products_and_their_features()
+        # and a product that no longer depends on any features
+        self._update("product1", set())
+        del self._products_features["product1"]
+        self._features_products = {
+            "feature1": {"product2", "product3"},
+            "feature2": {"product2"},
+        }
+
+        self.when_saving_the_database()
+
+        # then the saved data does not contain the removed product or
+        # the features that no product depends on.
+        assert self.saved_data == {
+            "products_features": self._products_features,
+            "features_products": self._features_products,
+        }
+
+
+class TestJournal(BaseTestDatabase):
+    @fixture(autouse=True)
+    def _setup_journal_mode(self):
+        with mock.patch.object(DependencyDatabase, "journal", True):
+            yield
+
+    def when_replaying_the_journal_in_a_new_database(self):
+        journal = self.db.pop_journal()
+        self.db = DependencyDatabase()
+        self.db.replay(journal)
+
+    def test_a_replayed_journal_restores_the_products_and_their_features(
+            self):
+        self.given_a_database_of_products_and_their_features()
+        self._update("product1", {"feature3"})
+
+        self.when_replaying_the_journal_in_a_new_database()
+
+        # then the database returns the products of each feature.
+        assert self._retrieve_products("feature1") == {"product2", "product3"}
+        assert self._retrieve_products("feature3") == {"product1"}
+
+    def test_an_unchanged_product_is_not_recorded_in_the_journal(self):
+        self.given_a_database_of_products_and_their_features()
+        self.db.pop_journal()
+
+        self._update("product3", {"feature1"})
+
+        assert self.db.pop_journal() == []
+
+    @withraises
+    def when_replaying_a_bad_record(self, record):
+        self.db.replay([record])
+
+    @mark.parametrize("bad_record", [None, ("product",), ("product", 0)])
+    def test_replaying_a_bad_record_is_an_error(self, bad_record):
+        self.given_a_database_of_products_and_their_features()
+
+        self.when_replaying_a_bad_record(
+            bad_record, raises=DoxhooksDataFileError)
+
+        assert self.error
+
+class TestJournalOff(BaseTestDatabase):
+    def test_updates_are_not_recorded_when_journal_mode_is_off(self):
+        self.given_a_database_of_products_and_their_features()
+
+        assert self.db.pop_journal() == []
+
+
+
+class TestChangeCount(BaseTestDatabase):
+    def test_only_changed_features_change_the_database(self):
+        self.given_a_database_of_products_and_their_features()
+        change_count = self.db.change_count
+
+        self._update("product3", {"feature1"})
+        assert self.db.change_count == change_count
+
+        self._update("product3", {"feature2"})
+        assert self.db.change_count != change_count
+
+
+class TestPathQueries:
+    def given_a_database_of_products_and_their_paths(self):
+        self.db = DependencyDatabase()
+        self.db.update_dependencies("index", {"./src/index.html"})
+        self.db.update_dependencies(
+            "news", {"./src/2025/news.txt", "./src/2025/photo.png"})
+        self.db.update_dependencies("style", {"./style/main.css"})
+
+    @mark.parametrize("dir_path, products", [
+        ("./src", {"index", "news"}),
+        ("./src/", {"index", "news"}),
+        ("./src/2025", {"news"}),
+        ("./src/2025/news.txt", {"news"}),
+        ("./sr", set()),
+        ("./missing", set()),
+    ])
+    def test_the_products_that_depend_on_paths_in_a_directory_are_returned(
+            self, dir_path, products):
+        self.given_a_database_of_products_and_their_paths()
+
+        assert self.db.retrieve_products_under(dir_path) == products
+
+    @mark.parametrize("pattern, products", [
+        ("./src/*.html", {"index"}),
+        ("./src/*/*.txt", {"news"}),
+        ("./*/*", {"index", "style"}),
+        ("./**/*.css", {"style"}),
+        ("./**/news.txt", {"news"}),
+        ("./src/**", {"index", "news"}),
+        ("./src/20[0-9][0-9]/*.png", {"news"}),
+        ("./src/*.txt", set()),
+    ])
+    def test_the_products_that_depend_on_matching_paths_are_returned(
+            self, pattern, products):
+        self.given_a_database_of_products_and_their_paths()
+
+        assert self.db.retrieve_products_matching(pattern) == products
+
+    def test_a_path_that_no_product_depends_on_is_not_returned(self):
+        self.given_a_database_of_products_and_their_paths()
+
+        self.db.update_dependencies("news", {"./src/2025/photo.png"})
+
+        assert self.db.retrieve_products_matching("./**/*.txt") == set()
+        assert self.db.retrieve_products_under("./src/2025") == {"news"}
+
+    def test_the_paths_of_a_loaded_database_are_queried(self):
+        self.given_a_database_of_products_and_their_paths()
+        with mock.patch(
+                "doxhooks.dataio.save_literals", autospec=True) as save:
+            self.db.save("test_path")
+        data = save.call_args[0][1]
+
+        self.db = DependencyDatabase()
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value=data):
+            self.db.load("test_path")
+
+        assert self.db.retrieve_products_under("./style") == {"style"}
+
+    def test_paths_with_the_same_components_are_all_queried(self):
+        self.db = DependencyDatabase()
+        with mock.patch(
+                "doxhooks.dependency_databases._split_path",
+                re.compile(r"[\\/]").split):
+            self.db.update_dependencies("back", {"src\\news.txt"})
+            self.db.update_dependencies("forward", {"src/news.txt"})
+            both_products = self.db.retrieve_products_under("src")
+            self.db.update_dependencies("forward", set())
+
+            assert both_products == {"back", "forward"}
+            assert self.db.retrieve_products_matching("src/*.txt") == {
+                "back"}
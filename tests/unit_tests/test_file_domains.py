@@ -1,7 +1,10 @@
 import os
 import unittest.mock as mock
 
-from doxhooks.file_domains import InputFileDomain
+import doxhooks.fileio as fileio
+from doxhooks.file_domains import InputFileDomain, OutputFileDomain
+from doxhooks.precompressors import Precompressor
+from pytest import mark, raises
 
 
 class FakeFileTree:
@@ -36,3 +39,36 @@ class TestRememberInputPaths(BaseTestFileDomain):
 
         # then those paths are the path to that file.
         assert paths == {self.path}
+
+
+class TestPrecompressHashedOutputFiles(BaseTestFileDomain):
+    def given_an_output_file_domain_that_records_hashes(
+            self, tmpdir, encoding):
+        fileio.add_output_roots(tmpdir.strpath)
+        self.precompressor = mock.Mock(spec=Precompressor)
+        self.domain = OutputFileDomain(
+            self.fake_filetree, tmpdir.strpath, "page.html", encoding, None,
+            precompressor=self.precompressor, record_hashes=True)
+
+    @mark.parametrize("encoding", [None, "utf-8"])
+    def test_a_file_is_compressed_when_it_is_closed(self, tmpdir, encoding):
+        self.given_an_output_file_domain_that_records_hashes(tmpdir, encoding)
+
+        with self.domain.open() as output:
+            output.write("text" if encoding else b"text")
+
+        path = tmpdir.join("page.html").strpath
+        self.precompressor.compress.assert_called_once_with(path)
+        assert self.domain.hashes[path] is not None
+
+    @mark.parametrize("encoding", [None, "utf-8"])
+    def test_a_file_is_not_compressed_if_writing_it_failed(
+            self, tmpdir, encoding):
+        self.given_an_output_file_domain_that_records_hashes(tmpdir, encoding)
+
+        with raises(RuntimeError):
+            with self.domain.open() as output:
+                output.write("text" if encoding else b"text")
+                raise RuntimeError("test")
+
+        assert not self.precompressor.compress.called
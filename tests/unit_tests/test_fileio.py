@@ -161,6 +161,67 @@ class TestCopying(BaseTestFileIO):
         assert self.error
 
 
+class TestMovingAndRemoving(BaseTestFileIO):
+    @fixture
+    def output_input_file_path(self, output_tmpdir):
+        file = output_tmpdir.join("input.tmp")
+        file.write("contents")
+        return file.strpath
+
+    @withraises
+    def when_moving_a_file_from_an_input_path_to_an_output_path(
+            self, input_path, output_path):
+        fileio.move(input_path, output_path)
+
+    @withraises
+    def when_removing_a_file(self, path):
+        fileio.remove(path)
+
+    def test_moving_a_file_replaces_the_output_file(
+            self, output_input_file_path, output_file_path):
+        fileio.save(output_file_path, "old contents", self.text_encoding)
+
+        self.when_moving_a_file_from_an_input_path_to_an_output_path(
+            output_input_file_path, output_file_path)
+
+        assert not os.path.exists(output_input_file_path)
+        contents = fileio.load(output_file_path, self.text_encoding)
+        assert contents == "contents"
+
+    def test_new_output_directories_are_silently_made(
+            self, output_input_file_path, new_output_directory_and_file_path):
+        self.when_moving_a_file_from_an_input_path_to_an_output_path(
+            output_input_file_path, new_output_directory_and_file_path)
+
+        self.then_the_file_exists(new_output_directory_and_file_path)
+
+    def test_moving_a_missing_file_is_an_error(
+            self, output_tmpdir, output_file_path):
+        missing_path = output_tmpdir.join("missing.tmp").strpath
+
+        self.when_moving_a_file_from_an_input_path_to_an_output_path(
+            missing_path, output_file_path, raises=DoxhooksFileSystemError)
+
+        assert self.error
+
+    def test_removing_a_file_deletes_the_file(self, output_input_file_path):
+        self.when_removing_a_file(output_input_file_path)
+
+        assert not os.path.exists(output_input_file_path)
+
+    def test_removing_a_missing_file_is_an_error(self, output_file_path):
+        self.when_removing_a_file(
+            output_file_path, raises=DoxhooksFileSystemError)
+
+        assert self.error
+
+    def test_removing_a_non_output_file_is_an_error(self, input_file_path):
+        self.when_removing_a_file(
+            input_file_path, raises=DoxhooksOutputPathError)
+
+        self.then_the_file_exists(input_file_path)
+
+
 @mark.usefixtures("open_input_and_output", "generic_file_path")
 class TestOpeningATextFile(BaseTestFileIO):
     def when_opening_a_file_with_an_encoding(self, encoding, newline=None):
@@ -2,8 +2,9 @@ import io
 import unittest.mock as mock
 
 import doxhooks.fingerprint as fingerprint
-from doxhooks.errors import DoxhooksTypeError, DoxhooksValueError
-from pytest import fixture, mark
+from doxhooks.errors import (
+    DoxhooksFileError, DoxhooksTypeError, DoxhooksValueError)
+from pytest import fixture, mark, raises
 
 from doxhooks_pytest import withraises
 
@@ -71,6 +72,19 @@ class TestFingerprintStrings(BaseTestFingerprint):
         assert self.returned_filename == self.mangled_filename
 
 
+class TestFingerprintHashObject(BaseTestFingerprint):
+    def test_returns_a_filename_mangled_with_the_fingerprint_in_a_hash_object(
+            self):
+        hash_object = fingerprint.new_hash_object()
+        for string in self.strings:
+            hash_object.update(string.encode(self.encoding))
+
+        filename = fingerprint.filename_for_hash_object(
+            self.filename, hash_object)
+
+        assert filename == self.mangled_filename
+
+
 class TestFingerprintFiles(BaseTestFingerprint):
     @mark.usefixtures("one_fake_file")
     def test_returns_a_filename_mangled_with_the_fingerprint_of_a_file(self):
@@ -90,6 +104,35 @@ class TestFingerprintFiles(BaseTestFingerprint):
         assert self.returned_filename == self.mangled_filename
 
 
+@mark.usefixtures("_setup_monkeypatch")
+class TestMultipleFiles(BaseTestFingerprint):
+    def given_some_files(self, tmpdir):
+        self.strings = [str(file_no) * 100000 for file_no in range(5)]
+        self.paths = []
+        for file_no, string in enumerate(self.strings):
+            file = tmpdir.join("{}.dat".format(file_no))
+            file.write(string)
+            self.paths.append(file.strpath)
+
+    @mark.parametrize("read_ahead", [0, 1, 8])
+    def test_the_fingerprint_of_multiple_files_is_in_path_order(
+            self, tmpdir, read_ahead):
+        self.given_some_files(tmpdir)
+        self.given_a_customised("read_ahead", read_ahead)
+
+        filename = fingerprint.filename_for_files(self.filename, *self.paths)
+
+        assert filename == fingerprint.filename_for_strings(
+            self.filename, "".join(self.strings), encoding=self.encoding)
+
+    def test_a_file_that_cannot_be_read_ahead_is_an_error(self, tmpdir):
+        self.given_some_files(tmpdir)
+        self.paths.insert(2, tmpdir.join("missing.dat").strpath)
+
+        with raises(DoxhooksFileError):
+            fingerprint.filename_for_files(self.filename, *self.paths)
+
+
 class TestRewritableFieldInFilename(BaseTestFingerprint):
     @mark.parametrize(
         "rewritable_filename, mangled_rewritable_filename", [
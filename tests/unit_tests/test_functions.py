@@ -1,4 +1,7 @@
 import os
+import sys
+import types
+import unittest.mock as mock
 
 from doxhooks.errors import (
     DoxhooksImportError, DoxhooksForbiddenLookupError, DoxhooksLookupError,
@@ -166,3 +169,23 @@ class TestImportingAModuleAttribute:
             missing_module_attr_name, raises=DoxhooksLookupError)
 
         assert self.error.key == "not_an_attr"
+
+    def test_an_imported_attribute_is_cached(self):
+        self.when_importing_a_module_attribute("os.path.sep")
+
+        with mock.patch("importlib.import_module", autospec=True) as import_:
+            self.when_importing_a_module_attribute("os.path.sep")
+
+        assert not import_.called
+        assert self.returned_attr == os.path.sep
+
+    def test_an_attribute_is_imported_again_if_its_module_is_replaced(
+            self, monkeypatch):
+        for value in "test_value_1", "test_value_2":
+            module = types.ModuleType("test_module")
+            module.attr = value
+            monkeypatch.setitem(sys.modules, "test_module", module)
+
+            self.when_importing_a_module_attribute("test_module.attr")
+
+        assert self.returned_attr == "test_value_2"
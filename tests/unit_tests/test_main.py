@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import doxhooks
+from pytest import mark
+
+
+IMPORT_SCRIPT = """\
+import sys
+import doxhooks.main, doxhooks.resources
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+class TestStartUp:
+    @mark.parametrize("deferred_module", [
+        "inspect", "json", "queue", "shutil", "threading"])
+    def test_importing_doxhooks_does_not_import_a_deferred_module(
+            self, deferred_module):
+        dist_path = os.path.dirname(os.path.dirname(doxhooks.__file__))
+        env = dict(os.environ, PYTHONPATH=dist_path)
+
+        output = subprocess.check_output(
+            [sys.executable, "-c", IMPORT_SCRIPT], env=env,
+            universal_newlines=True)
+
+        assert deferred_module not in output.split()
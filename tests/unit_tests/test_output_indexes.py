@@ -0,0 +1,198 @@
+import json
+import os
+import unittest.mock as mock
+
+import doxhooks.fileio as fileio
+from doxhooks.errors import DoxhooksDataFileError
+from doxhooks.output_indexes import OutputIndex
+from pytest import fixture, mark, raises
+
+
+class BaseTestOutputIndex:
+    def given_an_output_index(self):
+        self.index = OutputIndex()
+
+    def given_a_saved_output_index(self, hashes):
+        self.given_an_output_index()
+        self.index.update_outputs("resource", hashes)
+        self.when_saving_and_loading_the_index()
+
+    def when_saving_and_loading_the_index(self):
+        with mock.patch(
+                "doxhooks.dataio.save_literals", autospec=True) as save, \
+                mock.patch("doxhooks.fileio.save", autospec=True):
+            self.index.save("data/output_path-hash.dat")
+        data = save.call_args[0][1]
+        self.given_an_output_index()
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value=data), \
+                mock.patch("os.path.exists", return_value=True):
+            self.index.load("data/output_path-hash.dat")
+
+
+class TestManifest(BaseTestOutputIndex):
+    def test_the_outputs_are_added_changed_or_unchanged(self):
+        self.given_a_saved_output_index({"a.html": "1", "b.html": "2"})
+
+        self.index.update_outputs(
+            "resource", {"a.html": "1", "b.html": "3", "c.html": "4"})
+
+        assert self.index.manifest() == {
+            "added": {"c.html": "4"},
+            "changed": {"b.html": "3"},
+            "unchanged": {"a.html": "1"},
+            "removed": [],
+        }
+
+    def test_outputs_that_were_not_updated_are_not_in_the_manifest(self):
+        self.given_a_saved_output_index({"a.html": "1", "b.html": "2"})
+
+        self.index.update_outputs("resource", {"a.html": "5"})
+
+        assert self.index.manifest() == {
+            "added": {}, "changed": {"a.html": "5"}, "unchanged": {},
+            "removed": []}
+
+    def test_the_manifest_is_saved_in_the_data_directory(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        self.given_an_output_index()
+        self.index.update_outputs("resource", {"a.html": "1"})
+
+        self.index.save(tmpdir.join("output_path-hash.dat").strpath)
+
+        manifest = json.loads(tmpdir.join("output-manifest.json").read())
+        assert manifest == {
+            "added": {"a.html": "1"}, "changed": {}, "unchanged": {},
+            "removed": []}
+
+
+class TestLoading(BaseTestOutputIndex):
+    def test_a_missing_index_file_is_an_empty_index(self, tmpdir):
+        self.given_an_output_index()
+
+        self.index.load(tmpdir.join("missing.dat").strpath)
+
+        self.index.update_outputs("resource", {"a.html": "1"})
+        assert self.index.manifest()["added"] == {"a.html": "1"}
+
+    @mark.parametrize("bad_data", [
+        None, {}, {"hashes": {"a.html": 1}, "generations": {}},
+        {"hashes": {}, "generations": {"resource": [("now", ())]}},
+    ])
+    def test_a_bad_index_file_is_an_error(self, bad_data):
+        self.given_an_output_index()
+
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value=bad_data), \
+                mock.patch("os.path.exists", return_value=True):
+            with raises(DoxhooksDataFileError):
+                self.index.load("data/output_path-hash.dat")
+
+
+class TestPruning(BaseTestOutputIndex):
+    @fixture
+    def output_dir(self, tmpdir, monkeypatch):
+        fileio.add_output_roots(tmpdir.strpath)
+        monkeypatch.chdir(tmpdir.strpath)
+        self.clock = iter(range(1000, 2000))
+        monkeypatch.setattr(
+            "doxhooks.output_indexes.time.time", lambda: next(self.clock))
+
+    def given_a_resource_with_outputs(self, resource_id, *filenames):
+        hashes = {}
+        for filename in filenames:
+            fileio.save(filename, filename, "utf-8")
+            hashes[filename] = "hash of " + filename
+        self.index.update_outputs(resource_id, hashes)
+
+    def when_pruning(self, resource_ids=("style",), **kwargs):
+        self.pruned_paths = self.index.prune(resource_ids, **kwargs)
+
+    def then_the_remaining_files_are(self, *filenames):
+        assert sorted(os.listdir(os.curdir)) == sorted(filenames)
+
+    @mark.usefixtures("output_dir")
+    def test_the_outputs_of_superseded_generations_are_removed(self):
+        self.given_an_output_index()
+        self.given_a_resource_with_outputs("style", "style-1.css")
+        self.given_a_resource_with_outputs("style", "style-2.css")
+
+        self.when_pruning()
+
+        assert self.pruned_paths == ["style-1.css"]
+        self.then_the_remaining_files_are("style-2.css")
+        assert self.index.manifest()["removed"] == ["style-1.css"]
+
+    @mark.usefixtures("output_dir")
+    def test_the_latest_generations_are_kept(self):
+        self.given_an_output_index()
+        for filename in "style-1.css", "style-2.css", "style-3.css":
+            self.given_a_resource_with_outputs("style", filename)
+
+        self.when_pruning(keep=2)
+
+        self.then_the_remaining_files_are("style-2.css", "style-3.css")
+
+    @mark.usefixtures("output_dir")
+    def test_generations_superseded_within_the_grace_period_are_kept(self):
+        self.given_an_output_index()
+        for filename in "style-1.css", "style-2.css", "style-3.css":
+            self.given_a_resource_with_outputs("style", filename)
+
+        # The clock is at 1003: style-2 was superseded at 1002.
+        self.when_pruning(grace_period=1.5)
+
+        self.then_the_remaining_files_are("style-2.css", "style-3.css")
+
+    @mark.usefixtures("output_dir")
+    def test_the_outputs_of_removed_resources_are_removed(self):
+        self.given_an_output_index()
+        self.given_a_resource_with_outputs("style", "style.css")
+        self.given_a_resource_with_outputs("old", "old.css")
+        # and the output has a precompressed variant,
+        fileio.save("old.css.gz", b"variant", None)
+
+        self.when_pruning()
+
+        self.then_the_remaining_files_are("style.css")
+
+    @mark.usefixtures("output_dir")
+    def test_the_grace_period_of_a_removed_resource_starts_at_its_removal(
+            self):
+        self.given_an_output_index()
+        self.given_a_resource_with_outputs("style", "style.css")
+        self.given_a_resource_with_outputs("old", "old.css")
+        self.when_pruning(["style", "old"])
+
+        # The clock is at 1003: old.css was recorded at 1001, and "old"
+        # is found to be removed at 1003.
+        self.when_pruning(grace_period=0.5)
+        self.then_the_remaining_files_are("old.css", "style.css")
+
+        # The clock is at 1004: the grace period since 1003 has passed.
+        self.when_pruning(grace_period=0.5)
+        self.then_the_remaining_files_are("style.css")
+
+    @mark.usefixtures("output_dir")
+    def test_an_output_of_a_kept_generation_is_never_removed(self):
+        self.given_an_output_index()
+        self.given_a_resource_with_outputs("style", "shared.css")
+        self.given_a_resource_with_outputs("style", "style.css")
+        self.given_a_resource_with_outputs("other", "shared.css")
+
+        self.when_pruning(["style", "other"])
+
+        self.then_the_remaining_files_are("shared.css", "style.css")
+
+    @mark.usefixtures("output_dir")
+    def test_an_unchanged_generation_is_not_recorded_again(self):
+        self.given_an_output_index()
+        self.given_a_resource_with_outputs("style", "style-1.css")
+        self.given_a_resource_with_outputs("style", "style-2.css")
+        self.given_a_resource_with_outputs("style", "style-2.css")
+
+        self.when_pruning(keep=2)
+
+        self.then_the_remaining_files_are("style-1.css", "style-2.css")
@@ -0,0 +1,162 @@
+import concurrent.futures
+import gzip
+import os
+import unittest.mock as mock
+
+import doxhooks.fileio as fileio
+from doxhooks.errors import DoxhooksValueError
+from doxhooks.precompressors import Precompressor
+from pytest import fixture, mark, raises
+
+
+class BaseTestPrecompressor:
+    data = b"body { color: black; }\n" * 100
+
+    @fixture
+    def output_path(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        path = tmpdir.join("style.css").strpath
+        fileio.save(path, self.data, None)
+        os.utime(path, ns=(0, 1234567890 * 10 ** 9))
+        return path
+
+    def when_compressing(self, *paths, formats=("gz",)):
+        precompressor = Precompressor(formats)
+        for path in paths:
+            precompressor.compress(path)
+        precompressor.wait()
+
+
+class TestCompressedVariants(BaseTestPrecompressor):
+    def test_a_gzip_variant_is_written_next_to_the_output_file(
+            self, output_path):
+        self.when_compressing(output_path)
+
+        with gzip.open(output_path + ".gz") as variant:
+            assert variant.read() == self.data
+
+    def test_the_variant_has_the_modification_time_of_the_output_file(
+            self, output_path):
+        self.when_compressing(output_path)
+
+        variant_mtime = os.stat(output_path + ".gz").st_mtime_ns
+        assert variant_mtime == os.stat(output_path).st_mtime_ns
+
+    def test_a_file_that_is_not_a_text_file_is_not_compressed(self, tmpdir):
+        fileio.add_output_roots(tmpdir.strpath)
+        path = tmpdir.join("image.png").strpath
+        fileio.save(path, self.data, None)
+
+        self.when_compressing(path)
+
+        assert not os.path.exists(path + ".gz")
+
+    def test_an_unchanged_variant_is_not_compressed_again(self, output_path):
+        self.when_compressing(output_path)
+
+        with mock.patch("doxhooks.fileio.save", autospec=True) as save:
+            self.when_compressing(output_path)
+
+        assert not save.called
+
+    def test_an_unchanged_output_file_is_not_read_again(self, output_path):
+        self.when_compressing(output_path)
+
+        with mock.patch("doxhooks.fileio.load", autospec=True) as load:
+            self.when_compressing(output_path)
+
+        assert not load.called
+
+    def test_a_changed_variant_is_compressed_again(self, output_path):
+        self.when_compressing(output_path)
+        fileio.save(output_path, b"changed", None)
+
+        self.when_compressing(output_path)
+
+        with gzip.open(output_path + ".gz") as variant:
+            assert variant.read() == b"changed"
+
+    def test_a_pending_compression_of_a_file_is_not_repeated(
+            self, output_path):
+        precompressor = Precompressor(["gz"])
+        precompressor._executor = mock.Mock()
+        precompressor._executor.submit.return_value = (
+            concurrent.futures.Future())
+
+        precompressor.compress(output_path)
+        precompressor.compress(output_path)
+
+        assert precompressor._executor.submit.call_count == 1
+
+    def test_the_variant_of_the_latest_output_data_is_written(
+            self, output_path):
+        precompressor = Precompressor(["gz"], max_workers=2)
+        for data in (b"first", b"second", b"third"):
+            fileio.save(output_path, data, None)
+            precompressor.compress(output_path)
+        precompressor.wait()
+
+        with gzip.open(output_path + ".gz") as variant:
+            assert variant.read() == b"third"
+        assert not os.path.exists(output_path + ".gz.tmp")
+
+    @mark.skipif(
+        "zst" not in Precompressor.available_formats(),
+        reason="The interpreter does not have compression.zstd.")
+    def test_a_zstandard_variant_is_written_if_it_is_available(
+            self, output_path):
+        from compression import zstd
+
+        self.when_compressing(output_path, formats=("zst",))
+
+        with open(output_path + ".zst", "rb") as variant:
+            assert zstd.decompress(variant.read()) == self.data
+
+
+class TestFormats:
+    def test_gzip_is_always_available(self):
+        assert "gz" in Precompressor.available_formats()
+
+    def test_an_unknown_format_is_an_error(self):
+        with raises(DoxhooksValueError):
+            Precompressor(["rar"])
+
+
+class TestWritingOutputFiles(BaseTestPrecompressor):
+    @mark.parametrize("encoding", [None, "utf-8"])
+    def test_a_file_is_compressed_when_it_is_closed(self, tmpdir, encoding):
+        fileio.add_output_roots(tmpdir.strpath)
+        path = tmpdir.join("page.html").strpath
+        precompressor = mock.Mock(spec=Precompressor)
+
+        output = fileio.open_output(
+            path, encoding, precompressor=precompressor)
+        output.write("text" if encoding else b"text")
+        assert not precompressor.compress.called
+        output.close()
+
+        precompressor.compress.assert_called_once_with(path)
+        assert fileio.load(path, None) == b"text"
+
+    @mark.parametrize("encoding", [None, "utf-8"])
+    def test_a_file_is_not_compressed_if_writing_it_failed(
+            self, tmpdir, encoding):
+        fileio.add_output_roots(tmpdir.strpath)
+        path = tmpdir.join("page.html").strpath
+        precompressor = mock.Mock(spec=Precompressor)
+
+        with raises(RuntimeError):
+            with fileio.open_output(
+                    path, encoding, precompressor=precompressor) as output:
+                output.write("text" if encoding else b"text")
+                raise RuntimeError("test")
+
+        assert not precompressor.compress.called
+
+    def test_a_copied_file_is_compressed(self, output_path, tmpdir):
+        copy_path = tmpdir.join("copy.css").strpath
+        precompressor = mock.Mock(spec=Precompressor)
+
+        fileio.copy(output_path, copy_path, precompressor=precompressor)
+
+        precompressor.compress.assert_called_once_with(copy_path)
@@ -194,3 +194,29 @@ class TestFileToken(BaseTestBasePreprocessorContext):
             "include", "not_str_or_none", raises=DoxhooksTypeError)
 
         assert self.error.value == self.context.not_str_or_none
+
+
+class TestRecordingReads(BaseTestBasePreprocessorContext):
+    Context = PreprocessorContext
+
+    def given_a_context_that_records_reads(self):
+        self.given_a_preprocessor_context(condition=False, title="Title")
+        self.context._record_reads()
+        self.context._reads = {}
+
+    def test_the_tokens_and_values_that_are_read_are_recorded(self):
+        self.given_a_context_that_records_reads()
+
+        self.context.get("title")
+        self.when_interpreting_a_keyword_and_its_tokens(
+            "if", "condition", "error", "message")
+
+        assert self.context._reads == {"title": "Title", "condition": False}
+
+    def test_a_keyword_with_side_effects_stops_the_recording(self):
+        self.given_a_context_that_records_reads()
+
+        self.when_interpreting_a_keyword_and_its_tokens(
+            "set", self.name, "value")
+
+        assert self.context._reads is None
@@ -1,8 +1,11 @@
 import io
 import unittest.mock as mock
 
-from doxhooks.preprocessors import Preprocessor
-from pytest import mark
+from doxhooks.build_profiles import PreprocessorProfile
+from doxhooks.preprocessor_contexts import PreprocessorContext
+from doxhooks.preprocessors import HTMLPreprocessor, Preprocessor
+from doxhooks.template_caches import RenderCache, TemplateCache
+from pytest import fixture, mark, raises
 
 
 class FakeInputFileDomain:
@@ -105,3 +108,239 @@ class TestLines(BaseTestPreprocessors):
         # then the directive indentation from a previous stack does not
         # leak into the new stack.
         assert output_file.lines == ["No indent.\n"]
+
+
+class TestProfile(BaseTestPreprocessors):
+    def given_a_profiled_preprocessor(self):
+        class ProfiledPreprocessor(Preprocessor):
+            profile = PreprocessorProfile()
+
+        context = mock.Mock()
+        context.get.return_value = "value"
+        self.prepro = ProfiledPreprocessor(
+            context, FakeInputFileDomain(), FakeOutputFile())
+
+    def test_keywords_files_and_nodes_are_profiled(self):
+        self.given_a_profiled_preprocessor()
+
+        self.prepro.insert_file(self.filename)
+        self.prepro.insert_lines(["##keyword\n", "##node## ##node##\n"])
+
+        assert self.prepro.profile.call_counts == {
+            "file:" + self.filename: 1,
+            "keyword:keyword": 1,
+            "node:node": 2,
+        }
+
+
+class FakeSourceFileDomain(FakeInputFileDomain):
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+
+    def _open_fake_file(self, *args):
+        return io.StringIO(self.source)
+
+
+class FakeContext:
+    def __init__(self, **variables):
+        self.variables = variables
+        self.interpreted = []
+
+    def get(self, identifier):
+        return self.variables[identifier]
+
+    def interpret(self, keyword, *tokens, preprocessor):
+        self.interpreted.append((keyword, tokens))
+        if keyword == "error":
+            raise RuntimeError(tokens)
+        if keyword == "write":
+            preprocessor.insert_lines([" ".join(tokens) + "\n"])
+
+
+class TestTemplates:
+    filename = "test_filename.src"
+    source = (
+        "Literal line.\n"
+        "\n"
+        "  ##node## and ##parent##.\n"
+        "    ##write 'a token' ##node## # comment\n"
+        "##keyword\n"
+        "&amp; &unknown;\n"
+        "No line ending.")
+
+    def _preprocess(self, preprocessor_class, source, template_cache):
+        output_file = FakeOutputFile()
+        context = FakeContext(node="value", parent="parent of ##node##")
+        preprocessor = preprocessor_class(
+            context, FakeSourceFileDomain(source), output_file,
+            template_cache=template_cache)
+        preprocessor.insert_file(self.filename)
+        return "".join(output_file.lines), context.interpreted
+
+    @mark.parametrize("preprocessor_class", [Preprocessor, HTMLPreprocessor])
+    def test_a_compiled_template_has_the_same_output_as_interpretation(
+            self, preprocessor_class):
+        template_cache = TemplateCache()
+
+        interpreted = self._preprocess(preprocessor_class, self.source, None)
+        compiled = self._preprocess(
+            preprocessor_class, self.source, template_cache)
+
+        assert compiled == interpreted
+        assert template_cache.change_count == 1
+
+    def test_a_cached_template_is_not_compiled_again(self):
+        template_cache = TemplateCache()
+        self._preprocess(Preprocessor, self.source, template_cache)
+
+        with mock.patch(
+                "doxhooks.preprocessors._template_code",
+                autospec=True) as template_code:
+            self._preprocess(Preprocessor, self.source, template_cache)
+
+        assert not template_code.called
+
+    def test_a_template_cached_in_an_earlier_format_is_not_used(self):
+        template_cache = TemplateCache()
+        self._preprocess(Preprocessor, self.source, template_cache)
+
+        with mock.patch("doxhooks.preprocessors._template_format", 0):
+            self._preprocess(Preprocessor, self.source, template_cache)
+
+        assert template_cache.change_count == 2
+
+    def test_an_error_in_a_compiled_template_is_traced_to_its_line(self):
+        template_cache = TemplateCache()
+        source = "Line 1.\n##error\n"
+
+        with mock.patch(
+                "doxhooks.console.error_trace", autospec=True) as error_trace, \
+                raises(RuntimeError):
+            self._preprocess(Preprocessor, source, template_cache)
+
+        error_trace.assert_called_once_with(
+            "In: {}\n    >> line   2".format(self.filename), "##error\n")
+
+
+class FakeFilesDomain:
+    def __init__(self, dir_path, sources):
+        self.dir_path = dir_path
+        self.paths = set()
+        self.opened = []
+        for filename, source in sources.items():
+            path = dir_path.join(filename)
+            if not path.check() or path.read() != source:
+                path.write(source)
+
+    def path(self, filename):
+        return self.dir_path.join(filename).strpath
+
+    def open(self, filename):
+        self.opened.append(filename)
+        self.paths.add(self.path(filename))
+        return open(self.path(filename))
+
+
+class TestRenderCache:
+    sources = {
+        "page.html": "<main>##title##</main>\n##insert footer.html\n",
+        "footer.html": "<footer>##site##</footer>\n  ##insert legal.html\n",
+        "legal.html": "Legal ##site##.\n",
+        "wrapper.html": "##insert impure.html\n##site##\n",
+        "impure.html": "##set site 'changed'\n",
+    }
+
+    @fixture(autouse=True)
+    def _setup_caches(self, tmpdir):
+        self.tmpdir = tmpdir
+        self.template_cache = TemplateCache()
+        self.render_cache = RenderCache()
+
+    def _preprocess(self, filename="page.html", **variables):
+        self.input = FakeFilesDomain(self.tmpdir, self.sources)
+        output_file = FakeOutputFile()
+        self.prepro = Preprocessor(
+            PreprocessorContext(**variables), self.input, output_file,
+            template_cache=self.template_cache,
+            render_cache=self.render_cache)
+        self.prepro.insert_file(filename)
+        return "".join(output_file.lines)
+
+    def given_a_partial_that_has_been_inserted_twice(self):
+        self._preprocess(title="Page 1", site="Site")
+        self._preprocess(title="Page 2", site="Site")
+
+    def test_the_output_of_a_repeated_partial_is_reused(self):
+        self.given_a_partial_that_has_been_inserted_twice()
+
+        output = self._preprocess(title="Page 3", site="Site")
+
+        assert output == (
+            "<main>Page 3</main>\n<footer>Site</footer>\n  Legal Site.\n")
+        assert self.input.opened == ["page.html"]
+        assert self.prepro.input_paths == self.input.paths == {
+            self.input.path(filename)
+            for filename in ["page.html", "footer.html", "legal.html"]}
+
+    def test_a_partial_is_preprocessed_again_when_a_variable_changes(self):
+        self.given_a_partial_that_has_been_inserted_twice()
+
+        output = self._preprocess(title="Page 3", site="Other site")
+
+        assert output == (
+            "<main>Page 3</main>\n<footer>Other site</footer>\n"
+            "  Legal Other site.\n")
+        assert "footer.html" in self.input.opened
+
+    def test_a_partial_is_preprocessed_again_when_a_file_changes(self):
+        self.given_a_partial_that_has_been_inserted_twice()
+        self.sources = dict(
+            self.sources, **{"legal.html": "Changed legal ##site##.\n"})
+
+        output = self._preprocess(title="Page 3", site="Site")
+
+        assert output.endswith("  Changed legal Site.\n")
+
+    def test_the_output_of_a_partial_with_side_effects_is_not_reused(self):
+        for __ in range(3):
+            output = self._preprocess("wrapper.html", site="Site")
+
+        assert output == "changed\n"
+        assert "impure.html" in self.input.opened
+
+
+class TestCharacterReferences:
+    class HTMLPreprocessor(HTMLPreprocessor):
+        character_references = {"copy": "(c)", "169": "(c)", "amp": "&"}
+
+    def _preprocess(self, line):
+        output_file = FakeOutputFile()
+        preprocessor = self.HTMLPreprocessor(
+            mock.Mock(), FakeInputFileDomain(), output_file)
+        preprocessor.insert_lines([line])
+        return "".join(output_file.lines)
+
+    def test_known_character_references_are_replaced(self):
+        output = self._preprocess("&copy; &#169; &169; &#copy; &amp;lt;\n")
+
+        assert output == "(c) (c) (c) (c) &lt;\n"
+
+    def test_an_unknown_character_reference_is_a_warning(self):
+        with mock.patch(
+                "doxhooks.console.warning", autospec=True) as warning:
+            output = self._preprocess("&copy; &unknown;\n")
+
+        assert output == "(c) &unknown;\n"
+        warning.assert_called_once_with(
+            "Unknown HTML character reference:", "unknown")
+
+    def test_changed_character_references_are_used_by_a_new_preprocessor(
+            self, monkeypatch):
+        self._preprocess("&copy;\n")
+        monkeypatch.setattr(
+            self.HTMLPreprocessor, "character_references", {"copy": "©"})
+
+        output = self._preprocess("&copy;\n")
+
+        assert output == "©\n"
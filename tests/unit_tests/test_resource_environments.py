@@ -0,0 +1,171 @@
+import unittest.mock as mock
+from collections import OrderedDict
+
+from doxhooks.build_profiles import BuildProfile
+from doxhooks.dependency_databases import DependencyDatabase
+from doxhooks.errors import DoxhooksLookupError
+from doxhooks.resource_environments import ResourceEnvironment
+from pytest import raises
+
+from doxhooks_pytest import withraises
+
+
+class FakeResourceConfiguration:
+    def __init__(self, updated_ids):
+        self._updated_ids = updated_ids
+
+    def make(self, *, id, **kwargs):
+        resource = mock.Mock()
+        resource.update.side_effect = lambda: self._updated_ids.append(id)
+        return resource
+
+
+class BaseTestResourceEnvironment:
+    input_path = "./test_input_path"
+
+    def given_an_environment(self, resource_ids, **kwargs):
+        self.updated_ids = []
+        self.resource_configs = OrderedDict(
+            (id_, FakeResourceConfiguration(self.updated_ids))
+            for id_ in resource_ids)
+        self.database = DependencyDatabase()
+        self.environment = ResourceEnvironment(
+            self.resource_configs, {}, self.database, **kwargs)
+
+    def given_resources_that_depend_on_the_input_path(self, *resource_ids):
+        for id_ in resource_ids:
+            self.database.update_dependencies(id_, [self.input_path])
+
+    @withraises
+    def when_updating_the_dependents(self):
+        self.environment.update_dependents(self.input_path)
+
+
+class TestUpdateDependents(BaseTestResourceEnvironment):
+    def test_the_dependents_are_updated_in_the_configuration_order(self):
+        self.given_an_environment(["id_1", "id_2", "id_3", "id_4"])
+        self.given_resources_that_depend_on_the_input_path("id_4", "id_2")
+
+        self.when_updating_the_dependents()
+
+        assert self.updated_ids == ["id_2", "id_4"]
+
+    def test_the_dependents_are_updated_in_the_reverse_order(self):
+        self.given_an_environment(
+            ["id_1", "id_2", "id_3", "id_4"], reverse_order=True)
+        self.given_resources_that_depend_on_the_input_path("id_2", "id_4")
+
+        self.when_updating_the_dependents()
+
+        assert self.updated_ids == ["id_4", "id_2"]
+
+    def test_an_added_configuration_is_found(self):
+        self.given_an_environment(["id_1", "id_2"])
+        self.given_resources_that_depend_on_the_input_path("id_1")
+        self.when_updating_the_dependents()
+        self.updated_ids.clear()
+
+        del self.resource_configs["id_2"]
+        self.resource_configs["id_3"] = FakeResourceConfiguration(
+            self.updated_ids)
+        self.given_resources_that_depend_on_the_input_path("id_3")
+        self.when_updating_the_dependents()
+
+        assert self.updated_ids == ["id_1", "id_3"]
+
+    def test_a_reordered_configuration_is_updated_in_the_new_order(self):
+        self.given_an_environment(["id_1", "id_2"])
+        self.given_resources_that_depend_on_the_input_path("id_1", "id_2")
+        self.when_updating_the_dependents()
+        self.updated_ids.clear()
+
+        self.resource_configs.move_to_end("id_1")
+        self.when_updating_the_dependents()
+
+        assert self.updated_ids == ["id_2", "id_1"]
+
+    def test_a_dependent_that_is_not_configured_is_an_error(self):
+        self.given_an_environment(["id_1"])
+        self.given_resources_that_depend_on_the_input_path("id_1", "id_2")
+
+        self.when_updating_the_dependents(raises=DoxhooksLookupError)
+
+        assert self.error
+        assert self.updated_ids == []
+
+
+class TestUpdateDependentsOfManyPaths(BaseTestResourceEnvironment):
+    def given_resources_that_depend_on_paths(self, resource_paths):
+        for id_, path in resource_paths.items():
+            self.database.update_dependencies(id_, [path])
+
+    def given_an_environment_of_resources_that_depend_on_paths(self):
+        self.given_an_environment(["id_1", "id_2", "id_3"])
+        self.given_resources_that_depend_on_paths({
+            "id_1": "./src/a.txt",
+            "id_2": "./style/b.css",
+            "id_3": "./src/sub/c.txt",
+        })
+
+    def test_the_dependents_of_a_glob_pattern_are_updated(self):
+        self.given_an_environment_of_resources_that_depend_on_paths()
+        self.input_path = "src/**/*.txt"
+
+        self.when_updating_the_dependents()
+
+        assert self.updated_ids == ["id_1", "id_3"]
+
+    def test_the_dependents_of_a_directory_are_updated(self):
+        self.given_an_environment_of_resources_that_depend_on_paths()
+        self.input_path = "src"
+
+        self.when_updating_the_dependents()
+
+        assert self.updated_ids == ["id_1", "id_3"]
+
+    def test_the_directory_is_relative_to_the_input_root(self):
+        self.given_an_environment_of_resources_that_depend_on_paths()
+
+        self.environment.update_dependents("site/src/sub", input_root="site")
+
+        assert self.updated_ids == ["id_3"]
+
+    def test_a_filename_with_glob_characters_matches_itself(self):
+        self.given_an_environment(["id_1", "id_2"])
+        self.given_resources_that_depend_on_paths({
+            "id_1": "./src/[draft].md",
+            "id_2": "./src/d.md",
+        })
+        self.input_path = "src/[draft].md"
+
+        self.when_updating_the_dependents()
+
+        assert self.updated_ids == ["id_1"]
+
+
+class TestBuildProfile(BaseTestResourceEnvironment):
+    def given_an_environment_with_a_build_profile(self, resource_ids):
+        self.profile = mock.Mock(wraps=BuildProfile())
+        self.given_an_environment(resource_ids, build_profile=self.profile)
+
+    def test_the_build_profile_is_reported_after_updating_the_dependents(
+            self):
+        self.given_an_environment_with_a_build_profile(["id_1", "id_2"])
+        self.given_resources_that_depend_on_the_input_path("id_1", "id_2")
+
+        with mock.patch("doxhooks.console.summary", autospec=True):
+            self.when_updating_the_dependents()
+
+        assert self.profile.report.call_count == 1
+        assert self.profile.report_data()["resources"] == []
+
+    def test_the_build_profile_is_cleared_if_an_update_fails(self):
+        self.given_an_environment_with_a_build_profile(["id_1"])
+        self.resource_configs["id_1"].make = mock.Mock(
+            side_effect=RuntimeError)
+
+        with raises(RuntimeError):
+            self.environment.update("id_1")
+
+        assert not self.profile.report.called
+        assert self.profile.report_data()["resources"] == []
@@ -1,4 +1,5 @@
 import os
+import unittest.mock as mock
 
 from doxhooks.errors import DoxhooksDataError
 from doxhooks.server_configs import ServerConfiguration
@@ -80,3 +81,39 @@ class TestURL(BaseTestServerConfiguration):
         self.when_computing_the_url_for_a_file(path, raises=DoxhooksDataError)
 
         assert self.error
+
+
+class TestMemoisedURL(BaseTestServerConfiguration):
+    def given_a_server_configuration_with_a_counting_filetree(self, **kwargs):
+        self.fake_filetree = mock.Mock(spec=FakeFileTree)
+        self.fake_filetree.path.side_effect = FakeFileTree().path
+        self.given_a_server_configuration(**kwargs)
+
+    def test_the_url_for_a_file_is_computed_once(self):
+        self.given_a_server_configuration_with_a_counting_filetree(root="one")
+
+        for __ in range(3):
+            self.when_computing_the_url_for_a_file("one/test.dat")
+
+        assert self.url == "/test.dat"
+        # The file path and the server-root path are each resolved once.
+        assert self.fake_filetree.path.call_count == 2
+
+    def test_the_server_root_is_resolved_once_for_many_files(self):
+        self.given_a_server_configuration_with_a_counting_filetree(root="one")
+
+        self.when_computing_the_url_for_a_file("one/a.dat")
+        self.when_computing_the_url_for_a_file("one/b.dat")
+
+        assert self.url == "/b.dat"
+        assert self.fake_filetree.path.call_count == 3
+
+    def test_a_url_is_memoised_for_each_rewrite_value(self):
+        self.given_a_server_configuration_with_a_counting_filetree(
+            rewrite="1")
+        self.when_computing_the_url_for_a_file("one/test.dat")
+
+        self.server_config.rewrite = "2"
+        self.when_computing_the_url_for_a_file("one/test.dat")
+
+        assert self.fake_filetree.path.call_count == 2
@@ -0,0 +1,167 @@
+import sys
+import unittest.mock as mock
+
+from doxhooks.errors import DoxhooksFileSystemError
+from doxhooks.template_caches import RenderCache, TemplateCache
+from pytest import mark
+
+
+class BaseTestTemplateCache:
+    key = "test_key"
+
+    def given_a_template_cache(self):
+        self.cache = TemplateCache()
+
+    def given_a_template_cache_containing_some_code(self):
+        self.given_a_template_cache()
+        self.code = compile("x = 1", "test", "exec")
+        self.cache.add(self.key, self.code)
+
+
+class TestCode(BaseTestTemplateCache):
+    def test_the_cache_returns_the_code_that_was_added(self):
+        self.given_a_template_cache_containing_some_code()
+
+        assert self.cache.get(self.key) is self.code
+
+    def test_the_cache_returns_none_for_an_unknown_key(self):
+        self.given_a_template_cache()
+
+        assert self.cache.get(self.key) is None
+
+    def test_adding_code_changes_the_cache(self):
+        self.given_a_template_cache_containing_some_code()
+
+        assert self.cache.change_count == 1
+
+
+class TestLoadingAndSaving(BaseTestTemplateCache):
+    def when_saving_and_loading_the_cache(self):
+        with mock.patch(
+                "doxhooks.dataio.save_literals", autospec=True) as save:
+            self.cache.save("test_path")
+        data = save.call_args[0][1]
+        self.when_loading_the_cache(data)
+
+    def when_loading_the_cache(self, data=None, *, side_effect=None):
+        self.given_a_template_cache()
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value=data, side_effect=side_effect):
+            self.cache.load("test_path")
+
+    def test_the_loaded_code_is_the_same_as_the_saved_code(self):
+        self.given_a_template_cache_containing_some_code()
+
+        self.when_saving_and_loading_the_cache()
+
+        namespace = {}
+        exec(self.cache.get(self.key), namespace)
+        assert namespace["x"] == 1
+
+    def test_a_cache_saved_by_a_different_interpreter_is_ignored(self):
+        self.given_a_template_cache_containing_some_code()
+        data = {
+            "cache_tag": "different-" + str(sys.implementation.cache_tag),
+            "code": {self.key: b"bad code"},
+        }
+
+        self.when_loading_the_cache(data)
+
+        assert self.cache.get(self.key) is None
+
+    @mark.parametrize("bad_data", [
+        None, {}, {"cache_tag": sys.implementation.cache_tag, "code": None},
+        {"cache_tag": sys.implementation.cache_tag, "code": {"key": 1}},
+    ])
+    def test_a_bad_cache_file_is_ignored(self, bad_data):
+        self.when_loading_the_cache(bad_data)
+
+        assert self.cache.get("key") is None
+
+    def test_the_code_not_used_since_loading_is_also_saved(self):
+        self.given_a_template_cache_containing_some_code()
+        self.cache.add("unused_key", compile("y = 2", "test", "exec"))
+        self.when_saving_and_loading_the_cache()
+
+        self.cache.get(self.key)
+        self.when_saving_and_loading_the_cache()
+
+        assert self.cache.get(self.key) is not None
+        assert self.cache.get("unused_key") is not None
+
+    def test_the_least_recently_used_code_is_removed_from_a_full_cache(self):
+        self.given_a_template_cache_containing_some_code()
+        self.cache.add("unused_key", compile("y = 2", "test", "exec"))
+        self.when_saving_and_loading_the_cache()
+        self.cache.get(self.key)
+        self.cache.add("new_key", compile("z = 3", "test", "exec"))
+
+        with mock.patch.object(TemplateCache, "max_templates", 2):
+            self.when_saving_and_loading_the_cache()
+
+        assert self.cache.get(self.key) is not None
+        assert self.cache.get("new_key") is not None
+        assert self.cache.get("unused_key") is None
+
+    def test_using_loaded_code_changes_the_cache_once(self):
+        self.given_a_template_cache_containing_some_code()
+        self.when_saving_and_loading_the_cache()
+        change_count = self.cache.change_count
+
+        self.cache.get(self.key)
+        self.cache.get(self.key)
+
+        assert self.cache.change_count == change_count + 1
+
+    def test_a_missing_cache_file_is_ignored(self):
+        self.when_loading_the_cache(
+            side_effect=DoxhooksFileSystemError("Cannot open:", "test_path"))
+
+        assert self.cache.get(self.key) is None
+
+
+class TestRenderCache:
+    render_key = "test_render_key"
+
+    def given_a_render_cache(self):
+        self.cache = RenderCache()
+
+    def test_a_template_is_recorded_the_second_time_it_is_inserted(self):
+        self.given_a_render_cache()
+
+        is_recording = [
+            self.cache.is_recording(self.render_key) for __ in range(2)]
+
+        assert is_recording == [False, True]
+
+    def test_a_rendering_is_reused_if_the_values_read_are_the_same(self):
+        self.given_a_render_cache()
+        self.cache.add(self.render_key, {"title": "Title"}, "output", set())
+
+        same = self.cache.get(self.render_key, {"title": "Title"}.get)
+        different = self.cache.get(self.render_key, {"title": "Other"}.get)
+
+        assert same.output == "output"
+        assert different is None
+
+    def test_a_template_is_not_recorded_after_the_maximum_renderings(self):
+        self.given_a_render_cache()
+        self.cache.is_recording(self.render_key)
+        for rendering_no in range(self.cache.max_renderings):
+            assert self.cache.is_recording(self.render_key)
+            self.cache.add(
+                self.render_key, {"no": rendering_no}, "output", set())
+
+        assert not self.cache.is_recording(self.render_key)
+
+    def test_a_rendering_that_read_a_mutable_value_is_not_reused(self):
+        self.given_a_render_cache()
+        self.cache.is_recording(self.render_key)
+        values = {"items": ["a"]}
+        self.cache.add(self.render_key, dict(values), "output", set())
+
+        values["items"].append("b")
+
+        assert self.cache.get(self.render_key, values.get) is None
+        assert not self.cache.is_recording(self.render_key)
@@ -1,8 +1,8 @@
 import unittest.mock as mock
 
 from doxhooks.errors import DoxhooksDataFileError
-from doxhooks.url_mappings import URLMapping
-from pytest import fail
+from doxhooks.url_mappings import URLMapping, VersionedURLMapping
+from pytest import fail, fixture, raises
 
 from doxhooks_pytest import withraises
 
@@ -80,6 +80,17 @@ class TestLoading(BaseTestURLMapping):
         urls = dict(self.urls)
         assert urls == loaded_urls
 
+    def test_the_urls_of_versioned_url_data_are_loaded(self):
+        self.given_a_url_mapping()
+
+        self.when_loading_url_data({
+            "urls": {self.resource_id: self.url},
+            "versions": {self.resource_id: 1},
+            "reads": {"reader_id": {self.resource_id: 1}},
+        })
+
+        assert dict(self.urls) == {self.resource_id: self.url}
+
     def test_loading_url_data_that_is_not_a_dictionary_is_an_error(self):
         not_dict = None
 
@@ -88,3 +99,342 @@ class TestLoading(BaseTestURLMapping):
         self.when_loading_url_data(not_dict, raises=DoxhooksDataFileError)
 
         assert self.error
+
+
+class TestJournal(BaseTestURLMapping):
+    @fixture(autouse=True)
+    def _setup_journal_mode(self):
+        with mock.patch.object(URLMapping, "journal", True):
+            yield
+
+    def test_a_replayed_journal_restores_the_new_resource_urls(self):
+        self.given_a_url_mapping_containing_a_resource_url()
+        self.urls[self.resource_id] = self.url
+        journal = self.urls.pop_journal()
+
+        self.given_a_url_mapping()
+        self.urls.replay(journal)
+
+        assert journal == [(self.resource_id, self.url)]
+        assert dict(self.urls) == {self.resource_id: self.url}
+
+    @withraises
+    def when_replaying_a_bad_record(self, record):
+        self.urls.replay([record])
+
+    def test_the_urls_in_a_versioned_journal_are_replayed(self):
+        self.given_a_url_mapping()
+
+        self.urls.replay([
+            ("url", self.resource_id, self.url),
+            ("reads", "reader_id", ((self.resource_id, 0),)),
+            ("url", self.resource_id, self.different_url),
+        ])
+
+        assert dict(self.urls) == {self.resource_id: self.different_url}
+
+    def test_urls_are_not_recorded_when_journal_mode_is_off(self):
+        self.given_a_url_mapping()
+
+        with mock.patch.object(URLMapping, "journal", False):
+            self.urls[self.resource_id] = self.url
+            self.urls.update_many({"id_2": "url_2"})
+
+        assert self.urls.pop_journal() == []
+
+    def test_replaying_a_bad_record_is_an_error(self):
+        self.given_a_url_mapping()
+
+        self.when_replaying_a_bad_record(None, raises=DoxhooksDataFileError)
+
+        assert self.error
+
+
+class TestChangeCount(BaseTestURLMapping):
+    def test_only_a_new_resource_url_changes_the_mapping(self):
+        self.given_a_url_mapping_containing_a_resource_url()
+        change_count = self.urls.change_count
+
+        self.urls[self.resource_id] = self.url
+        assert self.urls.change_count == change_count
+
+        self.urls["another_resource_id"] = self.url
+        assert self.urls.change_count != change_count
+
+
+class TestReverseIndex(BaseTestURLMapping):
+    def test_the_owner_of_a_url_is_found(self):
+        self.given_a_url_mapping_containing_a_resource_url()
+
+        assert self.urls.owner(self.url) == self.resource_id
+
+    def test_resources_with_the_same_url_are_collisions(self):
+        self.given_a_url_mapping_containing_a_resource_url()
+
+        with mock.patch("doxhooks.console.warning", autospec=True) as warning:
+            self.urls["another_resource_id"] = self.url
+
+        assert self.urls.collisions() == {
+            self.url: {self.resource_id, "another_resource_id"}}
+        assert warning.called
+
+    def test_resources_without_urls_are_not_collisions(self):
+        self.given_a_url_mapping({"id_1": None, "id_2": None})
+
+        assert self.urls.collisions() == {}
+
+    def test_a_loaded_mapping_is_indexed(self):
+        self.given_a_url_mapping()
+
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value={"id_1": "url", "id_2": "url"}):
+            self.urls.load("test_path")
+
+        assert self.urls.owner("url") in {"id_1", "id_2"}
+        assert self.urls.collisions() == {"url": {"id_1", "id_2"}}
+
+
+class TestBulkOperations(BaseTestURLMapping):
+    @fixture(autouse=True)
+    def _setup_journal_mode(self):
+        with mock.patch.object(URLMapping, "journal", True):
+            yield
+
+    @withraises
+    def when_updating_many_urls(self, urls):
+        self.urls.update_many(urls)
+
+    def test_many_urls_are_set_and_recorded_in_the_journal(self):
+        self.given_a_url_mapping_containing_a_resource_url()
+        self.urls.pop_journal()
+
+        self.when_updating_many_urls(
+            [(self.resource_id, self.url), ("id_2", "url_2")])
+
+        assert dict(self.urls) == {
+            self.resource_id: self.url, "id_2": "url_2"}
+        assert self.urls.pop_journal() == [("id_2", "url_2")]
+        assert self.urls.owner("url_2") == "id_2"
+
+    def test_changing_a_url_in_many_urls_is_an_error(self):
+        self.given_a_url_mapping_containing_a_resource_url()
+
+        self.when_updating_many_urls(
+            {"id_2": "url_2", self.resource_id: self.different_url},
+            raises=RuntimeError)
+
+        assert self.error
+        assert dict(self.urls) == {self.resource_id: self.url}
+
+    def test_a_diff_has_the_urls_added_since_a_snapshot(self):
+        self.given_a_url_mapping_containing_a_resource_url()
+        snapshot = self.urls.snapshot()
+
+        self.urls["id_2"] = "url_2"
+
+        assert self.urls.diff(snapshot) == {
+            "added": {"id_2": "url_2"}, "changed": {}, "removed": {}}
+
+    def test_a_diff_has_the_urls_changed_and_removed_since_a_snapshot(self):
+        self.given_a_url_mapping({"id_1": "url_1", "id_2": "url_2"})
+        snapshot = self.urls.snapshot()
+
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value={"id_1": "url_1+"}):
+            self.urls.load("test_path")
+
+        assert self.urls.diff(snapshot) == {
+            "added": {}, "changed": {"id_1": "url_1+"},
+            "removed": {"id_2": "url_2"}}
+
+
+class BaseTestVersionedURLMapping(BaseTestURLMapping):
+    reader_id = "test_reader_id"
+
+    def given_a_versioned_url_mapping(self, *args, **kwargs):
+        self.urls = VersionedURLMapping(*args, **kwargs)
+
+    def given_a_versioned_url_mapping_with_a_recorded_read(self):
+        self.given_a_versioned_url_mapping()
+        self.urls[self.resource_id] = self.url
+        self.when_the_reader_reads_the_resource_url()
+
+    def when_the_reader_reads_the_resource_url(self):
+        reader = self.urls.reader(self.reader_id)
+        reader[self.resource_id]
+        self.urls.update_reads(self.reader_id)
+
+
+class TestVersions(BaseTestVersionedURLMapping):
+    def test_changing_a_resource_url_increments_its_version(self):
+        self.given_a_versioned_url_mapping()
+        self.urls[self.resource_id] = self.url
+
+        self.urls[self.resource_id] = self.different_url
+
+        assert self.urls[self.resource_id] == self.different_url
+        assert self.urls.version(self.resource_id) == 1
+
+    def test_setting_a_resource_url_to_the_same_value_keeps_its_version(self):
+        self.given_a_versioned_url_mapping()
+        self.urls[self.resource_id] = self.url
+        change_count = self.urls.change_count
+
+        self.urls[self.resource_id] = self.url
+
+        assert self.urls.version(self.resource_id) == 0
+        assert self.urls.change_count == change_count
+
+    @withraises
+    def when_changing_a_fixed_resource_url(self):
+        self.urls[self.resource_id] = self.different_url
+
+    def test_changing_a_fixed_resource_url_is_an_error(self):
+        self.given_a_versioned_url_mapping({self.resource_id: self.url})
+
+        self.when_changing_a_fixed_resource_url(raises=RuntimeError)
+
+        assert self.error
+        assert self.urls.is_fixed(self.resource_id)
+
+    def test_a_changed_url_is_reindexed(self):
+        self.given_a_versioned_url_mapping()
+        self.urls.update_many({self.resource_id: self.url})
+
+        self.urls.update_many({self.resource_id: self.different_url})
+
+        assert self.urls.owner(self.different_url) == self.resource_id
+        with raises(KeyError):
+            self.urls.owner(self.url)
+
+    def test_updating_a_fixed_url_in_many_urls_is_an_error(self):
+        self.given_a_versioned_url_mapping({self.resource_id: self.url})
+
+        with raises(RuntimeError):
+            self.urls.update_many(
+                {"id_2": "url_2", self.resource_id: self.different_url})
+
+        assert dict(self.urls) == {self.resource_id: self.url}
+
+
+class TestStaleReaders(BaseTestVersionedURLMapping):
+    def test_a_reader_of_a_changed_url_is_stale(self):
+        self.given_a_versioned_url_mapping_with_a_recorded_read()
+
+        self.urls[self.resource_id] = self.different_url
+
+        assert self.urls.pop_stale_readers() == {self.reader_id}
+        assert self.urls.pop_stale_readers() == set()
+
+    def test_a_reader_of_the_changed_url_is_not_stale(self):
+        self.given_a_versioned_url_mapping_with_a_recorded_read()
+        self.urls[self.resource_id] = self.different_url
+
+        self.when_the_reader_reads_the_resource_url()
+
+        assert self.urls.pop_stale_readers() == set()
+
+    def test_a_reader_of_another_url_is_not_stale(self):
+        self.given_a_versioned_url_mapping_with_a_recorded_read()
+        self.urls["another_resource_id"] = self.url
+
+        self.urls["another_resource_id"] = self.different_url
+
+        assert self.urls.pop_stale_readers() == set()
+
+    def test_reads_that_are_not_updated_are_not_recorded(self):
+        self.given_a_versioned_url_mapping()
+        self.urls[self.resource_id] = self.url
+        reader = self.urls.reader(self.reader_id)
+        reader[self.resource_id]
+
+        self.urls[self.resource_id] = self.different_url
+
+        assert self.urls.pop_stale_readers() == set()
+
+
+class TestVersionedLoadingAndSaving(BaseTestVersionedURLMapping):
+    def when_saving_and_loading_the_mapping(self, *args):
+        with mock.patch(
+                "doxhooks.dataio.save_literals", autospec=True) as save:
+            self.urls.save("test_path")
+        data = save.call_args[0][1]
+        self.given_a_versioned_url_mapping(*args)
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value=data):
+            self.urls.load("test_path")
+
+    def test_a_loaded_reader_of_a_changed_url_is_stale(self):
+        self.given_a_versioned_url_mapping_with_a_recorded_read()
+
+        self.when_saving_and_loading_the_mapping()
+        self.urls[self.resource_id] = self.different_url
+
+        assert self.urls.version(self.resource_id) == 1
+        assert self.urls.pop_stale_readers() == {self.reader_id}
+
+    def test_the_fixed_urls_are_kept_when_the_mapping_is_loaded(self):
+        self.given_a_versioned_url_mapping_with_a_recorded_read()
+
+        self.when_saving_and_loading_the_mapping(
+            {self.resource_id: self.different_url})
+
+        assert self.urls[self.resource_id] == self.different_url
+        assert self.urls.pop_stale_readers() == {self.reader_id}
+
+    @withraises
+    def when_loading_url_data(self, value):
+        with mock.patch(
+                "doxhooks.dataio.load_literals", autospec=True,
+                return_value=value):
+            self.urls.load("test_path")
+
+    def test_unversioned_url_data_is_loaded_as_the_first_version(self):
+        self.given_a_versioned_url_mapping()
+
+        self.when_loading_url_data({self.resource_id: self.url})
+
+        assert self.urls[self.resource_id] == self.url
+        assert self.urls.version(self.resource_id) == 0
+        assert self.urls.pop_stale_readers() == set()
+
+    def test_loading_url_data_that_is_not_a_dictionary_is_an_error(self):
+        self.given_a_versioned_url_mapping()
+
+        self.when_loading_url_data([], raises=DoxhooksDataFileError)
+
+        assert self.error
+
+
+class TestVersionedJournal(BaseTestVersionedURLMapping):
+    @fixture(autouse=True)
+    def _setup_journal_mode(self):
+        with mock.patch.object(URLMapping, "journal", True):
+            yield
+
+    def test_a_replayed_journal_restores_the_urls_and_reads(self):
+        self.given_a_versioned_url_mapping_with_a_recorded_read()
+        journal = self.urls.pop_journal()
+
+        self.given_a_versioned_url_mapping()
+        self.urls.replay(journal)
+        self.urls[self.resource_id] = self.different_url
+
+        assert self.urls.pop_journal() == [
+            ("url", self.resource_id, self.different_url)]
+        assert self.urls.pop_stale_readers() == {self.reader_id}
+
+    @withraises
+    def when_replaying_a_bad_record(self, record):
+        self.urls.replay([record])
+
+    def test_replaying_a_bad_record_is_an_error(self):
+        self.given_a_versioned_url_mapping()
+
+        self.when_replaying_a_bad_record(
+            (self.resource_id, self.url), raises=DoxhooksDataFileError)
+
+        assert self.error